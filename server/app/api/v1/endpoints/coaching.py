@@ -1,15 +1,20 @@
 """
 코칭 API 엔드포인트
 """
+import json
 import logging
+import math
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from app.config import settings
+from app.core.scheduler import LLMOverloadedError, Priority
 from app.core.security import verify_jwt_token
+from app.core.streams import with_idle_ticks
 from app.services.ai_service import ai_service
 from app.models.conversation import ConversationMessage
 
@@ -46,6 +51,24 @@ class QueryResponse(BaseModel):
     answer: str = Field(..., description="AI 생성 답변")
 
 
+# ==================== SSE Helpers ====================
+
+def _format_sse(data: str, event: Optional[str] = None) -> str:
+    """SSE 이벤트 직렬화 (여러 줄 데이터는 data 필드를 줄마다 나눠 전송)"""
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+def _overloaded(e: LLMOverloadedError) -> HTTPException:
+    """LLM 대기열 과부하 → 503 (Retry-After: 대기 예상 시간)"""
+    return HTTPException(
+        status_code=503,
+        detail=f"요청이 많아 잠시 후 다시 시도해주세요: {str(e)}",
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+    )
+
+
 # ==================== Endpoints ====================
 
 @router.post("/interpretation", response_model=InterpretationResponse)
@@ -73,6 +96,9 @@ async def generate_interpretation(
             interpretation=report["interpretation"]
         )
 
+    except LLMOverloadedError as e:
+        raise _overloaded(e)
+
     except Exception as e:
         logger.error(f"리포트 생성 실패: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"리포트 생성 중 오류가 발생했습니다: {str(e)}")
@@ -91,6 +117,9 @@ async def query_with_streaming(
     try:
         logger.info(f"Q&A 요청: user_id={request.user_id}, report_id={request.report_id}")
 
+        # 스트림을 열기 전에 LLM 대기열 확인 (응답 시작 후에는 상태 코드를 바꿀 수 없음)
+        ai_service.check_llm_capacity(Priority.STREAMING)
+
         # 대화 히스토리를 ConversationMessage 리스트로 변환
         conversation_history = None
         if request.conversation_history:
@@ -101,23 +130,39 @@ async def query_with_streaming(
 
         # 스트리밍 응답 생성
         async def generate():
+            stream_stats: Dict[str, Any] = {}
             try:
-                async for chunk in ai_service.generate_answer_streaming(
+                chunks = ai_service.generate_answer_streaming(
                     user_id=request.user_id,
                     report_id=request.report_id,
                     question=request.question,
-                    conversation_history=conversation_history
-                ):
-                    # SSE 형식으로 전송
-                    yield f"data: {chunk}\n\n"
+                    conversation_history=conversation_history,
+                    stream_stats=stream_stats
+                )
+                async for chunk in with_idle_ticks(chunks, settings.STREAMING_KEEPALIVE_SECONDS):
+                    if chunk is None:
+                        # 프록시/브라우저 연결 유지용 SSE 주석
+                        yield ": keep-alive\n\n"
+                        continue
+
+                    # SSE 형식으로 델타 즉시 전송
+                    yield _format_sse(chunk)
+
+                # 타이밍/토큰 통계를 담은 구조화된 완료 이벤트
+                yield _format_sse(json.dumps(stream_stats, ensure_ascii=False), event="done")
 
                 # 완료 신호
                 yield "data: [DONE]\n\n"
 
+            except LLMOverloadedError as e:
+                logger.warning(f"스트리밍 중 LLM 대기열 과부하: {e}")
+                error = {"error": f"요청이 많아 잠시 후 다시 시도해주세요: {str(e)}", "status": 503}
+                yield _format_sse(json.dumps(error, ensure_ascii=False))
+
             except Exception as e:
                 logger.error(f"스트리밍 중 오류: {e}", exc_info=True)
                 error_message = f"답변 생성 중 오류가 발생했습니다: {str(e)}"
-                yield f'data: {{"error": "{error_message}"}}\n\n'
+                yield _format_sse(json.dumps({"error": error_message}, ensure_ascii=False))
 
         return StreamingResponse(
             generate(),
@@ -129,6 +174,9 @@ async def query_with_streaming(
             }
         )
 
+    except LLMOverloadedError as e:
+        raise _overloaded(e)
+
     except Exception as e:
         logger.error(f"Q&A 요청 처리 실패: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Q&A 처리 중 오류가 발생했습니다: {str(e)}")
@@ -165,6 +213,21 @@ async def query_non_streaming(
 
         return QueryResponse(answer=answer)
 
+    except LLMOverloadedError as e:
+        raise _overloaded(e)
+
     except Exception as e:
         logger.error(f"Q&A 처리 실패: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Q&A 처리 중 오류가 발생했습니다: {str(e)}")
+
+
+@router.get("/stats")
+async def get_stats(
+    token_data: dict = Depends(verify_jwt_token)
+):
+    """
+    AI 서비스 운영 지표
+
+    캐시 히트/미스 등 용량 조정에 필요한 카운터를 반환합니다.
+    """
+    return ai_service.get_stats()
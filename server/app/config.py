@@ -21,6 +21,20 @@ class Settings(BaseSettings):
     CHROMA_HOST: str = "localhost"
     CHROMA_PORT: int = 8001
     CHROMA_COLLECTION_NAME: str = "leadership_clinical_data"
+    CHROMA_MAX_CONCURRENCY: int = 8  # 동시 Chroma 호출 수 (스레드 풀/HTTP 커넥션 풀 크기)
+    CHROMA_TIMEOUT_SECONDS: float = 5.0  # 조회 호출별 타임아웃 (슬롯 대기 포함)
+    CHROMA_WRITE_TIMEOUT_SECONDS: float = 60.0  # 문서 추가 호출 타임아웃 (임베딩 포함)
+    CHROMA_CONNECT_TIMEOUT_SECONDS: float = 3.0  # HTTP 연결 타임아웃
+    LOCAL_INDEX_ENABLED: bool = False  # 컬렉션을 프로세스 내 NumPy 인덱스로 복제해 로컬 검색
+    LOCAL_INDEX_PATH: str = "data/local_index"  # 스냅샷 디렉터리 (워커 간 메모리 맵 공유)
+    LOCAL_INDEX_REFRESH_SECONDS: float = 30.0  # 컬렉션 버전 확인 주기
+    CHROMA_QUERY_BATCH_ENABLED: bool = True  # 동시 벡터 검색을 모아 한 번의 collection.query로 전송
+    CHROMA_QUERY_BATCH_MAX_SIZE: int = 32  # 한 배치에 모을 최대 질의 수
+    CHROMA_QUERY_BATCH_MAX_WAIT_MS: float = 5.0  # 배치를 모으기 위해 첫 질의 후 기다리는 시간
+    RETRIEVAL_CACHE_ENABLED: bool = True  # (질의, 유형, top_k) 검색 결과 캐시 사용 여부
+    RETRIEVAL_CACHE_MAX_SIZE: int = 2048  # 검색 결과 캐시(LRU) 최대 항목 수
+    RETRIEVAL_CACHE_TTL_SECONDS: int = 3600  # 버전이 그대로여도 이 시간이 지나면 다시 검색
+    RETRIEVAL_CACHE_VERSION_CHECK_SECONDS: float = 5.0  # 다른 워커의 컬렉션 버전 변경 확인 주기
 
     # JWT 보안
     JWT_SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -32,23 +46,90 @@ class Settings(BaseSettings):
     GEMINI_MODEL: str = "gemini-1.5-pro"
     GEMINI_TEMPERATURE: float = 0.7
     GEMINI_MAX_TOKENS: int = 2048
+    GEMINI_INPUT_PRICE_PER_MTOK: float = 1.25  # heavy 티어 입력 100만 토큰당 USD (비용 집계용)
+    GEMINI_OUTPUT_PRICE_PER_MTOK: float = 5.0  # heavy 티어 출력 100만 토큰당 USD
+    GEMINI_FAST_MODEL: str = "gemini-1.5-flash"  # 짧은 턴용 fast 티어 모델 (빈 값이면 GEMINI_MODEL)
+    GEMINI_FAST_MAX_TOKENS: int = 256  # fast 티어 출력 토큰 예산 (두어 문장)
+    GEMINI_FAST_INPUT_PRICE_PER_MTOK: float = 0.075  # fast 티어 입력 100만 토큰당 USD
+    GEMINI_FAST_OUTPUT_PRICE_PER_MTOK: float = 0.3  # fast 티어 출력 100만 토큰당 USD
+    MODEL_ROUTING_ENABLED: bool = True  # 응답 전략에 따라 fast/heavy 티어 선택
+    MODEL_ROUTING_MAX_FAST_QUESTION_CHARS: int = 200  # 이보다 긴 질문은 fast 전략이어도 heavy
+    TEMPLATE_FAST_PATH_ENABLED: bool = True  # 정형 전략은 LLM 없이 템플릿으로 답변
+    TEMPLATE_FAST_PATH_STRATEGIES: str = "warm_welcome,service_info,clarify_question,gentle_redirect,redirect_to_expert"  # 템플릿 답변 전략 (쉼표 구분)
+    LLM_MAX_CONCURRENCY: int = 8  # 동시 Gemini 호출 수 (스트리밍은 끝날 때까지 점유)
+    LLM_REQUESTS_PER_MINUTE: int = 300  # 분당 요청 수 제한 (프로젝트 할당량에 맞게 설정, 0이면 제한 없음)
+    LLM_TOKENS_PER_MINUTE: int = 1000000  # 분당 토큰 수 제한 (입력 + 출력, 0이면 제한 없음)
+    LLM_QUEUE_DEADLINE_STREAMING_SECONDS: float = 5.0  # 스트리밍 채팅 최대 대기 (넘을 것 같으면 503)
+    LLM_QUEUE_DEADLINE_QA_SECONDS: float = 10.0  # 비-스트리밍 Q&A 최대 대기
+    LLM_QUEUE_DEADLINE_REPORT_SECONDS: float = 60.0  # 리포트 생성 최대 대기
+    LLM_CALL_DEADLINE_SECONDS: float = 90.0  # 비-스트리밍 호출 전체 마감 (재시도/백오프 포함)
+    LLM_ATTEMPT_TIMEOUT_SECONDS: float = 45.0  # 시도 1회 타임아웃 (넘으면 재시도)
+    LLM_MAX_RETRIES: int = 2  # 429/5xx/타임아웃 재시도 횟수
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5  # 지수 백오프 기본 지연 (0.5, 1, 2초 … × 지터)
+    LLM_HEDGE_ENABLED: bool = True  # 느린 비-스트리밍 호출에 같은 요청을 하나 더 전송
+    LLM_HEDGE_PERCENTILE: float = 95.0  # 모델별 최근 지연의 이 분위를 넘으면 헤지
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # 헤지 기준을 계산할 최소 관측 수
 
     # ML 모델
     ML_MODEL_PATH: str = "models/leadership_classifier.pkl"
+    ML_BATCH_MAX_SIZE: int = 64  # 한 번의 predict_proba로 처리할 최대 요청 수
+    ML_BATCH_MAX_WAIT_MS: float = 5.0  # 배치를 모으기 위해 첫 요청 후 기다리는 시간
+    ML_INFERENCE_WORKERS: int = 1  # 추론 전용 스레드 수
 
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://localhost:5183", "http://localhost:3000"]
 
     # RAG 설정
     RAG_TOP_K: int = 5  # Vector DB에서 검색할 문서 수
-    RAG_SIMILARITY_THRESHOLD: float = 0.7  # 유사도 임계값
+    RAG_SIMILARITY_THRESHOLD: float = 0.7  # 유사도 임계값 (코사인 유사도, 미만이면 제외)
+    RAG_ADAPTIVE_MIN_GAP: float = 0.15  # 이 비율(첫 점수 대비) 이상 점수가 떨어지면 그 앞까지만 사용
+    RAG_MIN_K: int = 1  # adaptive top_k 최소 문서 수
+    RAG_LEXICAL_MIN_COVERAGE: float = 0.3  # 어휘 검색 문서의 최소 질의 용어 일치 비율 (idf 가중, 흔한 용어만 겹치면 제외)
+    RAG_CONTEXT_MAX_TOKENS: int = 800  # 프롬프트에 넣을 참고자료 총 토큰 예산
+    PROMPT_MAX_INPUT_TOKENS: int = 4000  # Q&A 프롬프트 입력 토큰 예산 (시스템 > 질문 > 리포트 > 참고자료 > 최근 대화 순으로 채움)
+    PROMPT_MIN_PART_TOKENS: int = 64  # 남은 예산이 이보다 작으면 넘치는 구성 요소(리포트/참고자료/대화 메시지)를 잘라 넣지 않고 제외
+    TOKEN_CALIBRATION_WINDOW: int = 200  # 토큰 추정 보정에 쓰는 최근 호출 수
+    TOKEN_CALIBRATION_MIN_SAMPLES: int = 5  # 이만큼 모이기 전에는 보정 없이 추정
+    TOKEN_CALIBRATION_SAMPLE_RATE: float = 0.1  # 응답에 사용량이 없을 때 count_tokens로 실제 토큰 수를 확인할 호출 비율 (0이면 끔)
+    REPORT_SECTIONS_ENABLED: bool = True  # 전체 리포트 대신 요약 + 질문 관련 섹션만 전송
+    REPORT_CONTEXT_TOP_SECTIONS: int = 2  # 질문마다 넣을 리포트 섹션 수
+    REPORT_CONTEXT_MAX_TOKENS: int = 600  # 리포트 섹션 토큰 예산 (요약 제외)
+    REPORT_DIGEST_MAX_TOKENS: int = 150  # 매 질문에 넣는 리포트 요약 토큰 예산
+    EMBEDDING_BACKEND: str = "onnx"  # onnx (Chroma 기본 all-MiniLM-L6-v2) | sentence-transformers
+    EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"  # 저장된 문서와 같은 모델이어야 함
+    EMBEDDING_CACHE_MAX_SIZE: int = 4096  # 질의 임베딩 캐시(LRU) 최대 항목 수
+    RAG_ENABLED: bool = True  # Q&A에 참고자료 검색 결과 포함 여부
+    RAG_OVERFETCH_FACTOR: int = 3  # 유형 필터 전 후보 배수 (리포트 조회와 동시 검색하므로 사후 필터)
+    RETRIEVAL_MODE: str = "hybrid"  # vector | lexical | hybrid (BM25 + 벡터 RRF 결합)
+    HYBRID_CANDIDATES: int = 20  # hybrid 검색 시 각 방식에서 가져올 후보 수
+    HYBRID_RRF_K: int = 60  # RRF 상수 (클수록 하위 순위 영향이 커짐)
+
+    # Q&A 준비 단계별 마감 시간 (초, 동시 실행)
+    QA_REPORT_TIMEOUT_SECONDS: float = 3.0  # 리포트 조회
+    QA_ANALYSIS_TIMEOUT_SECONDS: float = 0.5  # 대화 분석/참여도 계산
+    QA_RETRIEVAL_TIMEOUT_SECONDS: float = 1.5  # 참고자료 검색
 
     # 캐싱
     CACHE_ENABLED: bool = True
     CACHE_TTL_SECONDS: int = 3600  # 1시간
+    REPORT_CACHE_MAX_SIZE: int = 1000  # 리포트 메모리 캐시(LRU) 최대 항목 수
+    INTERPRETATION_CACHE_ENABLED: bool = True  # 해석 리포트 메모이제이션 사용 여부
+    INTERPRETATION_CACHE_MAX_SIZE: int = 512  # 해석 지문(키) 최대 개수
+    INTERPRETATION_CACHE_TTL_SECONDS: int = 86400  # 24시간
+    INTERPRETATION_VARIANTS_PER_KEY: int = 3  # 키당 보관할 답변 변형 수
+    ANSWER_CACHE_ENABLED: bool = True  # 초기 대화 단계 의미 기반 답변 캐시 사용 여부
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.92  # 답변 재사용 최소 코사인 유사도
+    ANSWER_CACHE_TTL_SECONDS: int = 86400  # 24시간
+    ANSWER_CACHE_MAX_KEYS: int = 256  # (리더십 유형, 전략) 키 최대 개수
+    ANSWER_CACHE_MAX_ENTRIES_PER_KEY: int = 256  # 키당 보관할 최대 답변 수
+    ENGAGEMENT_STATE_MAX_SIZE: int = 5000  # 참여도 누적 상태를 보관할 최대 대화 수
+    ENGAGEMENT_STATE_TTL_SECONDS: int = 7200  # 2시간
 
     # 스트리밍
-    STREAMING_CHUNK_SIZE: int = 10  # 토큰 단위
+    STREAMING_CHUNK_SIZE: int = 10  # 토큰 단위 (이보다 작은 청크는 묶어서 전송, 0이면 비활성화)
+    STREAMING_FLUSH_INTERVAL_MS: int = 50  # 묶어둔 청크의 최대 지연 시간 (0이면 크기 기준만 사용)
+    STREAMING_CUMULATIVE_CHUNKS: bool = False  # SDK가 청크마다 누적 텍스트를 보내는 경우에만 True (기본: 델타)
+    STREAMING_KEEPALIVE_SECONDS: float = 10.0  # 청크가 없을 때 SSE keep-alive 주석 전송 간격
 
     # 개발 모드
     USE_MOCK_DATA: bool = False  # 더미 데이터 사용 여부
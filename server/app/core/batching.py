@@ -0,0 +1,150 @@
+"""
+비동기 마이크로 배치 유틸리티
+짧은 시간 동안 들어온 동시 요청을 모아 한 번에 처리
+"""
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+import asyncio
+import logging
+import time
+
+from app.core.metrics import RollingHistogram
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    마이크로 배처
+
+    - submit()으로 들어온 요청을 큐에 모으고, 첫 요청 후 max_wait_ms가 지나거나
+      max_batch_size개가 모이면 handler(items)를 한 번 호출
+    - handler는 입력과 같은 순서/길이의 결과 리스트를 반환해야 함
+      (결과 자리에 예외 객체를 넣으면 그 요청에만 예외로 전달)
+    - 배치 크기와 큐 대기 시간을 히스토그램으로 기록
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[T]], Awaitable[List[R]]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        name: str = "batch"
+    ):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size는 1 이상이어야 합니다.")
+
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.name = name
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.batch_size = RollingHistogram()
+        self.queue_delay_ms = RollingHistogram()
+        self.batches = 0
+        self.errors = 0
+
+    async def submit(self, item: T) -> R:
+        """
+        요청 제출 후 배치 처리 결과 대기
+
+        Raises:
+            Exception: handler에서 발생한 예외를 그대로 전달
+        """
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((item, future, time.perf_counter()))
+        return await future
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        """현재 이벤트 루프에 큐와 워커 태스크 준비 (루프가 바뀌면 새로 생성)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """배치 수집 → 처리 루프"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[Tuple[T, asyncio.Future, float]]) -> None:
+        """handler 호출 후 각 요청의 future에 결과 전달"""
+        # 이미 취소된 요청은 제외
+        batch = [entry for entry in batch if not entry[1].done()]
+        if not batch:
+            return
+
+        now = time.perf_counter()
+        for _, _, enqueued_at in batch:
+            self.queue_delay_ms.observe((now - enqueued_at) * 1000)
+        self.batch_size.observe(len(batch))
+        self.batches += 1
+
+        try:
+            results = await self.handler([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"{self.name}: 배치 결과 수 불일치 (입력 {len(batch)}, 결과 {len(results)})"
+                )
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"{self.name} 배치 처리 실패 (크기 {len(batch)}): {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """워커 태스크 종료"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """배치 통계"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+            "batches": self.batches,
+            "errors": self.errors,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self.batch_size.summary(),
+            "queue_delay_ms": self.queue_delay_ms.summary(),
+        }
@@ -0,0 +1,132 @@
+"""
+인메모리 캐시 유틸리티
+TTL 만료와 LRU 축출을 지원하는 크기 제한 캐시
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+import threading
+import time
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    TTL + LRU 캐시
+
+    - max_size 초과 시 가장 오래 사용되지 않은 항목부터 축출
+    - ttl_seconds가 지난 항목은 조회 시점에 만료 처리 (None이면 만료 없음)
+    - 히트/미스/축출/만료 카운터 제공
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None):
+        if max_size <= 0:
+            raise ValueError("max_size는 1 이상이어야 합니다.")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _is_expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """조회 (히트 시 LRU 갱신, 만료 항목은 제거 후 미스 처리)"""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = item
+            if self._is_expired(stored_at, now):
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """저장 (용량 초과 시 LRU 축출)"""
+        now = time.monotonic()
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = (now, value)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """항목 제거"""
+        with self._lock:
+            item = self._data.pop(key, None)
+            return item[1] if item else None
+
+    def clear(self) -> None:
+        """전체 비우기 (카운터는 유지)"""
+        with self._lock:
+            self._data.clear()
+
+    def purge_expired(self) -> int:
+        """만료 항목 일괄 정리
+
+        Returns:
+            int: 제거된 항목 수
+        """
+        if self.ttl_seconds is None:
+            return 0
+
+        now = time.monotonic()
+        removed = 0
+        with self._lock:
+            # OrderedDict는 삽입/갱신 순이므로 오래된 항목이 앞쪽에 있음
+            for key in list(self._data.keys()):
+                stored_at, _ = self._data[key]
+                if self._is_expired(stored_at, now):
+                    del self._data[key]
+                    removed += 1
+            self.expirations += removed
+        return removed
+
+    def items(self) -> Iterator[Tuple[Hashable, V]]:
+        """현재 항목 스냅샷 (만료 여부와 무관, LRU 갱신 없음)"""
+        with self._lock:
+            snapshot = [(key, value) for key, (_, value) in self._data.items()]
+        return iter(snapshot)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio, 4),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
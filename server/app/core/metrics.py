@@ -0,0 +1,73 @@
+"""
+경량 운영 지표 유틸리티
+최근 N개 관측값 기반 분위수(p50/p99 등) 계산
+"""
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional
+import math
+import threading
+
+
+def percentile(values: Iterable[float], q: float) -> Optional[float]:
+    """
+    분위수 계산 (nearest-rank)
+
+    Args:
+        values: 관측값
+        q: 분위 (0-100)
+
+    Returns:
+        float | None: 분위수 (값이 없으면 None)
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class RollingHistogram:
+    """
+    최근 window개 관측값을 보관하는 히스토그램
+
+    누적 count/sum은 전체 기간, 분위수는 최근 window 기준입니다.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._values: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._values.append(value)
+            self.count += 1
+            self.total += value
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            snapshot = list(self._values)
+        return percentile(snapshot, q)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def summary(self) -> Dict[str, Any]:
+        """요약 통계 (count, mean, p50, p90, p99, max)"""
+        with self._lock:
+            snapshot = sorted(self._values)
+            count = self.count
+            total = self.total
+
+        def _round(value: Optional[float]) -> Optional[float]:
+            return round(value, 3) if value is not None else None
+
+        return {
+            "count": count,
+            "mean": _round(total / count) if count else None,
+            "p50": _round(percentile(snapshot, 50)),
+            "p90": _round(percentile(snapshot, 90)),
+            "p99": _round(percentile(snapshot, 99)),
+            "max": _round(snapshot[-1]) if snapshot else None,
+        }
@@ -0,0 +1,299 @@
+"""
+LLM 호출 스케줄러
+동시 호출 수 제한 + 분당 요청/토큰 토큰 버킷 + 우선순위 대기열 (스트리밍 채팅 > Q&A > 리포트)
+"""
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from app.core.metrics import RollingHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """우선순위 클래스 (값이 작을수록 먼저 처리)"""
+    STREAMING = 0  # 스트리밍 채팅
+    QA = 1  # 비-스트리밍 Q&A
+    REPORT = 2  # 해석 리포트 생성
+
+
+class LLMOverloadedError(Exception):
+    """대기 예상 시간이 마감 시간을 넘어 요청을 거절 (HTTP 503)"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    토큰 버킷 (분당 rate_per_minute개 보충, 최대 1분치 보관)
+
+    rate_per_minute가 0 이하이면 제한 없음
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_minute <= 0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate_per_minute / 60)
+        self._updated_at = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """amount개가 모일 때까지 남은 초 (0이면 바로 가능)"""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        if amount <= self.tokens:
+            return 0.0
+        return (amount - self.tokens) * 60 / self.rate_per_minute
+
+    def take(self, amount: float, now: float) -> None:
+        """amount개 소모"""
+        if self.unlimited:
+            return
+        self._refill(now)
+        self.tokens -= amount
+
+    def give_back(self, amount: float, now: float) -> None:
+        """미리 소모한 양 중 쓰지 않은 만큼 반환"""
+        if self.unlimited or amount <= 0:
+            return
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class Ticket:
+    """
+    실행 허가 (acquire() 결과)
+
+    호출이 끝나면 used_tokens에 실제 사용량을 넣고 release()하면 예약량과의 차이가 반환됩니다.
+    """
+
+    __slots__ = ("priority", "tokens", "used_tokens", "granted_at")
+
+    def __init__(self, priority: Priority, tokens: int, granted_at: float):
+        self.priority = priority
+        self.tokens = tokens
+        self.used_tokens: Optional[int] = None
+        self.granted_at = granted_at
+
+
+class _Waiter:
+    __slots__ = ("priority", "sequence", "tokens", "future", "enqueued_at", "cancelled")
+
+    def __init__(self, priority: Priority, sequence: int, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.sequence = sequence
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.cancelled = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class LLMScheduler:
+    """
+    LLM 호출 스케줄러
+
+    - 동시 실행은 max_concurrency개까지, 분당 요청 수(rpm)/토큰 수(tpm)는 토큰 버킷으로 제한
+    - 대기열은 (우선순위, 도착 순서) 힙: 상위 클래스가 기다리는 동안 하위 클래스는 출발하지 않음
+    - 토큰은 (프롬프트 추정 + 최대 출력) 만큼 미리 예약하고, 끝나면 실제 사용량과의 차이를 반환
+    - 대기 예상 시간이 클래스별 마감 시간을 넘으면 대기열에 넣지 않고 바로 LLMOverloadedError
+      (대기 중 마감 시간이 지나도 같은 예외)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        deadlines: Dict[Priority, float]
+    ):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency는 1 이상이어야 합니다.")
+
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.deadlines = deadlines
+
+        self._waiting: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.active = 0
+
+        self.queue_wait_ms: Dict[Priority, RollingHistogram] = {priority: RollingHistogram() for priority in Priority}
+        self.hold_seconds = RollingHistogram()  # 허가 후 반환까지 걸린 시간 (대기 예상에 사용)
+        self.granted: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self.shed_on_arrival: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self.shed_in_queue: Dict[Priority, int] = {priority: 0 for priority in Priority}
+
+    def _pending(self, priority: Optional[Priority] = None) -> List[_Waiter]:
+        """대기 중인 요청 (priority를 주면 그 클래스 이상만)"""
+        return [
+            waiter for waiter in self._waiting
+            if not waiter.cancelled and (priority is None or waiter.priority <= priority)
+        ]
+
+    def estimate_wait(self, priority: Priority, tokens: int) -> float:
+        """
+        지금 도착한 요청의 대기 예상 시간 (초)
+
+        같거나 높은 우선순위의 대기 요청이 모두 먼저 나간다고 보고
+        요청/토큰 버킷 보충 시간과 실행 슬롯 회전 시간(평균 점유 시간) 중 큰 값을 사용합니다.
+        """
+        now = time.monotonic()
+        ahead = self._pending(priority)
+        needed_tokens = sum(waiter.tokens for waiter in ahead) + tokens
+        if not ahead:
+            # 버킷 용량보다 큰 단독 요청은 버킷이 가득 차면 허가 (_pump()와 동일)
+            needed_tokens = min(needed_tokens, self.tokens.capacity)
+        rate_wait = max(
+            self.requests.time_until(len(ahead) + 1, now),
+            self.tokens.time_until(needed_tokens, now),
+        )
+
+        slot_wait = 0.0
+        overflow = self.active + len(ahead) + 1 - self.max_concurrency
+        if overflow > 0 and self.hold_seconds.count:
+            average_hold = self.hold_seconds.total / self.hold_seconds.count
+            slot_wait = overflow / self.max_concurrency * average_hold
+        return max(rate_wait, slot_wait)
+
+    def check_admission(self, priority: Priority, tokens: int = 0, deadline: Optional[float] = None) -> None:
+        """
+        조기 거절 판정 (대기 예상 시간이 마감 시간을 넘으면 예외)
+
+        Raises:
+            LLMOverloadedError: 대기 예상 시간 > 마감 시간
+        """
+        if deadline is None:
+            deadline = self.deadlines[priority]
+        estimate = self.estimate_wait(priority, tokens)
+        if estimate > deadline:
+            self.shed_on_arrival[priority] += 1
+            logger.warning(
+                f"LLM 요청 거절 ({priority.name}): 대기 예상 {estimate:.1f}초 > 마감 {deadline:.1f}초"
+            )
+            raise LLMOverloadedError(f"LLM 호출 대기열이 가득 찼습니다 (예상 대기 {estimate:.1f}초)", estimate)
+
+    async def acquire(self, priority: Priority, tokens: int, deadline: Optional[float] = None) -> Ticket:
+        """
+        실행 허가 대기
+
+        Args:
+            priority: 우선순위 클래스
+            tokens: 예약할 토큰 수 (프롬프트 추정 + 최대 출력)
+            deadline: 최대 대기 시간 (초, 기본: 클래스별 마감 시간)
+
+        Raises:
+            LLMOverloadedError: 대기 예상 시간 또는 실제 대기가 마감 시간을 넘은 경우
+        """
+        if deadline is None:
+            deadline = self.deadlines[priority]
+        self.check_admission(priority, tokens, deadline)
+
+        waiter = _Waiter(priority, next(self._sequence), tokens, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiting, waiter)
+        self._pump()
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter.future), deadline)
+
+        except asyncio.TimeoutError:
+            if waiter.future.done():
+                return waiter.future.result()
+            waiter.cancelled = True
+            self.shed_in_queue[priority] += 1
+            logger.warning(f"LLM 요청 대기 마감 초과 ({priority.name}): {deadline:.1f}초")
+            raise LLMOverloadedError(
+                f"LLM 호출 대기 시간이 {deadline:.1f}초를 넘었습니다", self.estimate_wait(priority, tokens)
+            )
+
+        except asyncio.CancelledError:
+            # 허가 직후 취소되면 슬롯/토큰 반환
+            if waiter.future.done() and not waiter.future.cancelled():
+                ticket = waiter.future.result()
+                ticket.used_tokens = 0
+                self.release(ticket)
+            waiter.cancelled = True
+            self._pump()
+            raise
+
+    def release(self, ticket: Ticket) -> None:
+        """실행 종료 (슬롯 반환, 예약 토큰 중 미사용분 반환)"""
+        now = time.monotonic()
+        self.active -= 1
+        self.hold_seconds.observe(now - ticket.granted_at)
+        if ticket.used_tokens is not None:
+            self.tokens.give_back(ticket.tokens - ticket.used_tokens, now)
+        self._pump()
+
+    def _pump(self) -> None:
+        """대기열 앞에서부터 슬롯/버킷이 허락하는 만큼 허가 (버킷이 모자라면 보충 시점에 다시 실행)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._waiting:
+            waiter = self._waiting[0]
+            if waiter.cancelled or waiter.future.done():
+                heapq.heappop(self._waiting)
+                continue
+            if self.active >= self.max_concurrency:
+                return
+
+            now = time.monotonic()
+            # 버킷 용량보다 큰 요청은 버킷이 가득 찼을 때 허가
+            delay = max(
+                self.requests.time_until(1, now),
+                self.tokens.time_until(min(waiter.tokens, self.tokens.capacity), now),
+            )
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._pump)
+                return
+
+            heapq.heappop(self._waiting)
+            self.requests.take(1, now)
+            self.tokens.take(waiter.tokens, now)
+            self.active += 1
+            self.granted[waiter.priority] += 1
+            self.queue_wait_ms[waiter.priority].observe((now - waiter.enqueued_at) * 1000)
+            waiter.future.set_result(Ticket(waiter.priority, waiter.tokens, now))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """스케줄러 통계 (클래스별 대기 시간/허가/거절, 버킷 잔량)"""
+        pending = self._pending()
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "requests_bucket": None if self.requests.unlimited else round(self.requests.tokens, 1),
+            "tokens_bucket": None if self.tokens.unlimited else round(self.tokens.tokens, 1),
+            "hold_seconds": self.hold_seconds.summary(),
+            "classes": {
+                priority.name.lower(): {
+                    "waiting": sum(1 for waiter in pending if waiter.priority == priority),
+                    "granted": self.granted[priority],
+                    "shed_on_arrival": self.shed_on_arrival[priority],
+                    "shed_in_queue": self.shed_in_queue[priority],
+                    "deadline_seconds": self.deadlines[priority],
+                    "queue_wait_ms": self.queue_wait_ms[priority].summary(),
+                }
+                for priority in Priority
+            },
+        }
@@ -0,0 +1,54 @@
+"""
+비동기 스트림 유틸리티
+"""
+from typing import AsyncIterator, Optional, TypeVar
+import asyncio
+
+T = TypeVar("T")
+
+
+async def with_idle_ticks(
+    source: AsyncIterator[T],
+    interval: float
+) -> AsyncIterator[Optional[T]]:
+    """
+    소스 스트림을 중계하면서 interval초 동안 항목이 없으면 None을 내보냄
+
+    소스는 별도 태스크에서 소비하므로 대기 시간 초과가 소스 스트림을 취소하지 않습니다.
+    이 제너레이터가 닫히면(예: 클라이언트 연결 종료) 소스 태스크도 취소됩니다.
+
+    Args:
+        source: 원본 비동기 이터레이터
+        interval: 유휴 판정 간격 (초)
+
+    Yields:
+        소스 항목, 또는 유휴 시 None
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def pump() -> None:
+        try:
+            async for item in source:
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await queue.put(done)
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
@@ -20,6 +20,7 @@ class Report(Base):
     leadership_type = Column(String(50), nullable=False)
     interpretation = Column(Text, nullable=False)
     assessment_data = Column(JSON, nullable=True)
+    sections = Column(JSON, nullable=True)  # 섹션별 본문 + 임베딩 + 요약 (report_sections)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -37,7 +38,8 @@ class Conversation(Base):
     user_id = Column(String(100), nullable=False, index=True)
     role = Column(String(20), nullable=False)  # 'user' or 'assistant'
     content = Column(Text, nullable=False)
-    metadata = Column(JSON, nullable=True)
+    # "metadata"는 Declarative API 예약어이므로 속성명만 변경 (컬럼명 유지)
+    meta = Column("metadata", JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     def __repr__(self):
@@ -50,11 +52,14 @@ class VectorDocument(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     document_id = Column(String(100), unique=True, nullable=False, index=True)
+    source_id = Column(String(100), nullable=True, index=True)  # 청킹 전 원문 ID
     leadership_type = Column(String(50), nullable=True, index=True)
     content = Column(Text, nullable=False)
-    metadata = Column(JSON, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # 내용+메타데이터+임베딩 모델 SHA-256 (변경 감지)
+    meta = Column("metadata", JSON, nullable=True)
     embedding_model = Column(String(100), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     def __repr__(self):
         return f"<VectorDocument(document_id='{self.document_id}')>"
@@ -71,7 +76,7 @@ class APILog(Base):
     status_code = Column(Integer, nullable=False)
     response_time_ms = Column(Float, nullable=True)
     error_message = Column(Text, nullable=True)
-    metadata = Column(JSON, nullable=True)
+    meta = Column("metadata", JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     def __repr__(self):
@@ -2,19 +2,39 @@
 AI 서비스 통합 레이어
 ML 모델, RAG 엔진, LLM을 통합하여 고수준 API 제공
 """
-from typing import Dict, Any, Optional, AsyncGenerator, List
+from typing import Dict, Any, Optional, AsyncGenerator, Awaitable, List, Set
 from datetime import datetime
+import asyncio
 import uuid
 import logging
+import time
 
 from app.services.ml_model import ml_model_service
 from app.services.rag_engine import rag_engine
 from app.services.llm_service import llm_service
-from app.services.prompt_templates import get_context_string, build_final_prompt
+from app.services.report_cache import report_cache
+from app.services.interpretation_store import interpretation_store, make_fingerprint
+from app.services.conversation_analyzer import conversation_analyzer
+from app.services.engagement_tracker import engagement_tracker
+from app.services.report_sections import report_section_index
+from app.services.response_strategy import ResponseStrategy
+from app.services.token_counter import token_calibrator
+from app.services.answer_cache import answer_cache
+from app.services.model_router import model_router
+from app.services.response_templates import response_templates
+from app.services.prompt_templates import build_final_prompt
+from app.core.metrics import RollingHistogram
+from app.core.scheduler import LLMOverloadedError, Priority
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# 프롬프트 토큰 집계 대상 구성 요소
+PROMPT_PARTS = ("system", "question", "report_context", "retrieved_context", "history", "total")
+
+# 해석 프롬프트 버전 (프롬프트 문구 변경 시 올려서 메모이제이션 캐시 무효화)
+INTERPRETATION_PROMPT_VERSION = "v1"
+
 
 class AIService:
     """AI 서비스 통합"""
@@ -23,8 +43,25 @@ class AIService:
         self.ml_model = ml_model_service
         self.rag = rag_engine
         self.llm = llm_service
-        # TODO: PostgreSQL 캐시 구현 시 연결
-        self.cache: Dict[str, Dict] = {}  # 임시 메모리 캐시
+        self.router = model_router
+        self.templates = response_templates  # 정형 전략 템플릿 답변 (LLM 호출 없음)
+        self.cache = report_cache  # 메모리 LRU + PostgreSQL 2단계 캐시
+        self.interpretations = interpretation_store
+        self.analyzer = conversation_analyzer
+        self.engagement = engagement_tracker
+        self.answers = answer_cache  # 초기 대화 단계 의미 기반 답변 캐시
+        self.sections = report_section_index  # 리포트 섹션 임베딩 (질문 관련 섹션만 컨텍스트로)
+        self._background_tasks: Set[asyncio.Task] = set()
+
+        # Q&A 준비 단계별 소요 시간 (prepare는 LLM 호출 전까지의 전체 시간)
+        self.stage_ms: Dict[str, RollingHistogram] = {}
+        self.stage_timeouts: Dict[str, int] = {}
+
+        # Q&A 프롬프트 구성 요소별 토큰 수 (build_final_prompt() 기준)
+        self.prompt_tokens: Dict[str, RollingHistogram] = {}
+
+        # Q&A 답변 출처별 턴 수 (템플릿/답변 캐시는 LLM 호출 없음)
+        self.answer_sources: Dict[str, int] = {"template": 0, "answer_cache": 0, "llm": 0}
 
     async def initialize(self) -> None:
         """모든 AI 서비스 초기화"""
@@ -101,10 +138,12 @@ class AIService:
 이 리포트는 개발 모드 더미 데이터입니다.""",
                     "created_at": datetime.now().isoformat()
                 }
+                mock_report["sections"] = await self._build_sections(
+                    leadership_type, mock_report["interpretation"]
+                )
 
                 # 캐시 저장
-                cache_key = f"{user_id}:{report_id}"
-                self.cache[cache_key] = mock_report
+                await self.cache.set(mock_report)
                 logger.info(f"✅ [MOCK] 리포트 생성 완료: {report_id}")
 
                 return mock_report
@@ -131,7 +170,20 @@ class AIService:
 
 500-800자 내외로 작성하세요."""
 
-            interpretation = await self.llm.generate_text(prompt)
+            if settings.INTERPRETATION_CACHE_ENABLED:
+                fingerprint = make_fingerprint(
+                    prompt_version=INTERPRETATION_PROMPT_VERSION,
+                    leadership_type=leadership_type,
+                    assessment_data=assessment_data,
+                    model_name=settings.GEMINI_MODEL,
+                    temperature=settings.GEMINI_TEMPERATURE
+                )
+                interpretation = await self.interpretations.get_or_generate(
+                    fingerprint,
+                    lambda: self.llm.generate_text(prompt, priority=Priority.REPORT)
+                )
+            else:
+                interpretation = await self.llm.generate_text(prompt, priority=Priority.REPORT)
 
             # 3. 리포트 데이터 구성
             report_id = f"rpt_{uuid.uuid4().hex[:12]}"
@@ -142,14 +194,14 @@ class AIService:
                 "user_id": user_id,
                 "leadership_type": leadership_type,
                 "interpretation": interpretation,
+                "assessment_data": assessment_data,
+                "sections": await self._build_sections(leadership_type, interpretation),
                 "created_at": created_at
             }
 
-            # 4. 캐시 저장
-            if settings.CACHE_ENABLED:
-                cache_key = f"{user_id}:{report_id}"
-                self.cache[cache_key] = report
-                logger.info(f"리포트 캐시 저장: {cache_key}")
+            # 4. 캐시 저장 (메모리 + DB write-through)
+            await self.cache.set(report)
+            logger.info(f"리포트 캐시 저장: {report_id}")
 
             logger.info(f"✅ 리포트 생성 완료: {report_id}")
             return report
@@ -160,6 +212,290 @@ class AIService:
 
 
 
+    async def _build_sections(self, leadership_type: str, interpretation: str) -> Optional[Dict[str, Any]]:
+        """
+        리포트 섹션 파싱 + 임베딩 (실패 시 None, 첫 질문 때 다시 시도)
+        """
+        if not settings.REPORT_SECTIONS_ENABLED:
+            return None
+        try:
+            return await asyncio.to_thread(self.sections.build, leadership_type, interpretation)
+        except Exception as e:
+            logger.warning(f"리포트 섹션 생성 실패 (질문 시 재시도): {e}")
+            return None
+
+    def _run_background(self, awaitable: Awaitable[Any]) -> None:
+        """응답을 기다리게 하지 않는 후속 작업 실행 (태스크 참조 유지)"""
+        task = asyncio.ensure_future(awaitable)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    # Q&A 기본 시스템 프롬프트 (대화 분석 단계가 실패/타임아웃된 경우 사용)
+    DEFAULT_QA_SYSTEM_PROMPT = """당신은 전문 리더십 코치입니다. 사용자의 리더십 리포트를 바탕으로 질문에 답변하세요.
+
+답변 가이드라인:
+1. 리포트 내용을 바탕으로 구체적으로 답변하세요
+2. 공감하고 격려하는 톤으로 작성하세요
+3. 실용적인 조언을 제공하세요
+4. 200-400자 내외로 간결하게 답변하세요"""
+
+    async def _run_stage(
+        self,
+        name: str,
+        awaitable: Awaitable[Any],
+        timeout: float,
+        timings: Dict[str, Any]
+    ) -> Any:
+        """
+        Q&A 준비 단계 실행 (단계별 마감 시간 적용)
+
+        타임아웃/오류 시 None을 반환하고, 소요 시간을 timings[name]에 기록합니다.
+        """
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+
+        except asyncio.TimeoutError:
+            self.stage_timeouts[name] = self.stage_timeouts.get(name, 0) + 1
+            logger.warning(f"Q&A 준비 단계 타임아웃: {name} ({timeout}초)")
+            return None
+
+        except Exception as e:
+            logger.warning(f"Q&A 준비 단계 실패: {name} - {e}")
+            return None
+
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stage_ms.setdefault(name, RollingHistogram()).observe(elapsed_ms)
+            timings[name] = round(elapsed_ms, 1)
+
+    async def _prepare_qa(
+        self,
+        user_id: str,
+        report_id: str,
+        question: str,
+        conversation_history: Optional[List[Any]] = None,
+        stats: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Q&A용 LLM 메시지 준비 (스트리밍/비-스트리밍 공통)
+
+        리포트 조회, 대화 분석, 참여도 계산, 참고자료 검색을 동시에 실행하므로
+        LLM 호출 전 대기 시간은 가장 느린 단계의 시간과 같습니다.
+        리포트 외의 단계는 실패/타임아웃되어도 해당 정보 없이 진행합니다.
+
+        Args:
+            user_id: 사용자 ID
+            report_id: 리포트 ID
+            question: 사용자 질문
+            conversation_history: 대화 히스토리 (ConversationMessage 리스트)
+            stats: 전달 시 stages(단계별 ms), strategy, model_tier, retrieved_documents, context_tokens,
+                report_context_tokens, prompt_tokens_breakdown(구성 요소별 토큰 수), engagement를 채워 넣음
+
+        Returns:
+            dict | None: Q&A 컨텍스트 (리포트가 없으면 None)
+                - messages: build_final_prompt() 결과
+                - leadership_type: 리포트의 리더십 유형
+                - analysis: 대화 분석 결과 (실패 시 None)
+                - strategy: 응답 전략 키 (분석 실패 시 None)
+                - route: model_router.route() 결과 (tier, model, max_tokens)
+                - has_history: 대화 히스토리가 있는 턴인지 (답변 캐시는 첫 질문만)
+        """
+        started = time.perf_counter()
+        stats = stats if stats is not None else {}
+        timings: Dict[str, Any] = {}
+
+        # Pydantic 객체 → dict 변환
+        history_dicts = [
+            {"role": msg.role, "content": msg.content}
+            for msg in conversation_history or []
+        ]
+
+        stages = [
+            self._run_stage(
+                "report",
+                self.get_cached_report(report_id, user_id),
+                settings.QA_REPORT_TIMEOUT_SECONDS,
+                timings
+            ),
+            self._run_stage(
+                "analysis",
+                asyncio.to_thread(self.analyzer.analyze, question, history_dicts),
+                settings.QA_ANALYSIS_TIMEOUT_SECONDS,
+                timings
+            ),
+            self._run_stage(
+                "engagement",
+                asyncio.to_thread(
+                    self.engagement.analyze_engagement, user_id, history_dicts, report_id
+                ),
+                settings.QA_ANALYSIS_TIMEOUT_SECONDS,
+                timings
+            ),
+        ]
+        if settings.RAG_ENABLED:
+            stages.append(self._run_stage(
+                "retrieval",
+                self.rag.search(question),
+                settings.QA_RETRIEVAL_TIMEOUT_SECONDS,
+                timings
+            ))
+
+        report, analysis, engagement, *retrieval = await asyncio.gather(*stages)
+
+        # 리포트 컨텍스트: 요약 + 질문 관련 섹션 (실패 시 전체 리포트)
+        report_context = None
+        if report and settings.REPORT_SECTIONS_ENABLED:
+            selected = await self._run_stage(
+                "report_sections",
+                asyncio.to_thread(self.sections.select_context, report, question),
+                settings.QA_RETRIEVAL_TIMEOUT_SECONDS,
+                timings
+            )
+            if selected is not None:
+                report_context, rebuilt = selected
+                if rebuilt:
+                    # 섹션 데이터가 없던 기존 리포트는 다음부터 재사용하도록 저장
+                    self._run_background(self.cache.set(report))
+
+        prepare_ms = (time.perf_counter() - started) * 1000
+        self.stage_ms.setdefault("prepare", RollingHistogram()).observe(prepare_ms)
+        timings["prepare"] = round(prepare_ms, 1)
+        stats["stages"] = timings
+
+        if not report:
+            logger.error(f"리포트를 찾을 수 없음: {report_id}")
+            return None
+
+        leadership_type = report.get("leadership_type")
+        if report_context is None:
+            report_context = report.get("interpretation", "")
+
+        # 1. 시스템 프롬프트 (대화 분석 결과에 따른 응답 전략)
+        if analysis:
+            strategy_key = ResponseStrategy.get_strategy_key(analysis)
+            system_prompt = ResponseStrategy.generate_system_prompt(strategy_key, analysis)
+        else:
+            strategy_key = None
+            system_prompt = self.DEFAULT_QA_SYSTEM_PROMPT
+
+        # 2. 참고자료 (유형 필터는 리포트 조회 후 적용)
+        documents = self.rag.select_for_type(retrieval[0] or [], leadership_type) if retrieval else []
+
+        retrieved_context = self.rag.format_context(documents)
+
+        # 3. 모델 티어 (짧은 안내/환영 턴은 fast 티어)
+        route = self.router.route(strategy_key, analysis)
+
+        stats["strategy"] = strategy_key
+        stats["model_tier"] = route["tier"]
+        stats["retrieved_documents"] = len(documents)
+        stats["engagement"] = engagement
+
+        breakdown: Dict[str, Any] = {}
+        messages = self._build_qa_messages(
+            report,
+            question,
+            history_dicts,
+            system_prompt=system_prompt,
+            retrieved_context=retrieved_context or None,
+            report_context=report_context,
+            breakdown=breakdown
+        )
+        stats["context_tokens"] = breakdown["retrieved_context"]
+        stats["report_context_tokens"] = breakdown["report_context"]
+        stats["prompt_tokens_breakdown"] = breakdown
+        for name in PROMPT_PARTS:
+            self.prompt_tokens.setdefault(name, RollingHistogram()).observe(breakdown[name])
+        return {
+            "messages": messages,
+            "leadership_type": leadership_type,
+            "analysis": analysis,
+            "strategy": strategy_key,
+            "route": route,
+            "has_history": bool(history_dicts),
+        }
+
+    def _render_template(self, qa: Dict[str, Any], stats: Dict[str, Any]) -> Optional[str]:
+        """정형 전략이면 템플릿 답변 생성 (대상이 아니면 None)"""
+        answer = self.templates.render(qa["strategy"], qa["leadership_type"], qa["analysis"])
+        stats["template"] = answer is not None
+        return answer
+
+    async def _lookup_cached_answer(
+        self,
+        qa: Dict[str, Any],
+        question: str,
+        stats: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        의미 기반 답변 캐시 조회 (GREETING/EXPLORATION 단계의 히스토리 없는 첫 질문만)
+
+        조회에 쓴 질문 임베딩은 qa["embedding"]에 남겨 답변 저장 시 재사용합니다.
+        """
+        cacheable = self.answers.is_cacheable(qa["analysis"], qa["has_history"])
+        if not (self.answers.enabled and qa["strategy"] and cacheable):
+            stats["answer_cache"] = "bypass"
+            return None
+
+        # 검색 단계에서 이미 계산했다면 임베딩 캐시 히트
+        embedding = await self._run_stage(
+            "answer_cache",
+            asyncio.to_thread(self.rag.vector_db.embedder.embed_query, question),
+            settings.QA_RETRIEVAL_TIMEOUT_SECONDS,
+            stats.setdefault("stages", {})
+        )
+        if embedding is None:
+            stats["answer_cache"] = "bypass"
+            return None
+
+        qa["embedding"] = embedding
+        answer, similarity = self.answers.lookup(qa["leadership_type"], qa["strategy"], embedding)
+        stats["answer_cache"] = "hit" if answer is not None else "miss"
+        stats["answer_similarity"] = round(similarity, 4)
+        return answer
+
+    def _store_answer(self, qa: Dict[str, Any], answer: str) -> None:
+        """캐시 미스였던 답변 저장"""
+        if qa.get("embedding") is not None and answer:
+            self.answers.store(qa["leadership_type"], qa["strategy"], qa["embedding"], answer)
+
+    def _build_qa_messages(
+        self,
+        report: Dict[str, Any],
+        question: str,
+        history_dicts: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        retrieved_context: Optional[str] = None,
+        report_context: Optional[str] = None,
+        breakdown: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Q&A용 LLM 메시지 리스트 구성
+
+        Args:
+            report: 리포트 데이터
+            question: 사용자 질문
+            history_dicts: 대화 히스토리 ({"role", "content"} 리스트)
+            system_prompt: 시스템 프롬프트 (없으면 기본 프롬프트)
+            retrieved_context: RAG 검색 참고자료
+            report_context: 리포트 컨텍스트 (없으면 전체 해석 텍스트)
+            breakdown: 전달 시 구성 요소별 토큰 수를 채워 넣음 (build_final_prompt() 참고)
+
+        Returns:
+            List[Dict]: build_final_prompt() 결과 메시지 리스트
+        """
+        # 입력 토큰 예산 안에서 리포트/참고자료/최근 대화를 우선순위대로 채움
+        return build_final_prompt(
+            question=question,
+            system_prompt=system_prompt or self.DEFAULT_QA_SYSTEM_PROMPT,
+            leadership_type=report.get("leadership_type"),
+            report_context=report_context if report_context is not None else report.get("interpretation", ""),
+            retrieved_context=retrieved_context,
+            conversation_history=history_dicts,
+            breakdown=breakdown
+        )
+
     async def query_non_streaming(
         self,
         user_id: str,
@@ -169,61 +505,163 @@ class AIService:
     ) -> str:
         """
         맥락 기반 Q&A (비-스트리밍)
-        나중에 스트리밍으로 전환 가능하도록 구조화
         """
         try:
             logger.info(f"Q&A 요청 (Non-Streaming): user={user_id}, report={report_id}, question={question[:50]}...")
 
-            # 1. 리포트 조회
-            report = await self.get_cached_report(report_id, user_id)
-            if not report:
-                logger.error(f"리포트를 찾을 수 없음: {report_id}")
+            # 1. 리포트 조회 + 분석 + 검색 (동시 실행) → 프롬프트 메시지 구성
+            stats: Dict[str, Any] = {}
+            qa = await self._prepare_qa(user_id, report_id, question, conversation_history, stats=stats)
+            if qa is None:
                 return "죄송합니다. 리포트를 찾을 수 없습니다."
 
-            leadership_type = report.get("leadership_type")
-            interpretation = report.get("interpretation", "")
+            # 2. 정형 전략은 템플릿 답변
+            templated = self._render_template(qa, stats)
+            if templated is not None:
+                self.answer_sources["template"] += 1
+                logger.info(f"✅ Q&A 완료 (템플릿 답변, 전략 {qa['strategy']})")
+                return templated
+
+            # 3. 유사 질문 답변 재사용
+            cached = await self._lookup_cached_answer(qa, question, stats)
+            if cached is not None:
+                self.answer_sources["answer_cache"] += 1
+                logger.info(f"✅ Q&A 완료 (답변 캐시 히트, 유사도 {stats['answer_similarity']})")
+                return cached
+
+            # 4. LLM 호출 (메시지 리스트 기반)
+            answer = await self.llm.generate_from_messages(
+                qa["messages"],
+                max_tokens=qa["route"]["max_tokens"],
+                priority=Priority.QA,
+                tier=qa["route"]["tier"]
+            )
+            self.answer_sources["llm"] += 1
+            self._store_answer(qa, answer)
 
-            # 2. 대화 히스토리 구성 (Pydantic 객체 → dict 변환)
-            history_dicts = []
-            if conversation_history:
-                for msg in conversation_history[-5:]:  # 최근 5개만
-                    history_dicts.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
+            logger.info(f"✅ Q&A 완료: {len(answer)} chars")
+            return answer
 
-            # 3. 시스템 프롬프트 정의
-            system_prompt = """당신은 전문 리더십 코치입니다. 사용자의 리더십 리포트를 바탕으로 질문에 답변하세요.
+        except LLMOverloadedError:
+            # 과부하는 엔드포인트에서 503으로 응답
+            raise
 
-답변 가이드라인:
-1. 리포트 내용을 바탕으로 구체적으로 답변하세요
-2. 공감하고 격려하는 톤으로 작성하세요
-3. 실용적인 조언을 제공하세요
-4. 200-400자 내외로 간결하게 답변하세요"""
+        except Exception as e:
+            logger.error(f"Q&A 실패 (Non-Streaming): {e}", exc_info=True)
+            return "죄송합니다. 답변 생성 중 오류가 발생했습니다. 다시 시도해주세요."
 
-            # 4. 컨텍스트 문자열 생성 (prompt_templates 활용)
-            context_string = get_context_string(
-                leadership_type=leadership_type,
-                report_context=interpretation
-            )
+    async def generate_answer_streaming(
+        self,
+        user_id: str,
+        report_id: str,
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        stream_stats: Optional[Dict[str, Any]] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        맥락 기반 Q&A (스트리밍)
+
+        LLM 델타를 받는 즉시 그대로 전달합니다.
+
+        Args:
+            user_id: 사용자 ID
+            report_id: 리포트 ID
+            question: 사용자 질문
+            conversation_history: 대화 히스토리
+            stream_stats: 전달 시 스트림 종료 후 타이밍/토큰 통계를 채워 넣음
+                - time_to_first_chunk_ms: 첫 청크까지 걸린 시간
+                - total_ms: 전체 소요 시간
+                - chunk_count: 전송한 청크 수
+                - answer_chars: 답변 길이
+                - prompt_tokens / completion_tokens: 토큰 수
+                - token_count_estimated: 토큰 수가 추정치인지 여부
+                - stages / strategy / model_tier / retrieved_documents / context_tokens / report_context_tokens /
+                  prompt_tokens_breakdown / engagement:
+                  _prepare_qa() 참고
+                - template: 템플릿 답변 여부
+                - answer_cache: hit / miss / bypass, answer_similarity: 최고 유사도 (템플릿 답변이면 없음)
+
+        Yields:
+            str: 답변 텍스트 델타
+        """
+        started = time.perf_counter()
+        stats = stream_stats if stream_stats is not None else {}
+        stats.update({"chunk_count": 0, "answer_chars": 0, "time_to_first_chunk_ms": None})
+
+        try:
+            logger.info(f"Q&A 요청 (Streaming): user={user_id}, report={report_id}, question={question[:50]}...")
 
-            # 5. 최종 프롬프트 메시지 리스트 생성 (prompt_templates 활용)
-            messages = build_final_prompt(
-                question=question,
-                system_prompt=system_prompt,
-                context_string=context_string,
-                conversation_history=history_dicts
+            # 1. 리포트 조회 + 분석 + 검색 (동시 실행) → 프롬프트 메시지 구성
+            qa = await self._prepare_qa(
+                user_id, report_id, question, conversation_history, stats=stats
+            )
+            if qa is None:
+                yield "죄송합니다. 리포트를 찾을 수 없습니다."
+                return
+
+            # 2. 정형 전략은 템플릿 답변, 유사 질문은 캐시된 답변 재사용 (LLM 호출 없이 한 번에 전송)
+            source = "template"
+            cached = self._render_template(qa, stats)
+            if cached is None:
+                source = "answer_cache"
+                cached = await self._lookup_cached_answer(qa, question, stats)
+            if cached is not None:
+                self.answer_sources[source] += 1
+                stats.update({
+                    "time_to_first_chunk_ms": round((time.perf_counter() - started) * 1000, 1),
+                    "chunk_count": 1,
+                    "answer_chars": len(cached),
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "token_count_estimated": False,
+                })
+                if source == "template":
+                    logger.info(f"✅ Q&A 스트리밍 완료 (템플릿 답변, 전략 {qa['strategy']})")
+                else:
+                    logger.info(f"✅ Q&A 스트리밍 완료 (답변 캐시 히트, 유사도 {stats['answer_similarity']})")
+                yield cached
+                return
+
+            # 3. LLM 스트리밍 호출
+            llm_stats: Dict[str, Any] = {}
+            parts: List[str] = []
+            async for delta in self.llm.generate_text_streaming(
+                qa["messages"],
+                max_tokens=qa["route"]["max_tokens"],
+                stats=llm_stats,
+                priority=Priority.STREAMING,
+                tier=qa["route"]["tier"]
+            ):
+                if stats["time_to_first_chunk_ms"] is None:
+                    stats["time_to_first_chunk_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                stats["chunk_count"] += 1
+                stats["answer_chars"] += len(delta)
+                parts.append(delta)
+                yield delta
+
+            self.answer_sources["llm"] += 1
+            self._store_answer(qa, "".join(parts))
+
+            stats["prompt_tokens"] = llm_stats.get("prompt_tokens")
+            stats["completion_tokens"] = llm_stats.get("completion_tokens")
+            stats["token_count_estimated"] = llm_stats.get("token_count_estimated", True)
+
+            logger.info(
+                f"✅ Q&A 스트리밍 완료: {stats['answer_chars']} chars, "
+                f"첫 청크 {stats['time_to_first_chunk_ms']}ms"
             )
 
-            # 6. LLM 호출 (메시지 리스트 기반)
-            answer = await self.llm.generate_from_messages(messages)
+        finally:
+            stats["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
 
-            logger.info(f"✅ Q&A 완료: {len(answer)} chars")
-            return answer
+    def check_llm_capacity(self, priority: Priority) -> None:
+        """
+        LLM 대기열 사전 확인 (스트리밍 응답 시작 전에 503으로 거절하기 위함)
 
-        except Exception as e:
-            logger.error(f"Q&A 실패 (Non-Streaming): {e}", exc_info=True)
-            return "죄송합니다. 답변 생성 중 오류가 발생했습니다. 다시 시도해주세요."
+        Raises:
+            LLMOverloadedError: 지금 도착한 요청의 대기 예상 시간이 마감 시간을 넘는 경우
+        """
+        self.llm.scheduler.check_admission(priority)
 
     async def get_cached_report(
         self,
@@ -231,7 +669,7 @@ class AIService:
         user_id: str
     ) -> Optional[Dict[str, Any]]:
         """
-        캐시된 리포트 조회
+        캐시된 리포트 조회 (메모리 LRU → PostgreSQL read-through)
 
         Args:
             report_id: 리포트 ID
@@ -241,15 +679,11 @@ class AIService:
             dict | None: 리포트 데이터
         """
         try:
-            # 임시 메모리 캐시에서 조회
-            cache_key = f"{user_id}:{report_id}"
-            report = self.cache.get(cache_key)
+            report = await self.cache.get(user_id, report_id)
 
             if report:
-                logger.info(f"캐시에서 리포트 조회: {cache_key}")
                 return report
 
-            # TODO: PostgreSQL에서 조회
             logger.info(f"리포트를 찾을 수 없음: {report_id}")
             return None
 
@@ -257,6 +691,44 @@ class AIService:
             logger.error(f"리포트 조회 실패: {e}", exc_info=True)
             return None
 
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        AI 서비스 운영 지표 조회
+
+        Returns:
+            dict: 컴포넌트별 통계
+        """
+        total_answers = sum(self.answer_sources.values())
+        return {
+            "report_cache": self.cache.get_stats(),
+            "interpretation_store": self.interpretations.get_stats(),
+            "llm": self.llm.get_stats(),
+            "model_router": self.router.get_stats(),
+            "ml_model": self.ml_model.get_stats(),
+            "vector_db": self.rag.vector_db.get_stats(),
+            "rag": self.rag.get_stats(),
+            "report_sections": self.sections.get_stats(),
+            "embedding": self.rag.vector_db.embedder.get_stats(),
+            "answer_cache": self.answers.get_stats(),
+            "prompt_tokens": {
+                **{name: histogram.summary() for name, histogram in self.prompt_tokens.items()},
+                "budget": settings.PROMPT_MAX_INPUT_TOKENS,
+                "calibration": token_calibrator.get_stats(),
+            },
+            "response_templates": self.templates.get_stats(),
+            "answer_sources": {
+                **self.answer_sources,
+                "llm_free_ratio": (
+                    round(1 - self.answer_sources["llm"] / total_answers, 4) if total_answers else 0.0
+                ),
+            },
+            "qa_stages": {
+                name: {**histogram.summary(), "timeouts": self.stage_timeouts.get(name, 0)}
+                for name, histogram in self.stage_ms.items()
+            },
+            "engagement": self.engagement.get_stats(),
+        }
+
 
 # 싱글톤 인스턴스
 ai_service = AIService()
@@ -0,0 +1,154 @@
+"""
+의미 기반 답변 캐시
+(리더십 유형, 응답 전략)별로 질문 임베딩과 답변을 저장하고,
+코사인 유사도가 임계값 이상인 질문에는 저장된 답변을 재사용
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+import threading
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.metrics import RollingHistogram
+from app.services.conversation_analyzer import ConversationStage
+
+logger = logging.getLogger(__name__)
+
+# 답변 재사용을 허용하는 대화 단계 (초기 단계는 질문이 비슷하면 답변도 비슷함, 히스토리 없는 턴만)
+CACHEABLE_STAGES = (ConversationStage.GREETING, ConversationStage.EXPLORATION)
+
+
+class _AnswerBucket:
+    """(리더십 유형, 전략) 하나의 답변 저장소 (고정 크기 링 버퍼)"""
+
+    def __init__(self, capacity: int, dimension: int):
+        self.capacity = capacity
+        self.vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        self.stored_at = np.full(capacity, -np.inf)
+        self.answers: List[Optional[str]] = [None] * capacity
+        self.next_slot = 0
+
+    def add(self, vector: np.ndarray, answer: str, now: float) -> None:
+        slot = self.next_slot
+        self.vectors[slot] = vector
+        self.stored_at[slot] = now
+        self.answers[slot] = answer
+        self.next_slot = (slot + 1) % self.capacity
+
+    def best_match(self, vector: np.ndarray, min_stored_at: float) -> Tuple[Optional[str], float]:
+        """만료되지 않은 항목 중 가장 유사한 답변과 코사인 유사도"""
+        similarities = self.vectors @ vector
+        similarities[(self.stored_at < min_stored_at) | np.isneginf(self.stored_at)] = -np.inf
+        best = int(np.argmax(similarities))
+        return self.answers[best], float(similarities[best])
+
+
+class SemanticAnswerCache:
+    """
+    의미 기반 답변 캐시 (싱글톤)
+
+    - 질문 임베딩은 단위 벡터로 저장하므로 내적이 곧 코사인 유사도
+    - 키당 최대 ANSWER_CACHE_MAX_ENTRIES_PER_KEY개 (가장 오래된 항목부터 덮어씀),
+      키 수는 ANSWER_CACHE_MAX_KEYS로 제한 (LRU)
+    - 항목별 TTL(ANSWER_CACHE_TTL_SECONDS)이 지나면 매칭에서 제외
+    """
+
+    def __init__(self):
+        self.enabled = settings.ANSWER_CACHE_ENABLED
+        self.threshold = settings.ANSWER_CACHE_SIMILARITY_THRESHOLD
+        self.ttl_seconds = settings.ANSWER_CACHE_TTL_SECONDS
+        self.entries_per_key = max(1, settings.ANSWER_CACHE_MAX_ENTRIES_PER_KEY)
+        self._buckets: TTLCache[_AnswerBucket] = TTLCache(max_size=settings.ANSWER_CACHE_MAX_KEYS)
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.hits = 0
+        self.stores = 0
+        self.hit_similarity = RollingHistogram()
+
+    @staticmethod
+    def is_cacheable(analysis: Optional[Dict[str, Any]], has_history: bool = False) -> bool:
+        """
+        캐시 사용 가능 여부 (GREETING/EXPLORATION 단계의 첫 질문만)
+
+        대화 히스토리가 있는 턴의 답변은 그 사용자의 대화 내용(사람/상황)을 담을 수 있어
+        같은 유형의 다른 사용자에게 재사용하지 않습니다.
+        """
+        return not has_history and bool(analysis) and analysis.get("stage") in CACHEABLE_STAGES
+
+    @staticmethod
+    def _unit(vector: Sequence[float]) -> Optional[np.ndarray]:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm > 0 else None
+
+    def lookup(
+        self,
+        leadership_type: str,
+        strategy_key: str,
+        embedding: Sequence[float]
+    ) -> Tuple[Optional[str], float]:
+        """
+        유사 질문의 저장된 답변 조회
+
+        Returns:
+            (답변 | None, 최고 유사도)
+        """
+        self.lookups += 1
+        vector = self._unit(embedding)
+        bucket = self._buckets.get((leadership_type, strategy_key))
+        if bucket is None or vector is None or bucket.vectors.shape[1] != vector.shape[0]:
+            return None, 0.0
+
+        min_stored_at = time.monotonic() - self.ttl_seconds if self.ttl_seconds else -np.inf
+        with self._lock:
+            answer, similarity = bucket.best_match(vector, min_stored_at)
+
+        if answer is None or similarity < self.threshold:
+            return None, max(similarity, 0.0)
+
+        self.hits += 1
+        self.hit_similarity.observe(similarity)
+        return answer, similarity
+
+    def store(
+        self,
+        leadership_type: str,
+        strategy_key: str,
+        embedding: Sequence[float],
+        answer: str
+    ) -> None:
+        """답변 저장"""
+        vector = self._unit(embedding)
+        if vector is None or not answer:
+            return
+
+        key = (leadership_type, strategy_key)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None or bucket.vectors.shape[1] != vector.shape[0]:
+                bucket = _AnswerBucket(self.entries_per_key, vector.shape[0])
+                self._buckets.set(key, bucket)
+            bucket.add(vector, answer, time.monotonic())
+        self.stores += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 (히트율, 히트 시 유사도 분포)"""
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "keys": len(self._buckets),
+            "key_evictions": self._buckets.evictions,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "stores": self.stores,
+            "hit_ratio": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "hit_similarity": self.hit_similarity.summary(),
+        }
+
+
+# 싱글톤 인스턴스
+answer_cache = SemanticAnswerCache()
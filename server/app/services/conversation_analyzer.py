@@ -2,10 +2,16 @@
 대화 분석 및 오프토픽 감지 서비스
 사용자 질문의 의도, 감정, 단계를 분석하고 오프토픽 여부를 판단
 """
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import deque
+from itertools import chain, islice, repeat
+from multiprocessing.context import BaseContext
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 from enum import Enum
 import logging
 
+from app.services.keyword_matcher import keyword_matcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,6 +70,63 @@ class ConversationAnalyzer:
             'urgent': ['당장', '급하', '내일', '오늘', '지금 바로']
         }
 
+        # 특성 분석용 표현
+        self.greeting_time_words = ['아침', '저녁', '오후', '하루', '주말']
+        self.wellbeing_phrases = ['지내', '어때', '괜찮', '잘 있', '건강', '안녕']
+        self.request_markers = ['어떻게', '어떡', '방법', '뭐', '무엇', '?']
+
+        # 공유 오토마톤에 키워드 그룹 등록 (질문을 한 번만 훑어 모든 그룹 판정)
+        self._registered_keywords: Optional[Tuple] = None
+        self.refresh_keywords()
+
+    def _keyword_snapshot(self) -> Tuple:
+        """현재 키워드 목록 스냅샷 (변경 감지용)"""
+        return (
+            tuple(self.leadership_keywords),
+            tuple((category, tuple(keywords)) for category, keywords in self.offtopic_keywords.items()),
+            tuple(self.greeting_patterns),
+            tuple(self.greeting_time_words),
+            tuple(self.wellbeing_phrases),
+            tuple(self.request_markers),
+            tuple((emotion_type, tuple(keywords)) for emotion_type, keywords in self.emotion_keywords.items()),
+        )
+
+    def refresh_keywords(self, force: bool = False) -> bool:
+        """
+        키워드 목록이 바뀌었으면 그룹 마스크 다시 등록
+
+        analyze()와 analyze_many()가 시작할 때 호출하므로, 생성 후 키워드 목록을
+        수정해도 다음 분석부터 반영됩니다. (analyze_many() 도중의 수정은 반영되지 않음)
+
+        Args:
+            force: 변경이 없어도 다시 등록 (다른 프로세스에서 복원한 인스턴스용)
+
+        Returns:
+            bool: 다시 등록했는지 여부
+        """
+        snapshot = self._keyword_snapshot()
+        if not force and snapshot == self._registered_keywords:
+            return False
+
+        leadership, offtopic, greeting, greeting_time, wellbeing, request, emotion = snapshot
+        self._leadership_mask = keyword_matcher.register("analyzer.leadership", leadership)
+        self._offtopic_masks = [
+            (category, keyword_matcher.register(f"analyzer.offtopic.{category.name}", keywords))
+            for category, keywords in offtopic
+        ]
+        self._greeting_mask = keyword_matcher.register("analyzer.greeting", greeting)
+        self._good_mask = keyword_matcher.register("analyzer.greeting_good", ['좋은'])
+        self._greeting_time_mask = keyword_matcher.register("analyzer.greeting_time", greeting_time)
+        self._wellbeing_mask = keyword_matcher.register("analyzer.wellbeing", wellbeing)
+        self._request_mask = keyword_matcher.register("analyzer.request", request)
+        self._emotion_masks = {
+            emotion_type: keyword_matcher.register(f"analyzer.emotion.{emotion_type}", keywords)
+            for emotion_type, keywords in emotion
+        }
+        keyword_matcher.compile()
+        self._registered_keywords = snapshot
+        return True
+
     def analyze(
         self,
         question: str,
@@ -85,19 +148,96 @@ class ConversationAnalyzer:
                 - emotion: 감정 상태
                 - requires_context: 컨텍스트 필요 여부
         """
+        self.refresh_keywords()
+        result = self._analyze(question, conversation_history)
+        logger.info(f"대화 분석 완료: {result}")
+        return result
+
+    def analyze_many(
+        self,
+        questions: Iterable[str],
+        histories: Optional[Iterable[Optional[List[Dict]]]] = None,
+        workers: int = 0,
+        chunk_size: int = 1000,
+        min_parallel: int = 50000,
+        mp_context: Optional[BaseContext] = None
+    ) -> Iterator[Dict]:
+        """
+        질문 여러 개를 순서대로 분석 (지연 평가 제너레이터)
+
+        입력을 chunk_size개씩 잘라 처리하므로 전체 말뭉치를 메모리에 올리지 않습니다.
+        workers가 2 이상이면 프로세스 풀에 청크 단위로 분배하고,
+        진행 중인 청크는 workers * 2개로 제한합니다. 건별 INFO 로그는 남기지 않습니다.
+        입력이 min_parallel개 미만이면 풀 시작 비용이 더 크므로 현재 프로세스에서 처리합니다.
+        (판단을 위해 최대 min_parallel개까지 먼저 읽어 둠)
+
+        Args:
+            questions: 질문 iterable
+            histories: 질문별 대화 히스토리 iterable (None이면 모두 히스토리 없음)
+            workers: 프로세스 수 (0/1이면 현재 프로세스에서 처리)
+            chunk_size: 작업 단위 크기
+            min_parallel: 프로세스 풀을 쓰는 최소 질문 수
+            mp_context: 프로세스 시작 방식 (None이면 플랫폼 기본값)
+
+        Yields:
+            dict: 입력 순서대로 analyze()와 같은 결과
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size는 1 이상이어야 합니다.")
+
+        self.refresh_keywords()
+        pairs = zip(questions, histories) if histories is not None else zip(questions, repeat(None))
+        chunks = iter(lambda: list(islice(pairs, chunk_size)), [])
+
+        # 입력이 min_parallel개 이상인지 확인할 때까지 청크를 모아 둠
+        buffered: List[List[Tuple[str, Optional[List[Dict]]]]] = []
+        if workers > 1:
+            buffered_count = 0
+            for chunk in chunks:
+                buffered.append(chunk)
+                buffered_count += len(chunk)
+                if buffered_count >= min_parallel:
+                    break
+            else:
+                workers = 0
+        chunks = chain(buffered, chunks)
+
+        if workers <= 1:
+            for chunk in chunks:
+                for question, history in chunk:
+                    yield self._analyze(question, history)
+            return
+
+        # 워커 프로세스마다 이 인스턴스(설정 포함)를 한 번 전달해 두고 청크를 분석
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp_context, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            pending: Deque[Future] = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_analyze_chunk, chunk))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _analyze(self, question: str, conversation_history: Optional[List[Dict]]) -> Dict:
+        """analyze() 본체 (로그 없음)"""
         question_lower = question.lower()
 
+        # 모든 키워드 그룹을 한 번의 스캔으로 판정
+        hits = keyword_matcher.scan(question_lower)
+
         # 1. 대화 단계 계산
         stage = self._calculate_stage(conversation_history)
 
         # 2. 오프토픽 감지
-        is_offtopic, offtopic_category = self._detect_offtopic(question, question_lower)
+        is_offtopic, offtopic_category = self._detect_offtopic(question, question_lower, hits)
 
         # 3. 질문 특성 분석
-        traits = self._analyze_traits(question, question_lower)
+        traits = self._analyze_traits(question, question_lower, hits)
 
         # 4. 감정 상태 분석
-        emotion = self._analyze_emotion(question_lower)
+        emotion = self._analyze_emotion(question_lower, hits)
 
         # 5. 단계 조정 (감정, 긴급성 등에 따라)
         stage = self._adjust_stage(stage, traits, emotion)
@@ -114,8 +254,6 @@ class ConversationAnalyzer:
             "requires_context": requires_context,
             "question_length": len(question)
         }
-
-        logger.info(f"대화 분석 완료: {result}")
         return result
 
     def _calculate_stage(self, conversation_history: Optional[List[Dict]]) -> ConversationStage:
@@ -128,51 +266,56 @@ class ConversationAnalyzer:
         stage_num = min(turns // 2 + 1, 4)
         return ConversationStage(stage_num)
 
-    def _detect_offtopic(self, question: str, question_lower: str) -> Tuple[bool, Optional[OffTopicCategory]]:
+    def _detect_offtopic(
+        self,
+        question: str,
+        question_lower: str,
+        hits: Optional[int] = None
+    ) -> Tuple[bool, Optional[OffTopicCategory]]:
         """오프토픽 감지"""
+        if hits is None:
+            hits = keyword_matcher.scan(question_lower)
+
         # 1. 한글 비율 체크 (외국어/난센스)
         korean_chars = sum(1 for c in question if '가' <= c <= '힣')
         if korean_chars < len(question) * 0.3 and len(question) > 3:
             return True, OffTopicCategory.NONSENSE
 
         # 2. 리더십 컨텍스트 확인
-        has_leadership_context = any(
-            keyword in question_lower for keyword in self.leadership_keywords
-        )
+        has_leadership_context = keyword_matcher.any_hit(hits, self._leadership_mask)
 
-        # 3. 오프토픽 키워드 매칭
+        # 3. 오프토픽 키워드 매칭 (카테고리 정의 순서대로 첫 적중)
         if not has_leadership_context:
-            for category, keywords in self.offtopic_keywords.items():
-                if any(keyword in question_lower for keyword in keywords):
+            for category, mask in self._offtopic_masks:
+                if keyword_matcher.any_hit(hits, mask):
                     return True, category
 
         return False, None
 
-    def _analyze_traits(self, question: str, question_lower: str) -> List[str]:
+    def _analyze_traits(
+        self,
+        question: str,
+        question_lower: str,
+        hits: Optional[int] = None
+    ) -> List[str]:
         """질문 특성 분석"""
+        if hits is None:
+            hits = keyword_matcher.scan(question_lower)
+
         traits = []
 
         # 인사말
-        if any(word in question_lower for word in self.greeting_patterns):
+        if keyword_matcher.any_hit(hits, self._greeting_mask):
             traits.append("인사")
 
-        if '좋은' in question_lower and any(
-            time in question_lower for time in ['아침', '저녁', '오후', '하루', '주말']
-        ):
+        if keyword_matcher.any_hit(hits, self._good_mask) and keyword_matcher.any_hit(hits, self._greeting_time_mask):
             traits.append("인사")
 
         # 구체적 요청
-        is_wellbeing = any(
-            phrase in question_lower for phrase in ['지내', '어때', '괜찮', '잘 있', '건강', '안녕']
-        )
+        is_wellbeing = keyword_matcher.any_hit(hits, self._wellbeing_mask)
 
         if any([
-            '어떻게' in question_lower,
-            '어떡' in question_lower,
-            '방법' in question_lower,
-            '뭐' in question_lower,
-            '무엇' in question_lower,
-            '?' in question,
+            keyword_matcher.any_hit(hits, self._request_mask),
             (question.endswith('죠') and not is_wellbeing),
             (question.endswith('나요') and not is_wellbeing),
             (question.endswith('을까요') and not is_wellbeing),
@@ -189,14 +332,15 @@ class ConversationAnalyzer:
 
         return traits if traits else ["일반질문"]
 
-    def _analyze_emotion(self, question_lower: str) -> Dict[str, bool]:
+    def _analyze_emotion(self, question_lower: str, hits: Optional[int] = None) -> Dict[str, bool]:
         """감정 상태 분석"""
-        emotions = {}
-
-        for emotion_type, keywords in self.emotion_keywords.items():
-            emotions[emotion_type] = any(keyword in question_lower for keyword in keywords)
+        if hits is None:
+            hits = keyword_matcher.scan(question_lower)
 
-        return emotions
+        return {
+            emotion_type: keyword_matcher.any_hit(hits, mask)
+            for emotion_type, mask in self._emotion_masks.items()
+        }
 
     def _adjust_stage(
         self,
@@ -301,3 +445,25 @@ class ConversationAnalyzer:
 
 # 싱글톤 인스턴스
 conversation_analyzer = ConversationAnalyzer()
+
+
+# 프로세스 풀 워커의 분석기 (analyze_many()를 호출한 인스턴스의 복사본)
+_worker_analyzer: Optional[ConversationAnalyzer] = None
+
+
+def _init_worker(analyzer: ConversationAnalyzer) -> None:
+    """
+    프로세스 풀 워커 초기화 (analyze_many()를 호출한 인스턴스 보관)
+
+    복원된 그룹 마스크는 부모 프로세스의 패턴 ID 기준이므로, 이 프로세스의
+    keyword_matcher에 키워드 목록을 다시 등록해 마스크를 새로 만듭니다.
+    (spawn/forkserver에서는 패턴 ID가 import 시 등록 순서로 다시 매겨짐)
+    """
+    global _worker_analyzer
+    analyzer.refresh_keywords(force=True)
+    _worker_analyzer = analyzer
+
+
+def _analyze_chunk(chunk: List[Tuple[str, Optional[List[Dict]]]]) -> List[Dict]:
+    """작업 단위 분석 (프로세스 풀 워커에서 호출되므로 모듈 수준 함수)"""
+    return [_worker_analyzer._analyze(question, history) for question, history in chunk]
@@ -0,0 +1,152 @@
+"""
+임베딩 서비스
+Chroma 임베딩 함수를 직접 소유하고, 질의 임베딩을 (모델, 정규화 텍스트) 키로 캐시
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import re
+import threading
+import time
+import unicodedata
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.metrics import RollingHistogram
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    임베딩용 텍스트 정규화 (NFC 정규화, 연속 공백 축소, 앞뒤 공백 제거)
+
+    토크나이저가 공백을 구분자로만 쓰므로 임베딩 결과는 바뀌지 않고 캐시 키만 통일됩니다.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+class EmbeddingService:
+    """
+    임베딩 서비스 (싱글톤)
+
+    - EMBEDDING_BACKEND에 따라 Chroma 임베딩 함수를 지연 생성
+      ("onnx": Chroma 기본 ONNX all-MiniLM-L6-v2, "sentence-transformers": EMBEDDING_MODEL_NAME)
+    - 질의 임베딩은 크기 제한 LRU에 캐시, 문서 임베딩은 캐시하지 않음
+    - Chroma EmbeddingFunction 인터페이스(__call__(input))를 구현하므로 컬렉션에 그대로 전달 가능
+    """
+
+    def __init__(self):
+        self.backend = settings.EMBEDDING_BACKEND
+        self.model_name = settings.EMBEDDING_MODEL_NAME
+        self._function: Optional[Any] = None
+        self._function_lock = threading.Lock()
+        self._cache: TTLCache[List[float]] = TTLCache(max_size=settings.EMBEDDING_CACHE_MAX_SIZE)
+
+        self.compute_ms = RollingHistogram()  # 임베딩 계산 호출당 소요 시간
+        self.cpu_seconds = 0.0  # 임베딩 계산을 호출한 스레드의 CPU 시간 합계
+        self.embedded_texts = 0
+        self._stats_lock = threading.Lock()  # 여러 스레드에서 계산하므로 통계 갱신 보호
+
+    @property
+    def function(self) -> Any:
+        """Chroma 임베딩 함수 (첫 사용 시 생성)"""
+        if self._function is None:
+            with self._function_lock:
+                if self._function is None:
+                    self._function = self._create_function()
+        return self._function
+
+    def _create_function(self) -> Any:
+        from chromadb.utils import embedding_functions
+
+        logger.info(f"임베딩 함수 생성: backend={self.backend}, model={self.model_name}")
+        if self.backend == "sentence-transformers":
+            return embedding_functions.SentenceTransformerEmbeddingFunction(model_name=self.model_name)
+        if self.backend == "onnx":
+            if self.model_name != "all-MiniLM-L6-v2":
+                logger.warning(f"onnx 백엔드는 all-MiniLM-L6-v2만 지원합니다 (설정: {self.model_name})")
+            return embedding_functions.ONNXMiniLM_L6_V2()
+        raise ValueError(f"지원하지 않는 임베딩 백엔드: {self.backend}")
+
+    def _compute(self, texts: List[str]) -> List[List[float]]:
+        """
+        임베딩 계산 (블로킹, 호출 스레드에서 실행)
+
+        CPU 시간은 호출 스레드 기준(thread_time)이라 동시에 도는 다른 계산/이벤트 루프는 포함하지 않습니다.
+        """
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+
+        embeddings = self.function(texts)
+
+        cpu_seconds = time.thread_time() - cpu_started
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self.cpu_seconds += cpu_seconds
+            self.compute_ms.observe(elapsed_ms)
+            self.embedded_texts += len(texts)
+        return [[float(value) for value in vector] for vector in embeddings]
+
+    def _cache_key(self, text: str) -> Tuple[str, str]:
+        return (self.model_name, normalize_text(text))
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        질의 임베딩 (캐시 사용, 블로킹)
+
+        캐시 미스인 질의만 한 번의 호출로 묶어서 계산합니다.
+        """
+        keys = [self._cache_key(query) for query in queries]
+        vectors: Dict[Tuple[str, str], List[float]] = {}
+        misses: Dict[Tuple[str, str], None] = {}  # 순서 유지 + 중복 제거
+
+        for key in keys:
+            if key in vectors or key in misses:
+                continue
+            cached = self._cache.get(key)
+            if cached is not None:
+                vectors[key] = cached
+            else:
+                misses[key] = None
+
+        if misses:
+            for key, vector in zip(misses, self._compute([text for _, text in misses])):
+                self._cache.set(key, vector)
+                vectors[key] = vector
+
+        return [vectors[key] for key in keys]
+
+    def cached_query(self, query: str) -> Optional[List[float]]:
+        """캐시된 질의 임베딩 (없으면 None, 계산하지 않음)"""
+        return self._cache.get(self._cache_key(query))
+
+    def embed_query(self, query: str) -> List[float]:
+        """질의 1개 임베딩 (캐시 사용, 블로킹)"""
+        return self.embed_queries([query])[0]
+
+    def embed_documents(self, documents: List[str]) -> List[List[float]]:
+        """문서 임베딩 (캐시 미사용, 블로킹)"""
+        if not documents:
+            return []
+        return self._compute([normalize_text(document) for document in documents])
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        """Chroma EmbeddingFunction 인터페이스 (컬렉션의 텍스트 기반 호출용)"""
+        return self.embed_documents(list(input))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """임베딩 통계 (캐시 히트율, 계산 시간/CPU 시간)"""
+        return {
+            "backend": self.backend,
+            "model": self.model_name,
+            "cache": self._cache.get_stats(),
+            "embedded_texts": self.embedded_texts,
+            "compute_ms": self.compute_ms.summary(),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+        }
+
+
+# 싱글톤 인스턴스
+embedding_service = EmbeddingService()
@@ -1,12 +1,45 @@
 """
 사용자 참여도(Engagement) 추적 및 전문 상담사 연결 판단
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import re
 import logging
+import threading
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.services.keyword_matcher import keyword_matcher
 
 logger = logging.getLogger(__name__)
 
+# 메시지 결합 구분자 (배치 경로의 " ".join과 동일해야 함)
+_SEPARATOR = " "
+
+
+class EngagementState:
+    """
+    대화별 누적 참여도 상태
+
+    사용자 메시지를 하나씩 반영하며, 지금까지의 메시지를 " "로 이어 붙인
+    텍스트(combined_text)를 배치로 분석한 것과 같은 결과를 유지합니다.
+    """
+
+    __slots__ = (
+        "message_count", "total_length", "combined_length",
+        "hits", "quality_hits", "open_spans", "tail", "last_message"
+    )
+
+    def __init__(self, span_count: int):
+        self.message_count = 0
+        self.total_length = 0
+        self.combined_length = 0      # combined_text 길이 (구분자 포함)
+        self.hits = 0                 # 키워드 적중 비트맵
+        self.quality_hits = 0         # 대화 질 패턴 적중 비트맵 (QUALITY_PATTERNS 인덱스)
+        # "A.*B" 패턴별: 마지막 줄바꿈 이후 가장 먼저 끝난 A의 끝 위치 (없으면 None)
+        self.open_spans: List[Optional[int]] = [None] * span_count
+        self.tail = ""                # combined_text의 마지막 몇 글자 (경계 매치용)
+        self.last_message: Optional[str] = None
+
 
 class EngagementTracker:
     """사용자 참여도 추적 - 정교화된 분석"""
@@ -42,20 +75,73 @@ class EngagementTracker:
         r"처음에는.*지금은",  # 변화 인식
     ]
 
+    # 카테고리별 (키워드 표, 단계별 가중치)
+    SCORE_TABLES = {
+        "emotional": (EMOTIONAL_KEYWORDS, {"high": 10, "medium": 5, "low": 2}),
+        "action": (ACTION_KEYWORDS, {"high": 10, "medium": 5, "low": 2}),
+        "advanced": (ADVANCED_KEYWORDS, {"high": 15, "medium": 8, "low": 3}),
+    }
+
+    _QUALITY_REGEXES = [re.compile(pattern) for pattern in QUALITY_PATTERNS]
+
     def __init__(self):
-        self.engagement_scores = {}
+        # 대화별 누적 상태: {(user_id, report_id): EngagementState}
+        self.engagement_scores: TTLCache[EngagementState] = TTLCache(
+            max_size=settings.ENGAGEMENT_STATE_MAX_SIZE,
+            ttl_seconds=settings.ENGAGEMENT_STATE_TTL_SECONDS
+        )
+        self._state_lock = threading.Lock()
+        self.incremental_updates = 0
+        self.rebuilds = 0
+
+        # 대화 질 패턴 분류
+        # - "A.*B": 두 리터럴로 나눠 상태 머신으로 추적 (스캔 길이가 메시지 길이에 비례)
+        # - 그 외: 메시지별 검색 + 경계 창 검색 (패턴 문자열 길이 이내로 매치가 확인되는 패턴)
+        self._bounded_quality: List[Tuple[int, re.Pattern]] = []
+        self._span_quality: List[Tuple[int, str, str]] = []
+        for index, pattern in enumerate(self.QUALITY_PATTERNS):
+            parts = pattern.split(".*")
+            if len(parts) == 2 and all(part and re.escape(part) == part for part in parts):
+                self._span_quality.append((index, parts[0], parts[1]))
+            else:
+                self._bounded_quality.append((index, self._QUALITY_REGEXES[index]))
+        self._quality_window = max(
+            (len(regex.pattern) - 1 for _, regex in self._bounded_quality), default=0
+        )
+        self._span_window = max(
+            (max(len(a), len(b)) - 1 for _, a, b in self._span_quality), default=0
+        )
+
+        # 공유 오토마톤에 키워드 그룹 등록: {카테고리: [(마스크, 가중치), ...]}
+        # 키워드 표는 클래스 상수이므로 생성 시 한 번만 등록 (표를 바꾸면 새 인스턴스를 만들어야 반영)
+        self._weighted_masks = {
+            category: [
+                (keyword_matcher.register(f"engagement.{category}.{level}", table[level]), weight)
+                for level, weight in weights.items()
+            ]
+            for category, (table, weights) in self.SCORE_TABLES.items()
+        }
+        keyword_matcher.compile()
+        self._tail_window = max(
+            keyword_matcher.boundary_window, self._quality_window, self._span_window
+        )
 
     def analyze_engagement(
         self,
         user_id: str,
-        conversation_history: List[Dict[str, str]]
+        conversation_history: List[Dict[str, str]],
+        report_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         대화 기록을 분석하여 참여도 점수 계산
 
+        report_id가 주어지면 (user_id, report_id)별 누적 상태에 새 메시지만 반영하고,
+        없으면 히스토리 전체를 처음부터 분석합니다. 두 경로의 결과는 동일합니다.
+
         Args:
             user_id: 사용자 ID
             conversation_history: 대화 히스토리
+            report_id: 리포트 ID (증분 모드)
 
         Returns:
             dict: 참여도 분석 결과
@@ -75,20 +161,35 @@ class EngagementTracker:
             if msg.get('role') == 'user'
         ]
 
-        if len(user_messages) < 2:
-            return self._default_result()
+        if report_id is None:
+            # 배치: 전체 키워드 표를 한 번에 판정 (메시지별 스캔 결과 재사용)
+            if len(user_messages) < 2:
+                return self._default_result()
+            message_count = len(user_messages)
+            total_length = sum(len(msg) for msg in user_messages)
+            hits = keyword_matcher.scan_joined(user_messages, _SEPARATOR)
+            quality_hits = self._scan_quality(_SEPARATOR.join(user_messages))
+        else:
+            # 증분: 누적 상태에 새 메시지만 반영
+            state = self._update_state((user_id, report_id), user_messages)
+            if state.message_count < 2:
+                return self._default_result()
+            message_count = state.message_count
+            total_length = state.total_length
+            hits = state.hits
+            quality_hits = state.quality_hits
 
         # 1. 대화 깊이 점수 (0-30점)
-        conversation_depth_score = self._calculate_conversation_depth(user_messages)
+        conversation_depth_score = self._calculate_conversation_depth(message_count, total_length)
 
         # 2. 감정적 투자 점수 (0-25점)
-        emotional_score = self._calculate_emotional_investment(user_messages)
+        emotional_score = self._calculate_emotional_investment(hits)
 
         # 3. 실행 의지 점수 (0-25점)
-        action_score = self._calculate_action_intent(user_messages)
+        action_score = self._calculate_action_intent(hits)
 
         # 4. 심화 주제 점수 (0-20점)
-        advanced_score = self._calculate_advanced_topics(user_messages)
+        advanced_score = self._calculate_advanced_topics(hits, quality_hits)
 
         # 총점 계산
         total_score = (
@@ -114,9 +215,159 @@ class EngagementTracker:
 
         return result
 
-    def _calculate_conversation_depth(self, user_messages: List[str]) -> int:
+    def _scan_quality(self, combined_text: str) -> int:
+        """대화 질 패턴 적중 비트맵 (배치 경로)"""
+        quality_hits = 0
+        for index, regex in enumerate(self._QUALITY_REGEXES):
+            if regex.search(combined_text):
+                quality_hits |= 1 << index
+        return quality_hits
+
+    def _new_state(self) -> EngagementState:
+        return EngagementState(len(self._span_quality))
+
+    def _update_state(self, key: Tuple[str, str], user_messages: List[str]) -> EngagementState:
+        """
+        누적 상태에 아직 반영하지 않은 메시지만 반영
+
+        히스토리가 이전 턴의 연장이 아니면 (잘림, 수정 등) 처음부터 다시 만듭니다.
+        """
+        with self._state_lock:
+            state = self.engagement_scores.get(key)
+            count = state.message_count if state is not None else 0
+
+            if state is None or len(user_messages) < count or (
+                count and user_messages[count - 1] != state.last_message
+            ):
+                if state is not None:
+                    self.rebuilds += 1
+                state = self._new_state()
+                count = 0
+
+            for message in user_messages[count:]:
+                self._consume(state, message)
+                self.incremental_updates += 1
+
+            self.engagement_scores.set(key, state)
+            return state
+
+    def _consume(self, state: EngagementState, message: str) -> None:
+        """
+        메시지 하나를 상태에 반영 (비용은 메시지 길이에 비례)
+
+        combined_text에 (구분자 +) 메시지를 덧붙인 것으로 보고,
+        메시지 내부 매치와 이전 텍스트와의 경계를 가로지르는 매치를 모두 찾습니다.
+        """
+        first = state.message_count == 0
+        tail = state.tail
+        segment_start = state.combined_length + (0 if first else len(_SEPARATOR))
+
+        # 키워드: 메시지별 스캔(캐시) + 경계 창
+        state.hits |= keyword_matcher.scan_cached(message)
+        window = keyword_matcher.boundary_window
+        if not first and window > 0:
+            state.hits |= keyword_matcher.scan(tail[-window:] + _SEPARATOR + message[:window])
+
+        # 길이 제한 패턴: 메시지 내부 + 경계 창
+        window = self._quality_window
+        for index, regex in self._bounded_quality:
+            if state.quality_hits >> index & 1:
+                continue
+            if regex.search(message) or (
+                not first and window > 0
+                and regex.search(tail[-window:] + _SEPARATOR + message[:window])
+            ):
+                state.quality_hits |= 1 << index
+
+        # "A.*B" 패턴: 이전 꼬리 + 새 구간에서 위치순으로 이벤트 처리
+        for slot, (index, head, foot) in enumerate(self._span_quality):
+            if state.quality_hits >> index & 1:
+                continue
+            if self._advance_span(state, slot, head, foot, tail, message, first, segment_start):
+                state.quality_hits |= 1 << index
+
+        # 상태 갱신
+        window = self._tail_window
+        if window > 0:
+            recent = message[-window:]
+            state.tail = recent if first else (tail + _SEPARATOR + recent)[-window:]
+        state.combined_length = segment_start + len(message)
+        state.message_count += 1
+        state.total_length += len(message)
+        state.last_message = message
+
+    def _advance_span(
+        self,
+        state: EngagementState,
+        slot: int,
+        head: str,
+        foot: str,
+        tail: str,
+        message: str,
+        first: bool,
+        segment_start: int
+    ) -> bool:
+        """
+        "head.*foot" 매치 여부를 새 구간까지 갱신
+
+        "."은 줄바꿈과 매치되지 않으므로, 같은 줄에서 head가 끝난 뒤 foot이
+        시작하면 매치입니다. 줄바꿈 이후 가장 먼저 끝난 head의 끝 위치만 기억하면
+        충분합니다.
+        """
+        window = self._span_window
+        if first:
+            prefix = ""
+        else:
+            prefix = (tail[-window:] if window > 0 else "") + _SEPARATOR
+        text = prefix + message
+        # text의 new_from 이후가 새로 덧붙은 구간 (구분자 포함)
+        new_from = len(prefix) - (0 if first else len(_SEPARATOR))
+        offset = segment_start - len(prefix)  # text 위치 → combined_text 위치
+
+        # (위치, 순서): 같은 위치면 head 끝 → 줄바꿈 → foot 시작 순으로 처리
+        events: List[Tuple[int, int]] = []
+        start = text.find(head)
+        while start != -1:
+            end = start + len(head)
+            if end > new_from:
+                events.append((end, 0))
+            start = text.find(head, start + 1)
+        newline = text.find("\n", new_from)
+        while newline != -1:
+            events.append((newline, 1))
+            newline = text.find("\n", newline + 1)
+        start = text.find(foot)
+        while start != -1:
+            if start + len(foot) > new_from:
+                events.append((start, 2))
+            start = text.find(foot, start + 1)
+        events.sort()
+
+        open_end = state.open_spans[slot]
+        for position, kind in events:
+            position += offset
+            if kind == 0:
+                if open_end is None:
+                    open_end = position
+            elif kind == 1:
+                open_end = None
+            elif open_end is not None and open_end <= position:
+                state.open_spans[slot] = open_end
+                return True
+
+        state.open_spans[slot] = open_end
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """누적 상태 통계"""
+        return {
+            "states": self.engagement_scores.get_stats(),
+            "incremental_updates": self.incremental_updates,
+            "rebuilds": self.rebuilds,
+        }
+
+    def _calculate_conversation_depth(self, message_count: int, total_length: int) -> int:
         """대화 깊이 점수 계산 (0-30점)"""
-        message_count = len(user_messages)
 
         # 메시지 수에 따른 점수
         if message_count >= 5:
@@ -129,7 +380,7 @@ class EngagementTracker:
             count_score = 4
 
         # 평균 메시지 길이에 따른 점수
-        avg_length = sum(len(msg) for msg in user_messages) / len(user_messages)
+        avg_length = total_length / message_count
         if avg_length >= 100:
             length_score = 15
         elif avg_length >= 50:
@@ -141,74 +392,27 @@ class EngagementTracker:
 
         return count_score + length_score
 
-    def _calculate_emotional_investment(self, user_messages: List[str]) -> int:
-        """감정적 투자 점수 계산 (0-25점) - 가중치 적용"""
-        combined_text = " ".join(user_messages)
-
-        score = 0
-        # high 키워드: 10점씩
-        for keyword in self.EMOTIONAL_KEYWORDS["high"]:
-            if keyword in combined_text:
-                score += 10
-
-        # medium 키워드: 5점씩
-        for keyword in self.EMOTIONAL_KEYWORDS["medium"]:
-            if keyword in combined_text:
-                score += 5
-
-        # low 키워드: 2점씩
-        for keyword in self.EMOTIONAL_KEYWORDS["low"]:
-            if keyword in combined_text:
-                score += 2
-
-        return min(score, 25)  # 최대 25점
-
-    def _calculate_action_intent(self, user_messages: List[str]) -> int:
-        """실행 의지 점수 계산 (0-25점) - 가중치 적용"""
-        combined_text = " ".join(user_messages)
-
-        score = 0
-        # high 키워드: 10점씩
-        for keyword in self.ACTION_KEYWORDS["high"]:
-            if keyword in combined_text:
-                score += 10
-
-        # medium 키워드: 5점씩
-        for keyword in self.ACTION_KEYWORDS["medium"]:
-            if keyword in combined_text:
-                score += 5
-
-        # low 키워드: 2점씩
-        for keyword in self.ACTION_KEYWORDS["low"]:
-            if keyword in combined_text:
-                score += 2
-
-        return min(score, 25)  # 최대 25점
-
-    def _calculate_advanced_topics(self, user_messages: List[str]) -> int:
-        """심화 주제 점수 계산 (0-20점) - 가중치 적용"""
-        combined_text = " ".join(user_messages)
-
-        score = 0
-        # high 키워드: 15점씩
-        for keyword in self.ADVANCED_KEYWORDS["high"]:
-            if keyword in combined_text:
-                score += 15
-
-        # medium 키워드: 8점씩
-        for keyword in self.ADVANCED_KEYWORDS["medium"]:
-            if keyword in combined_text:
-                score += 8
-
-        # low 키워드: 3점씩
-        for keyword in self.ADVANCED_KEYWORDS["low"]:
-            if keyword in combined_text:
-                score += 3
+    def _weighted_score(self, category: str, hits: int) -> int:
+        """카테고리 키워드 적중 수 × 단계별 가중치 합계 (상한 적용 전)"""
+        return sum(
+            weight * keyword_matcher.count_hits(hits, mask)
+            for mask, weight in self._weighted_masks[category]
+        )
+
+    def _calculate_emotional_investment(self, hits: int) -> int:
+        """감정적 투자 점수 계산 (0-25점) - high 10점, medium 5점, low 2점"""
+        return min(self._weighted_score("emotional", hits), 25)  # 최대 25점
+
+    def _calculate_action_intent(self, hits: int) -> int:
+        """실행 의지 점수 계산 (0-25점) - high 10점, medium 5점, low 2점"""
+        return min(self._weighted_score("action", hits), 25)  # 최대 25점
+
+    def _calculate_advanced_topics(self, hits: int, quality_hits: int) -> int:
+        """심화 주제 점수 계산 (0-20점) - high 15점, medium 8점, low 3점"""
+        score = self._weighted_score("advanced", hits)
 
         # 대화 질 패턴 보너스 (각 5점)
-        for pattern in self.QUALITY_PATTERNS:
-            if re.search(pattern, combined_text):
-                score += 5
+        score += 5 * quality_hits.bit_count()
 
         return min(score, 20)  # 최대 20점
 
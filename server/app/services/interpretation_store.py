@@ -0,0 +1,154 @@
+"""
+해석 리포트 메모이제이션
+(프롬프트 버전, 리더십 유형, 진단 데이터, 모델, 온도) 해시로 생성 결과를 재사용
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import random
+
+from app.config import settings
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_assessment_data(data: Any) -> Any:
+    """
+    진단 데이터 정규화 (키 정렬, None 제거, 실수 반올림, 문자열 공백 제거)
+
+    같은 의미의 입력이 같은 지문(fingerprint)을 갖도록 합니다.
+    """
+    if isinstance(data, dict):
+        return {
+            str(key): normalize_assessment_data(value)
+            for key, value in sorted(data.items(), key=lambda item: str(item[0]))
+            if value is not None
+        }
+    if isinstance(data, (list, tuple)):
+        return [normalize_assessment_data(value) for value in data]
+    if isinstance(data, bool):
+        return data
+    if isinstance(data, float):
+        return round(data, 4)
+    if isinstance(data, str):
+        return data.strip()
+    return data
+
+
+def make_fingerprint(
+    prompt_version: str,
+    leadership_type: str,
+    assessment_data: Optional[Dict[str, Any]],
+    model_name: str,
+    temperature: float
+) -> str:
+    """
+    해석 요청 지문 생성
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    payload = {
+        "prompt_version": prompt_version,
+        "leadership_type": leadership_type.strip(),
+        "assessment_data": normalize_assessment_data(assessment_data or {}),
+        "model": model_name,
+        "temperature": round(float(temperature), 4),
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class InterpretationStore:
+    """
+    해석 결과 저장소
+
+    - 키당 최대 variants_per_key개의 서로 다른 생성 결과를 보관하고 무작위로 제공
+    - 동일 키에 대한 동시 요청은 진행 중인 하나의 LLM 호출을 공유 (single-flight)
+    - 생성 태스크는 요청과 분리되어 있어 한 요청이 취소돼도 나머지 요청은 결과를 받음
+    """
+
+    def __init__(self):
+        self.variants_per_key = max(1, settings.INTERPRETATION_VARIANTS_PER_KEY)
+        self._variants: TTLCache[List[str]] = TTLCache(
+            max_size=settings.INTERPRETATION_CACHE_MAX_SIZE,
+            ttl_seconds=settings.INTERPRETATION_CACHE_TTL_SECONDS
+        )
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.generations = 0
+        self.coalesced = 0
+
+    async def get_or_generate(
+        self,
+        key: str,
+        generate: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        캐시된 해석 반환 또는 생성
+
+        Args:
+            key: make_fingerprint()로 만든 지문
+            generate: 캐시 미스 시 호출할 LLM 생성 코루틴 함수
+
+        Returns:
+            str: 해석 텍스트
+        """
+        variants = self._variants.get(key) or []
+
+        # 변형이 충분히 모였으면 그중 하나를 제공
+        if len(variants) >= self.variants_per_key:
+            self.hits += 1
+            return random.choice(variants)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # 이미 생성 중: 기존 변형이 있으면 즉시 제공, 없으면 진행 중인 호출을 공유
+            if variants:
+                self.hits += 1
+                return random.choice(variants)
+            self.coalesced += 1
+        else:
+            # 생성은 저장소가 소유한 태스크에서 실행 (처음 요청한 쪽이 끊겨도 다른 대기자에게 결과 전달)
+            self.generations += 1
+            inflight = asyncio.create_task(self._generate(key, generate))
+            self._inflight[key] = inflight
+            # 대기자가 모두 취소됐을 때 "exception was never retrieved" 경고 방지
+            inflight.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+        return await asyncio.shield(inflight)
+
+    async def _generate(self, key: str, generate: Callable[[], Awaitable[str]]) -> str:
+        """LLM 생성 + 변형 저장 (get_or_generate()가 만든 태스크에서 실행)"""
+        try:
+            text = await generate()
+
+            current = list(self._variants.get(key) or [])
+            if len(current) < self.variants_per_key:
+                current.append(text)
+                self._variants.set(key, current)
+            return text
+
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """저장소 통계"""
+        total = self.hits + self.generations + self.coalesced
+        return {
+            "keys": len(self._variants),
+            "variants_per_key": self.variants_per_key,
+            "hits": self.hits,
+            "generations": self.generations,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "llm_avoided_ratio": round((self.hits + self.coalesced) / total, 4) if total else 0.0,
+        }
+
+
+# 싱글톤 인스턴스
+interpretation_store = InterpretationStore()
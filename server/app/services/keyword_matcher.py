@@ -0,0 +1,204 @@
+"""
+다중 키워드 매처 (Aho–Corasick)
+대화 분석기와 참여도 추적기가 공유하는 키워드 집합을 하나의 오토마톤으로 컴파일하고,
+텍스트를 한 번만 훑어서 모든 키워드 적중 여부를 비트맵으로 반환
+"""
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class AhoCorasickAutomaton:
+    """
+    Aho–Corasick 오토마톤 (완전 DFA)
+
+    실패 링크를 미리 펼쳐 두어 스캔 시 문자당 dict 조회 1회로 전이합니다.
+    각 상태의 출력은 (실패 링크를 따라 도달 가능한 것 포함) 패턴 ID 비트마스크입니다.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        goto: List[Dict[str, int]] = [{}]
+        output: List[int] = [0]
+
+        # 1. 트라이 구성
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto.append({})
+                    output.append(0)
+                    goto[state][ch] = next_state
+                state = next_state
+            output[state] |= 1 << pattern_id
+
+        # 2. BFS로 실패 링크 계산 + 완전 DFA 전이 테이블 구성
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in range(len(goto) - 1)]
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            # 실패 상태의 전이를 상속한 뒤 자신의 goto로 덮어씀
+            transitions = dict(delta[fail[state]])
+            for ch, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state]].get(ch, 0)
+                output[next_state] |= output[fail[next_state]]
+                transitions[ch] = next_state
+                queue.append(next_state)
+            delta[state] = transitions
+
+        self._delta = delta
+        self._output = output
+
+    def scan(self, text: str) -> int:
+        """
+        텍스트에서 등장한 모든 패턴 ID 비트맵 반환 (겹치는 매치 포함, O(len(text)))
+        """
+        delta = self._delta
+        output = self._output
+        state = 0
+        hits = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            out = output[state]
+            if out:
+                hits |= out
+        return hits
+
+
+class KeywordMatcher:
+    """
+    키워드 그룹 레지스트리 + 공유 오토마톤
+
+    - register()로 그룹별 키워드를 등록하면 그룹 마스크(패턴 비트의 OR)를 돌려줌
+      (같은 그룹을 다시 등록하면 마스크를 새 키워드로 교체, 패턴 ID는 바뀌지 않음)
+    - 서로 다른 그룹에 같은 키워드가 있어도 패턴은 하나로 합쳐짐
+    - scan() 결과 비트맵과 그룹 마스크를 any_hit()/count_hits()로 조합해 사용
+    """
+
+    def __init__(self):
+        self._pattern_ids: Dict[str, int] = {}
+        self._group_masks: Dict[str, int] = {}
+        self._automaton: AhoCorasickAutomaton = AhoCorasickAutomaton([])
+        self._max_pattern_len = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        # 대화 히스토리는 매 턴 다시 전송되므로 메시지별 스캔 결과를 재사용
+        self._scan_cached = lru_cache(maxsize=4096)(self._scan_uncached)
+
+    def register(self, group: str, keywords: Iterable[str]) -> int:
+        """
+        키워드 그룹 등록 (이미 있는 그룹이면 마스크 교체)
+
+        새 키워드가 생기면 다음 스캔 전에 오토마톤을 다시 컴파일합니다.
+        기존 패턴 ID는 유지되므로 다른 그룹 마스크와 캐시된 적중 비트맵은 그대로 유효합니다.
+
+        Args:
+            group: 그룹 이름 (예: "analyzer.offtopic.날씨")
+            keywords: 키워드 목록 (부분 문자열 매칭)
+
+        Returns:
+            int: 그룹 마스크
+        """
+        with self._lock:
+            mask = 0
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                pattern_id = self._pattern_ids.get(keyword)
+                if pattern_id is None:
+                    pattern_id = len(self._pattern_ids)
+                    self._pattern_ids[keyword] = pattern_id
+                    self._dirty = True
+                mask |= 1 << pattern_id
+            self._group_masks[group] = mask
+            return mask
+
+    def compile(self) -> None:
+        """등록된 모든 키워드로 오토마톤 (재)컴파일"""
+        with self._lock:
+            if not self._dirty:
+                return
+            patterns = [""] * len(self._pattern_ids)
+            for keyword, pattern_id in self._pattern_ids.items():
+                patterns[pattern_id] = keyword
+            self._automaton = AhoCorasickAutomaton(patterns)
+            self._max_pattern_len = max((len(p) for p in patterns), default=0)
+            self._scan_cached.cache_clear()
+            self._dirty = False
+        logger.debug(f"키워드 오토마톤 컴파일: 패턴 {len(patterns)}개, 그룹 {len(self._group_masks)}개")
+
+    def scan(self, text: str) -> int:
+        """텍스트를 한 번 훑어 적중한 패턴 비트맵 반환"""
+        if self._dirty:
+            self.compile()
+        return self._automaton.scan(text)
+
+    def _scan_uncached(self, text: str) -> int:
+        return self._automaton.scan(text)
+
+    def scan_cached(self, text: str) -> int:
+        """scan()과 같지만 같은 텍스트의 결과를 재사용 (대화 메시지용)"""
+        if self._dirty:
+            self.compile()
+        return self._scan_cached(text)
+
+    @property
+    def boundary_window(self) -> int:
+        """경계를 가로지르는 매치를 찾기 위해 경계 양쪽에서 볼 문자 수 (최대 키워드 길이 - 1)"""
+        if self._dirty:
+            self.compile()
+        return max(self._max_pattern_len - 1, 0)
+
+    def scan_joined(self, texts: Sequence[str], separator: str = " ") -> int:
+        """
+        separator.join(texts)를 스캔한 것과 같은 비트맵 반환
+
+        메시지별 스캔 결과는 캐시하고, 메시지 경계를 가로지르는 매치는
+        경계 앞뒤 (최대 키워드 길이 - 1)자 창만 다시 스캔해서 찾습니다.
+        """
+        if self._dirty:
+            self.compile()
+
+        window = self._max_pattern_len - 1
+        hits = 0
+        tail = ""  # 지금까지 이어 붙인 텍스트의 마지막 window자
+
+        for index, text in enumerate(texts):
+            hits |= self._scan_cached(text)
+            if index > 0 and window > 0:
+                hits |= self._automaton.scan(tail + separator + text[:window])
+            if window > 0:
+                recent = text[-window:]
+                tail = (tail + separator + recent)[-window:] if index > 0 else recent
+
+        return hits
+
+    def mask(self, group: str) -> int:
+        """그룹 마스크 조회"""
+        return self._group_masks.get(group, 0)
+
+    @staticmethod
+    def any_hit(hits: int, mask: int) -> bool:
+        """그룹 내 키워드가 하나라도 등장했는지"""
+        return bool(hits & mask)
+
+    @staticmethod
+    def count_hits(hits: int, mask: int) -> int:
+        """그룹 내에서 등장한 서로 다른 키워드 수"""
+        return (hits & mask).bit_count()
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self._pattern_ids)
+
+
+# 싱글톤 인스턴스 (대화 분석기/참여도 추적기가 import 시 키워드를 등록)
+keyword_matcher = KeywordMatcher()
@@ -2,11 +2,19 @@
 리더십 유형 분류 로직
 실제 비즈니스 규칙에 따른 리더십 유형 결정
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Union
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# 진단 점수 차원 (classify_many 입력 열 순서)
+SCORE_DIMENSIONS = ("공유및참여", "상호작용", "성장지향")
+
+# 차원별 기본 임계값 (이상이면 '높음')
+DEFAULT_THRESHOLDS = (4.5, 4.5, 4.5)
+
 
 # 리더십 유형 정의
 LEADERSHIP_TYPES = {
@@ -83,7 +91,8 @@ FOLLOWERSHIP_TYPES = {
 def classify_leadership_type(
     sharing_participation: float,
     interaction: float,
-    growth_orientation: float
+    growth_orientation: float,
+    thresholds: Optional[Union[float, Sequence[float]]] = None
 ) -> str:
     """
     리더십 유형 분류
@@ -92,16 +101,17 @@ def classify_leadership_type(
         sharing_participation: 공유및참여 점수 (0-5)
         interaction: 상호작용 점수 (0-5)
         growth_orientation: 성장지향 점수 (0-5)
+        thresholds: 임계값 (단일 값 또는 SCORE_DIMENSIONS 순서의 차원별 값, 기본 4.5)
 
     Returns:
         str: 리더십 유형
     """
-    threshold = 4.5
+    sp_threshold, ia_threshold, go_threshold = _resolve_thresholds(thresholds)
 
     # 각 차원이 임계값 이상인지 확인
-    sp_high = sharing_participation >= threshold
-    ia_high = interaction >= threshold
-    go_high = growth_orientation >= threshold
+    sp_high = sharing_participation >= sp_threshold
+    ia_high = interaction >= ia_threshold
+    go_high = growth_orientation >= go_threshold
 
     # 분류 로직
     if sp_high and ia_high and go_high:
@@ -122,6 +132,62 @@ def classify_leadership_type(
         return "과도기형"
 
 
+def _resolve_thresholds(thresholds: Optional[Union[float, Sequence[float]]]) -> tuple:
+    """임계값 인자를 (공유및참여, 상호작용, 성장지향) 튜플로 정규화"""
+    if thresholds is None:
+        return DEFAULT_THRESHOLDS
+    if isinstance(thresholds, (int, float)):
+        return (float(thresholds),) * len(SCORE_DIMENSIONS)
+
+    values = tuple(float(value) for value in thresholds)
+    if len(values) != len(SCORE_DIMENSIONS):
+        raise ValueError(f"임계값은 {len(SCORE_DIMENSIONS)}개여야 합니다: {values}")
+    return values
+
+
+# 유형 ID (classify_many 반환값) → 유형 이름
+LEADERSHIP_TYPE_NAMES: List[str] = list(LEADERSHIP_TYPES.keys())
+
+# 3비트 코드 (공유및참여 << 2 | 상호작용 << 1 | 성장지향) → 유형 ID
+# 스칼라 함수로 8가지 조합을 직접 분류해서 만들므로 두 경로의 결과가 항상 같음
+_CODE_TO_TYPE_ID = np.array([
+    LEADERSHIP_TYPE_NAMES.index(classify_leadership_type(
+        *(1.0 if code >> shift & 1 else 0.0 for shift in (2, 1, 0)),
+        thresholds=1.0
+    ))
+    for code in range(8)
+], dtype=np.uint8)
+
+
+def classify_many(
+    scores: np.ndarray,
+    thresholds: Optional[Union[float, Sequence[float]]] = None
+) -> np.ndarray:
+    """
+    리더십 유형 일괄 분류 (벡터화)
+
+    세 차원의 임계값 비교 결과를 3비트 코드로 묶은 뒤 룩업 테이블로 유형 ID를 구합니다.
+    결과는 classify_leadership_type()과 행마다 동일합니다 (NaN은 '낮음').
+
+    Args:
+        scores: (N, 3) 점수 배열 (열 순서는 SCORE_DIMENSIONS)
+        thresholds: 임계값 (단일 값 또는 차원별 값, 기본 4.5)
+
+    Returns:
+        np.ndarray: (N,) uint8 유형 ID (LEADERSHIP_TYPE_NAMES 인덱스)
+    """
+    scores = np.asarray(scores)
+    if scores.ndim != 2 or scores.shape[1] != len(SCORE_DIMENSIONS):
+        raise ValueError(f"scores는 (N, {len(SCORE_DIMENSIONS)}) 배열이어야 합니다: {scores.shape}")
+
+    high = (scores >= np.asarray(_resolve_thresholds(thresholds))).view(np.uint8)
+
+    codes = high[:, 0] << 2
+    codes |= high[:, 1] << 1
+    codes |= high[:, 2]
+    return _CODE_TO_TYPE_ID[codes]
+
+
 def get_leadership_info(leadership_type: str) -> Dict[str, Any]:
     """리더십 유형 정보 조회"""
     return LEADERSHIP_TYPES.get(leadership_type, {})
@@ -0,0 +1,288 @@
+"""
+어휘 인덱스 (BM25)
+한글은 글자 2-gram/3-gram, 영문/숫자는 단어 단위로 색인해
+임베딩 검색이 놓치는 정확한 용어("1on1", "R&R", "성과 평가")를 찾음
+"""
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import re
+import time
+import unicodedata
+
+import numpy as np
+
+from app.core.metrics import RollingHistogram
+from app.services.local_index import Signature, collection_signature
+
+logger = logging.getLogger(__name__)
+
+# 한글 음절 연속 구간 | 영문/숫자 단어 (R&R, 1on1 같은 표기 포함)
+_TOKEN = re.compile(r"[가-힣]+|[a-z0-9]+(?:[&'][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    색인/질의 공통 토큰화
+
+    한글 구간은 조사/어미가 붙어도 어간이 맞도록 글자 2-gram과 3-gram으로,
+    한 글자 구간은 그대로, 영문/숫자는 소문자 단어로 만듭니다.
+    """
+    tokens: List[str] = []
+    for run in _TOKEN.findall(unicodedata.normalize("NFC", text or "").lower()):
+        if not ("가" <= run[0] <= "힣") or len(run) == 1:
+            tokens.append(run)
+            continue
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        tokens.extend(run[i:i + 3] for i in range(len(run) - 2))
+    return tokens
+
+
+class _Postings:
+    """검색에 쓰는 불변 색인 (교체는 참조 대입 한 번으로 원자적)"""
+
+    __slots__ = ("vocabulary", "offsets", "doc_ids", "weights", "idf", "ids", "documents", "metadatas", "type_rows")
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        offsets: np.ndarray,
+        doc_ids: np.ndarray,
+        weights: np.ndarray,
+        idf: np.ndarray,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ):
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.idf = idf
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+
+        types = np.array([(metadata or {}).get("leadership_type") or "" for metadata in metadatas], dtype=object)
+        self.type_rows: Dict[str, np.ndarray] = {
+            str(name): np.flatnonzero(types == name) for name in set(types.tolist()) if name
+        }
+
+
+class LexicalIndex:
+    """
+    BM25 역색인
+
+    - 포스팅은 CSR 배열(offsets, doc_ids int32, weights float32)로 보관
+    - 문서별 BM25 가중치를 색인 시점에 미리 계산하므로 질의는
+      질의 용어의 포스팅 구간을 이어 붙인 뒤 np.bincount 한 번으로 점수 합산
+    - sync()는 컬렉션 시그니처(ID, 버전, 문서 수)가 바뀌었을 때만 동작하며,
+      문서별 토큰화 결과(용어 ID, tf)를 ID/본문으로 비교해 새로 생겼거나 바뀐 문서만 토큰화
+      (idf/평균 길이는 전체에 걸리므로 CSR 배열은 NumPy 정렬 한 번으로 다시 조립)
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        self.signature: Optional[Signature] = None
+        self._postings: Optional[_Postings] = None
+
+        # 재색인 간 재사용 상태 (sync()/build() 스레드에서만 변경)
+        self._vocabulary: Dict[str, int] = {}
+        self._doc_terms: Dict[str, Tuple[str, np.ndarray, np.ndarray]] = {}  # ID → (본문, 용어 ID, tf)
+
+        self.search_us = RollingHistogram()  # 검색 1회 소요 시간 (마이크로초)
+        self.builds = 0
+        self.tokenized_documents = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._postings is not None
+
+    def sync(self, collection: Any) -> bool:
+        """
+        컬렉션과 동기화 (블로킹, Chroma 호출 포함)
+
+        Returns:
+            bool: 재색인 여부
+        """
+        signature = collection_signature(collection)
+        if signature == self.signature:
+            return False
+
+        current = collection.get(include=["documents", "metadatas"])
+        self.build(
+            current["ids"],
+            [document or "" for document in current["documents"]],
+            [metadata or {} for metadata in current["metadatas"]],
+        )
+        self.signature = signature
+        return True
+
+    def _term_arrays(self, document: str) -> Tuple[np.ndarray, np.ndarray]:
+        """문서 토큰화 → (용어 ID int32, tf float32), 처음 보는 용어는 어휘에 추가"""
+        counts = Counter(tokenize(document))
+        vocabulary = self._vocabulary
+        term_ids = np.fromiter(
+            (vocabulary.setdefault(term, len(vocabulary)) for term in counts), dtype=np.int32, count=len(counts)
+        )
+        tfs = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        return term_ids, tfs
+
+    def build(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """
+        역색인 생성 (완성 후 한 번에 교체하므로 검색 중 호출해도 안전)
+
+        이전 build()와 ID/본문이 같은 문서는 토큰화 결과를 재사용합니다.
+        """
+        started = time.perf_counter()
+
+        doc_terms: Dict[str, Tuple[str, np.ndarray, np.ndarray]] = {}
+        tokenized = 0
+        for doc_id, document in zip(ids, documents):
+            entry = self._doc_terms.get(doc_id)
+            if entry is None or entry[0] != document:
+                entry = (document, *self._term_arrays(document))
+                tokenized += 1
+            doc_terms[doc_id] = entry
+        self._doc_terms = doc_terms
+
+        count = len(ids)
+        entries = [doc_terms[doc_id] for doc_id in ids]
+        term_ids = np.concatenate([entry[1] for entry in entries]) if entries else np.zeros(0, np.int32)
+        tfs = np.concatenate([entry[2] for entry in entries]) if entries else np.zeros(0, np.float32)
+        lengths = np.array([entry[2].sum() for entry in entries], dtype=np.float32)
+        sizes = np.bincount(term_ids, minlength=len(self._vocabulary)).astype(np.int64)
+
+        # 삭제/수정으로 문서가 없는 용어가 살아 있는 용어보다 많아지면 어휘를 압축
+        live = sizes > 0
+        if len(sizes) - int(live.sum()) > max(int(live.sum()), 1024):
+            remap = (np.cumsum(live) - 1).astype(np.int32)
+            self._vocabulary = {
+                term: int(remap[term_id]) for term, term_id in self._vocabulary.items() if live[term_id]
+            }
+            self._doc_terms = {
+                doc_id: (document, remap[entry_ids], entry_tfs)
+                for doc_id, (document, entry_ids, entry_tfs) in doc_terms.items()
+            }
+            term_ids = remap[term_ids]
+            sizes = sizes[live]
+
+        # 용어 ID 순으로 안정 정렬 → 용어별 포스팅이 문서 순서대로 이어짐
+        order = np.argsort(term_ids, kind="stable")
+        doc_ids = np.repeat(
+            np.arange(count, dtype=np.int32), [len(entry[1]) for entry in entries]
+        )[order]
+        tfs = tfs[order]
+        offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        # BM25 가중치 = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+        idf = np.log1p((count - sizes + 0.5) / (sizes + 0.5)).astype(np.float32)
+        average_length = float(lengths.mean()) if count else 1.0
+        norm = self.k1 * (1 - self.b + self.b * lengths[doc_ids] / max(average_length, 1e-9))
+        weights = np.repeat(idf, sizes) * tfs * (self.k1 + 1) / (tfs + norm)
+
+        self._postings = _Postings(
+            dict(self._vocabulary), offsets, doc_ids, weights.astype(np.float32), idf,
+            list(ids), list(documents), list(metadatas)
+        )
+        self.builds += 1
+        self.tokenized_documents += tokenized
+
+        logger.info(
+            f"✅ 어휘 인덱스 생성: 문서 {count}개 (토큰화 {tokenized}개), 용어 {int((sizes > 0).sum()):,}개, "
+            f"포스팅 {len(doc_ids):,}개, {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        leadership_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25 검색
+
+        Returns:
+            List[Dict]: 점수 내림차순 결과 (id, content, metadata, lexical_score, term_coverage),
+                일치 용어가 없으면 빈 리스트
+                - term_coverage: 색인에 있는 질의 용어 중 문서에 있는 용어의 idf 가중 비율 (0~1)
+                  흔한 용어("리더", "팀원")만 겹치는 문서는 낮게 나옴
+        """
+        postings = self._postings
+        if postings is None or top_k <= 0:
+            return []
+
+        started = time.perf_counter()
+        offsets = postings.offsets
+        # 어휘에 남아 있어도 문서가 없는 용어(삭제/수정된 문서에만 있던 용어)는 제외
+        # 용어 ID는 색인 이력에 따라 달라지므로 합산 순서가 같도록 용어 문자열 순으로 처리
+        term_ids = [
+            postings.vocabulary[term] for term in sorted(set(tokenize(query)))
+            if term in postings.vocabulary
+        ]
+        term_ids = [term_id for term_id in term_ids if offsets[term_id + 1] > offsets[term_id]]
+        if not term_ids:
+            return []
+
+        # 색인에 없는 질의 용어(어미/조사 조각 등)는 비율 계산에서 제외
+        count = len(postings.ids)
+        query_idf = max(float(postings.idf[term_ids].sum()), 1e-9)
+
+        slices = [slice(offsets[term_id], offsets[term_id + 1]) for term_id in term_ids]
+        matched_docs = np.concatenate([postings.doc_ids[s] for s in slices])
+        scores = np.bincount(
+            matched_docs,
+            weights=np.concatenate([postings.weights[s] for s in slices]),
+            minlength=count
+        )
+        coverage = np.bincount(
+            matched_docs,
+            weights=np.repeat(postings.idf[term_ids], [s.stop - s.start for s in slices]),
+            minlength=count
+        ) / query_idf
+
+        rows = None
+        if leadership_type:
+            rows = postings.type_rows.get(leadership_type, np.zeros(0, dtype=np.intp))
+            scores = scores[rows]
+            coverage = coverage[rows]
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        positions = candidates if rows is None else rows[candidates]
+
+        documents = [
+            {
+                "id": postings.ids[position],
+                "content": postings.documents[position],
+                "metadata": postings.metadatas[position],
+                "lexical_score": float(score),
+                "term_coverage": round(float(matched), 4),
+            }
+            for position, score, matched in zip(
+                positions.tolist(), scores[candidates].tolist(), coverage[candidates].tolist()
+            )
+        ]
+        self.search_us.observe((time.perf_counter() - started) * 1_000_000)
+        return documents
+
+    def get_stats(self) -> Dict[str, Any]:
+        """어휘 인덱스 통계"""
+        postings = self._postings
+        if postings is None:
+            return {"ready": False, "builds": self.builds}
+        return {
+            "ready": self.ready,
+            "documents": len(postings.ids),
+            "terms": int(np.count_nonzero(np.diff(postings.offsets))),
+            "postings": int(postings.doc_ids.shape[0]),
+            "index_bytes": int(postings.offsets.nbytes + postings.doc_ids.nbytes + postings.weights.nbytes),
+            "builds": self.builds,
+            "tokenized_documents": self.tokenized_documents,
+            "search_us": self.search_us.summary(),
+        }
@@ -1,27 +1,96 @@
 """
 LLM 서비스 - Gemini API 통합
 """
+import asyncio
 import logging
-from typing import AsyncGenerator, Optional, Union, List, Dict
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Optional, Set, Union, List, Dict
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 
 from app.config import settings
+from app.core.metrics import RollingHistogram
+from app.core.scheduler import LLMScheduler, Priority, Ticket
+from app.services.model_router import HEAVY_TIER, model_tiers
+from app.core.streams import with_idle_ticks
+from app.services.stream_normalizer import StreamChunkNormalizer
+from app.services.token_counter import count_tokens, token_calibrator
 
 logger = logging.getLogger(__name__)
 
+# 재시도할 오류 (429/500/503/504, 시도별 타임아웃)
+RETRYABLE_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.InternalServerError,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    asyncio.TimeoutError,
+)
+
 
 class LLMService:
     """
     Google Gemini API를 활용한 LLM 서비스
+
+    모든 generate_content_async 호출은 LLMScheduler의 허가를 받아 실행합니다
+    (동시 호출 수/분당 요청·토큰 제한, 스트리밍 채팅 > Q&A > 리포트 우선순위).
+    비-스트리밍 호출은 모델별 최근 지연의 LLM_HEDGE_PERCENTILE 분위를 넘기면 같은 요청을 하나 더 보내
+    먼저 끝난 쪽을 쓰고(hedging), 재시도 가능한 오류는 지수 백오프로 다시 시도합니다.
+    모델은 티어(heavy/fast, model_router.model_tiers())마다 한 번씩 생성하고 호출 시 tier로 고릅니다.
+    응답에 사용량(usage_metadata)이 없으면 토큰 수는 추정치이고, 그중 TOKEN_CALIBRATION_SAMPLE_RATE 비율의
+    프롬프트만 백그라운드 count_tokens 호출로 실제 토큰 수를 받아 추정치 보정(token_calibrator)에 씁니다.
     """
 
+    MAX_CALIBRATION_TASKS = 4  # 동시에 진행할 count_tokens 표본 호출 수
+
     def __init__(self):
         """
         Gemini API 클라이언트 초기화
         """
-        self.model = None
+        self.model = None  # heavy 티어 모델
+        self.models: Dict[str, Any] = {}  # 티어 → GenerativeModel
+        self.tiers = model_tiers()
         self.is_initialized = False
 
+        self.scheduler = LLMScheduler(
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+            deadlines={
+                Priority.STREAMING: settings.LLM_QUEUE_DEADLINE_STREAMING_SECONDS,
+                Priority.QA: settings.LLM_QUEUE_DEADLINE_QA_SECONDS,
+                Priority.REPORT: settings.LLM_QUEUE_DEADLINE_REPORT_SECONDS,
+            }
+        )
+
+        # 모델별 비-스트리밍 호출 지연 (허가 후 응답까지, 헤지 기준)
+        self.latency_ms: Dict[str, RollingHistogram] = {}
+        self.hedges = 0  # 헤지 요청을 보낸 횟수
+        self.hedge_wins = 0  # 헤지 요청이 먼저 끝난 횟수
+        self.retries = 0
+        self.attempt_timeouts = 0
+
+        # 티어별 호출 지연(스트리밍은 스트림 전체)/토큰/비용
+        self.tier_latency_ms: Dict[str, RollingHistogram] = {tier: RollingHistogram() for tier in self.tiers}
+        self.tier_usage: Dict[str, Dict[str, float]] = {
+            tier: {"calls": 0, "estimated_calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+            for tier in self.tiers
+        }
+
+        # 토큰 추정 보정용 count_tokens 표본 호출 (응답을 기다리게 하지 않도록 백그라운드 실행)
+        self._calibration_tasks: Set[asyncio.Future] = set()
+        self.calibration_calls = 0
+        self.calibration_failures = 0
+
+        # 스트리밍 지표 (스트림별 값의 분포)
+        self.stream_chars_per_sec = RollingHistogram()
+        self.stream_first_chunk_ms = RollingHistogram()
+        self.stream_gap_p50_ms = RollingHistogram()
+        self.stream_gap_p99_ms = RollingHistogram()
+
     async def initialize(self):
         """
         Gemini API 초기화 (lazy loading)
@@ -58,28 +127,252 @@ class LLMService:
                 },
             ]
 
-            # 모델 초기화
-            self.model = genai.GenerativeModel(
-                model_name=settings.GEMINI_MODEL,
-                generation_config={
-                    "temperature": settings.GEMINI_TEMPERATURE,
-                    "max_output_tokens": settings.GEMINI_MAX_TOKENS,
-                },
-                safety_settings=safety_settings
-            )
+            # 티어별 모델 초기화 (같은 모델명을 쓰는 티어는 인스턴스 공유)
+            by_name: Dict[str, Any] = {}
+            for tier, config in self.tiers.items():
+                if config["model"] not in by_name:
+                    by_name[config["model"]] = genai.GenerativeModel(
+                        model_name=config["model"],
+                        generation_config={
+                            "temperature": settings.GEMINI_TEMPERATURE,
+                            "max_output_tokens": config["max_tokens"],
+                        },
+                        safety_settings=safety_settings
+                    )
+                self.models[tier] = by_name[config["model"]]
+            self.model = self.models[HEAVY_TIER]
 
             self.is_initialized = True
-            logger.info("✅ Gemini API 초기화 완료")
+            logger.info(
+                "✅ Gemini API 초기화 완료 ("
+                + ", ".join(f"{tier}={config['model']}" for tier, config in self.tiers.items()) + ")"
+            )
 
         except Exception as e:
             logger.error(f"Gemini API 초기화 실패: {e}")
             raise
 
+    @staticmethod
+    def _convert_messages(messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        역할 기반 메시지 리스트 → Gemini contents 형식 변환
+
+        Gemini API는 system role을 직접 지원하지 않으므로
+        system 메시지를 첫 user 메시지에 포함합니다.
+        """
+        converted_messages = []
+        system_content = ""
+
+        for msg in messages:
+            if msg["role"] == "system":
+                system_content = msg["content"]
+            elif msg["role"] == "user":
+                # system content가 있으면 첫 user 메시지에 포함
+                if system_content:
+                    content = f"{system_content}\n\n{msg['content']}"
+                    system_content = ""  # 한 번만 포함
+                else:
+                    content = msg["content"]
+                converted_messages.append({"role": "user", "parts": [content]})
+            elif msg["role"] == "assistant":
+                converted_messages.append({"role": "model", "parts": [msg["content"]]})
+
+        return converted_messages
+
+    @asynccontextmanager
+    async def _scheduled(
+        self,
+        priority: Priority,
+        prompt_text: str,
+        max_tokens: int
+    ) -> AsyncIterator[Ticket]:
+        """
+        스케줄러 허가를 받아 호출 실행 (프롬프트 추정 + 최대 출력 토큰 예약)
+
+        호출 측이 ticket.used_tokens에 실제 사용량을 넣으면 남은 예약분이 반환됩니다.
+
+        Raises:
+            LLMOverloadedError: 대기열 마감 시간 초과 예상
+        """
+        ticket = await self.scheduler.acquire(priority, count_tokens(prompt_text) + max_tokens)
+        try:
+            yield ticket
+        finally:
+            self.scheduler.release(ticket)
+
+    def hedge_delay_ms(self, model_name: str) -> Optional[float]:
+        """헤지 요청을 보낼 지연 기준 (관측값이 LLM_HEDGE_MIN_SAMPLES개 미만이거나 비활성이면 None)"""
+        histogram = self.latency_ms.get(model_name)
+        if not settings.LLM_HEDGE_ENABLED or histogram is None or len(histogram) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return histogram.percentile(settings.LLM_HEDGE_PERCENTILE)
+
+    async def _generate(
+        self,
+        tier: str,
+        priority: Priority,
+        contents: Any,
+        prompt_text: str,
+        generation_config: Dict[str, Any]
+    ) -> str:
+        """
+        비-스트리밍 생성 (재시도 + 헤지)
+
+        전체 호출은 LLM_CALL_DEADLINE_SECONDS 안에서, 시도마다 LLM_ATTEMPT_TIMEOUT_SECONDS까지 기다리며
+        재시도 가능한 오류는 LLM_MAX_RETRIES번까지 지수 백오프(지터 포함) 후 다시 시도합니다.
+
+        Raises:
+            LLMOverloadedError: 대기열 마감 시간 초과 예상 (재시도하지 않음)
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.LLM_CALL_DEADLINE_SECONDS
+        attempt = 0
+
+        while True:
+            timeout = min(settings.LLM_ATTEMPT_TIMEOUT_SECONDS, deadline - loop.time())
+            try:
+                return await asyncio.wait_for(
+                    self._hedged_attempt(tier, priority, contents, prompt_text, generation_config),
+                    timeout
+                )
+
+            except RETRYABLE_ERRORS as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.attempt_timeouts += 1
+                attempt += 1
+                delay = settings.LLM_RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1) * random.uniform(0.5, 1.0)
+                if attempt > settings.LLM_MAX_RETRIES or loop.time() + delay >= deadline:
+                    raise
+                self.retries += 1
+                logger.warning(
+                    f"LLM 호출 재시도 {attempt}/{settings.LLM_MAX_RETRIES} ({delay:.2f}초 후): "
+                    f"{type(e).__name__} {e}"
+                )
+                await asyncio.sleep(delay)
+
+    async def _hedged_attempt(
+        self,
+        tier: str,
+        priority: Priority,
+        contents: Any,
+        prompt_text: str,
+        generation_config: Dict[str, Any]
+    ) -> str:
+        """
+        한 번의 시도 (첫 요청이 헤지 기준보다 늦으면 같은 요청을 하나 더 보내고, 진 쪽은 취소)
+
+        헤지 요청은 스케줄러가 바로 허가할 수 있을 때만 보냅니다 (과부하 시 부하를 키우지 않도록).
+        """
+        model = self.models[tier]
+        model_name = self.tiers[tier]["model"]
+        histogram = self.latency_ms.setdefault(model_name, RollingHistogram())
+        max_tokens = generation_config["max_output_tokens"]
+
+        async def call() -> str:
+            async with self._scheduled(priority, prompt_text, max_tokens) as ticket:
+                started = time.perf_counter()
+                response = await model.generate_content_async(contents, generation_config=generation_config)
+                result = response.text
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                histogram.observe(elapsed_ms)
+                usage = self._usage_stats(response, prompt_text, result)
+                ticket.used_tokens = self._used_tokens(usage)
+                self._record_tier_call(tier, usage, elapsed_ms)
+                self._sample_token_count(tier, prompt_text, usage)
+                return result
+
+        primary = asyncio.ensure_future(call())
+        tasks = [primary]
+        try:
+            hedge_delay = self.hedge_delay_ms(model_name)
+            if hedge_delay is not None:
+                await asyncio.wait(tasks, timeout=hedge_delay / 1000)
+                reserve = count_tokens(prompt_text) + max_tokens
+                if not primary.done() and self.scheduler.estimate_wait(priority, reserve) == 0:
+                    self.hedges += 1
+                    logger.info(f"LLM 헤지 요청 ({model_name}): 첫 요청이 {hedge_delay:.0f}ms 초과")
+                    tasks.append(asyncio.ensure_future(call()))
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+
+        finally:
+            # 진 요청 취소 (스케줄러 슬롯은 _scheduled()에서 반환)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    def _record_tier_call(self, tier: str, usage: Dict[str, Any], elapsed_ms: float) -> None:
+        """티어별 지연/토큰/비용 누적 (단가는 100만 토큰당 USD)"""
+        prompt_tokens = usage.get("prompt_tokens") or 0
+        completion_tokens = usage.get("completion_tokens") or 0
+        totals = self.tier_usage[tier]
+        totals["calls"] += 1
+        if usage.get("token_count_estimated"):
+            totals["estimated_calls"] += 1
+        totals["prompt_tokens"] += prompt_tokens
+        totals["completion_tokens"] += completion_tokens
+        totals["cost_usd"] += (
+            prompt_tokens * self.tiers[tier]["input_price"]
+            + completion_tokens * self.tiers[tier]["output_price"]
+        ) / 1_000_000
+        self.tier_latency_ms[tier].observe(elapsed_ms)
+
+    def _sample_token_count(self, tier: str, prompt_text: str, usage: Dict[str, Any]) -> None:
+        """
+        토큰 수가 추정치인 호출 중 일부만 골라 count_tokens로 실제 프롬프트 토큰 수 확인 (백그라운드)
+
+        응답에 usage_metadata가 없는 SDK(google-generativeai 0.3.x)에서도 token_calibrator가 표본을 받도록 합니다.
+        """
+        if not usage.get("token_count_estimated") or not prompt_text:
+            return
+        if len(self._calibration_tasks) >= self.MAX_CALIBRATION_TASKS:
+            return
+        if random.random() >= settings.TOKEN_CALIBRATION_SAMPLE_RATE:
+            return
+
+        task = asyncio.ensure_future(self._calibrate_from_count_tokens(self.models[tier], prompt_text))
+        self._calibration_tasks.add(task)
+        task.add_done_callback(self._calibration_tasks.discard)
+
+    async def _calibrate_from_count_tokens(self, model: Any, prompt_text: str) -> None:
+        """count_tokens 결과를 token_calibrator에 반영 (실패해도 응답에는 영향 없음)"""
+        self.calibration_calls += 1
+        try:
+            result = await asyncio.wait_for(
+                model.count_tokens_async(prompt_text),
+                timeout=settings.LLM_ATTEMPT_TIMEOUT_SECONDS
+            )
+            token_calibrator.observe(prompt_text, result.total_tokens)
+        except Exception as e:
+            self.calibration_failures += 1
+            logger.debug(f"토큰 수 보정용 count_tokens 호출 실패: {type(e).__name__} {e}")
+
+    @staticmethod
+    def _used_tokens(usage: Dict[str, Any]) -> Optional[int]:
+        """_usage_stats() 결과 → 총 사용 토큰 (알 수 없으면 None)"""
+        if usage.get("prompt_tokens") is None or usage.get("completion_tokens") is None:
+            return None
+        return usage["prompt_tokens"] + usage["completion_tokens"]
+
     async def generate_text(
         self,
         prompt: str,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        priority: Priority = Priority.REPORT,
+        tier: str = HEAVY_TIER
     ) -> str:
         """
         텍스트 생성 (Non-streaming)
@@ -88,9 +381,14 @@ class LLMService:
             prompt: 프롬프트
             temperature: 온도 (기본값: settings.GEMINI_TEMPERATURE)
             max_tokens: 최대 토큰 수 (기본값: settings.GEMINI_MAX_TOKENS)
+            priority: 스케줄러 우선순위 (기본: 리포트 생성)
+            tier: 모델 티어 (기본: heavy)
 
         Returns:
             생성된 텍스트
+
+        Raises:
+            LLMOverloadedError: 대기열 마감 시간 초과 예상
         """
         await self.initialize()
 
@@ -100,16 +398,12 @@ class LLMService:
             # 설정 생성
             generation_config = {
                 "temperature": temperature or settings.GEMINI_TEMPERATURE,
-                "max_output_tokens": max_tokens or settings.GEMINI_MAX_TOKENS,
+                "max_output_tokens": max_tokens or self.tiers[tier]["max_tokens"],
             }
 
-            # 텍스트 생성
-            response = await self.model.generate_content_async(
-                prompt,
-                generation_config=generation_config
-            )
+            # 텍스트 생성 (재시도 + 헤지)
+            result = await self._generate(tier, priority, prompt, prompt, generation_config)
 
-            result = response.text
             logger.info(f"텍스트 생성 완료 (길이: {len(result)} chars)")
             return result
 
@@ -121,7 +415,9 @@ class LLMService:
         self,
         messages: List[Dict[str, str]],
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        priority: Priority = Priority.QA,
+        tier: str = HEAVY_TIER
     ) -> str:
         """
         메시지 리스트 기반 텍스트 생성 (역할 기반 대화)
@@ -130,47 +426,32 @@ class LLMService:
             messages: 메시지 리스트 [{"role": "system/user/assistant", "content": "..."}]
             temperature: 온도
             max_tokens: 최대 토큰 수
+            priority: 스케줄러 우선순위 (기본: 비-스트리밍 Q&A)
+            tier: 모델 티어 (기본: heavy, model_router.route() 결과)
 
         Returns:
             생성된 텍스트
+
+        Raises:
+            LLMOverloadedError: 대기열 마감 시간 초과 예상
         """
         await self.initialize()
 
         try:
             logger.info(f"메시지 기반 텍스트 생성 요청 (메시지 수: {len(messages)})")
 
-            # Gemini API는 system role을 직접 지원하지 않으므로 변환
-            # system 메시지를 첫 user 메시지에 포함
-            converted_messages = []
-            system_content = ""
-
-            for msg in messages:
-                if msg["role"] == "system":
-                    system_content = msg["content"]
-                elif msg["role"] == "user":
-                    # system content가 있으면 첫 user 메시지에 포함
-                    if system_content:
-                        content = f"{system_content}\n\n{msg['content']}"
-                        system_content = ""  # 한 번만 포함
-                    else:
-                        content = msg["content"]
-                    converted_messages.append({"role": "user", "parts": [content]})
-                elif msg["role"] == "assistant":
-                    converted_messages.append({"role": "model", "parts": [msg["content"]]})
+            converted_messages = self._convert_messages(messages)
 
             # 설정 생성
             generation_config = {
                 "temperature": temperature or settings.GEMINI_TEMPERATURE,
-                "max_output_tokens": max_tokens or settings.GEMINI_MAX_TOKENS,
+                "max_output_tokens": max_tokens or self.tiers[tier]["max_tokens"],
             }
 
-            # 텍스트 생성
-            response = await self.model.generate_content_async(
-                converted_messages,
-                generation_config=generation_config
-            )
+            # 텍스트 생성 (재시도 + 헤지)
+            prompt_text = "\n".join(msg["content"] for msg in messages)
+            result = await self._generate(tier, priority, converted_messages, prompt_text, generation_config)
 
-            result = response.text
             logger.info(f"메시지 기반 텍스트 생성 완료 (길이: {len(result)} chars)")
             return result
 
@@ -180,85 +461,199 @@ class LLMService:
 
     async def generate_text_streaming(
         self,
-        prompt: Union[str, dict],
+        prompt: Union[str, dict, List[Dict[str, str]]],
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        stats: Optional[Dict[str, Any]] = None,
+        priority: Priority = Priority.STREAMING,
+        tier: str = HEAVY_TIER
     ) -> AsyncGenerator[str, None]:
         """
         스트리밍 텍스트 생성
 
         Args:
-            prompt: 프롬프트 (문자열 또는 딕셔너리)
+            prompt: 프롬프트 (문자열, 딕셔너리 또는 역할 기반 메시지 리스트)
             temperature: 온도 (기본값: settings.GEMINI_TEMPERATURE)
             max_tokens: 최대 토큰 수 (기본값: settings.GEMINI_MAX_TOKENS)
+            stats: 전달 시 스트림 종료 후 토큰 사용량을 채워 넣음
+                (prompt_tokens, completion_tokens, token_count_estimated)
+            priority: 스케줄러 우선순위 (기본: 스트리밍 채팅, 스트림이 끝날 때까지 슬롯 점유)
+            tier: 모델 티어 (기본: heavy, model_router.route() 결과)
 
         Yields:
             텍스트 청크 (델타)
+
+        Raises:
+            LLMOverloadedError: 대기열 마감 시간 초과 예상
         """
         await self.initialize()
 
         try:
             # 프롬프트 타입 확인
-            if isinstance(prompt, dict):
+            if isinstance(prompt, list):
+                # 메시지 리스트인 경우: 역할 기반 대화
+                full_prompt = self._convert_messages(prompt)
+                prompt_text = "\n".join(msg["content"] for msg in prompt)
+                logger.info(f"스트리밍 텍스트 생성 요청 (메시지 수: {len(prompt)})")
+            elif isinstance(prompt, dict):
                 # 딕셔너리인 경우: 구조화된 프롬프트
                 full_prompt = prompt.get("text", "") or prompt.get("content", "")
+                prompt_text = str(full_prompt)
                 logger.info(f"스트리밍 텍스트 생성 요청 (딕셔너리, 길이: {len(str(full_prompt))} chars)")
             else:
                 # 문자열인 경우
                 full_prompt = prompt
+                prompt_text = prompt
                 logger.info(f"스트리밍 텍스트 생성 요청 (문자열, 길이: {len(full_prompt)} chars)")
 
             # 설정 생성
             generation_config = genai.types.GenerationConfig(
                 temperature=temperature or settings.GEMINI_TEMPERATURE,
-                max_output_tokens=max_tokens or settings.GEMINI_MAX_TOKENS,
+                max_output_tokens=max_tokens or self.tiers[tier]["max_tokens"],
             )
 
-            # 스트리밍 응답 생성
-            response = await self.model.generate_content_async(
-                full_prompt,
-                stream=True,
-                generation_config=generation_config
-            )
+            async with self._scheduled(priority, prompt_text, generation_config.max_output_tokens) as ticket:
+                # 스트리밍 응답 생성
+                started = time.perf_counter()
+                response = await self.models[tier].generate_content_async(
+                    full_prompt,
+                    stream=True,
+                    generation_config=generation_config
+                )
+
+                # 델타 추출 + 작은 청크 묶음 전송 (STREAMING_CHUNK_SIZE 토큰 / STREAMING_FLUSH_INTERVAL_MS)
+                normalizer = StreamChunkNormalizer(
+                    flush_tokens=settings.STREAMING_CHUNK_SIZE,
+                    flush_interval=settings.STREAMING_FLUSH_INTERVAL_MS / 1000,
+                    cumulative=settings.STREAMING_CUMULATIVE_CHUNKS
+                )
+                raw_chunks = self._iter_chunk_texts(response)
+                if normalizer.flush_interval > 0:
+                    # 다음 청크가 늦어져도 묶어둔 텍스트가 flush 간격 이상 지연되지 않도록 유휴 틱 사용
+                    raw_chunks = with_idle_ticks(raw_chunks, normalizer.flush_interval)
+
+                async for raw in raw_chunks:
+                    out = normalizer.flush() if raw is None else normalizer.feed(raw)
+                    if out:
+                        yield out
+
+                tail = normalizer.flush()
+                if tail:
+                    yield tail
+
+                metrics = normalizer.get_metrics()
+                self._record_stream_metrics(metrics)
+                logger.info(f"스트리밍 텍스트 생성 완료: {metrics}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Gemini 전체 응답: {normalizer.text!r}")
+
+                usage = self._usage_stats(response, prompt_text, normalizer.text)
+                ticket.used_tokens = self._used_tokens(usage)
+                self._record_tier_call(tier, usage, (time.perf_counter() - started) * 1000)
+                self._sample_token_count(tier, prompt_text, usage)
+                if stats is not None:
+                    stats.update(usage)
+                    stats["stream"] = metrics
 
-            # 델타 추출을 위한 변수
-            total_length = 0
-            chunk_count = 0
-            full_response = ""
+        except Exception as e:
+            logger.error(f"스트리밍 텍스트 생성 실패: {e}", exc_info=True)
+            raise
 
-            # 청크 단위로 전송
-            async for chunk in response:
+    @staticmethod
+    async def _iter_chunk_texts(response: Any) -> AsyncGenerator[str, None]:
+        """SDK 스트림 응답에서 청크별 텍스트만 추출"""
+        async for chunk in response:
+            try:
+                # 1. 텍스트 속성 확인
+                text = chunk.text
+            except Exception:
+                # 2. parts 속성 확인 (백업)
                 try:
-                    # 1. 텍스트 속성 확인
-                    if hasattr(chunk, 'text') and chunk.text:
-                        # Gemini는 누적 텍스트를 반환하므로 델타만 추출
-                        current_text = chunk.text
-                        full_response = current_text  # 전체 텍스트 저장
-
-                        if len(current_text) > total_length:
-                            delta = current_text[total_length:]
-                            total_length = len(current_text)
-                            chunk_count += 1
-                            logger.debug(f"청크 {chunk_count}: delta={repr(delta[:50])}... (길이: {len(delta)})")
-                            yield delta
-
-                    # 2. parts 속성 확인 (백업)
-                    elif hasattr(chunk, 'parts'):
-                        for part in chunk.parts:
-                            if hasattr(part, 'text') and part.text:
-                                yield part.text
-                                chunk_count += 1
-
+                    text = "".join(
+                        part.text for part in getattr(chunk, "parts", [])
+                        if getattr(part, "text", None)
+                    )
                 except Exception as e:
                     logger.warning(f"청크 처리 중 오류 (무시): {e}")
                     continue
 
-            logger.info(f"스트리밍 텍스트 생성 완료 (청크: {chunk_count}, 총 길이: {total_length})")
-            logger.info(f"Gemini 전체 응답: {repr(full_response)}")
+            if text:
+                yield text
+
+    def _record_stream_metrics(self, metrics: Dict[str, Any]) -> None:
+        """스트림별 지표를 누적 히스토그램에 반영"""
+        if metrics.get("chars_per_sec") is not None:
+            self.stream_chars_per_sec.observe(metrics["chars_per_sec"])
+        if metrics.get("time_to_first_chunk_ms") is not None:
+            self.stream_first_chunk_ms.observe(metrics["time_to_first_chunk_ms"])
+        if metrics.get("gap_p50_ms") is not None:
+            self.stream_gap_p50_ms.observe(metrics["gap_p50_ms"])
+            self.stream_gap_p99_ms.observe(metrics["gap_p99_ms"])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """LLM 호출 지표"""
+        return {
+            "scheduler": self.scheduler.get_stats(),
+            "calls": {
+                "latency_ms": {model: histogram.summary() for model, histogram in self.latency_ms.items()},
+                "hedge_delay_ms": {model: self.hedge_delay_ms(model) for model in self.latency_ms},
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "retries": self.retries,
+                "attempt_timeouts": self.attempt_timeouts,
+            },
+            "tiers": {
+                tier: {
+                    "model": config["model"],
+                    "latency_ms": self.tier_latency_ms[tier].summary(),
+                    "calls": int(self.tier_usage[tier]["calls"]),
+                    # 토큰/비용이 실제 사용량이 아닌 추정치로 집계된 호출 수
+                    "estimated_calls": int(self.tier_usage[tier]["estimated_calls"]),
+                    "prompt_tokens": int(self.tier_usage[tier]["prompt_tokens"]),
+                    "completion_tokens": int(self.tier_usage[tier]["completion_tokens"]),
+                    "cost_usd": round(self.tier_usage[tier]["cost_usd"], 6),
+                    "cost_per_call_usd": (
+                        round(self.tier_usage[tier]["cost_usd"] / self.tier_usage[tier]["calls"], 6)
+                        if self.tier_usage[tier]["calls"] else 0.0
+                    ),
+                }
+                for tier, config in self.tiers.items()
+            },
+            "streaming": {
+                "chars_per_sec": self.stream_chars_per_sec.summary(),
+                "time_to_first_chunk_ms": self.stream_first_chunk_ms.summary(),
+                "gap_p50_ms": self.stream_gap_p50_ms.summary(),
+                "gap_p99_ms": self.stream_gap_p99_ms.summary(),
+            },
+            "token_calibration": {
+                **token_calibrator.get_stats(),
+                "count_tokens_calls": self.calibration_calls,
+                "count_tokens_failures": self.calibration_failures,
+            },
+        }
+
+    @staticmethod
+    def _usage_stats(response: Any, prompt_text: str, completion_text: str) -> Dict[str, Any]:
+        """
+        토큰 사용량 조회 (SDK가 usage_metadata를 제공하지 않으면 보정된 추정치)
+        """
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            prompt_tokens = getattr(usage, "prompt_token_count", None)
+            # 실제 프롬프트 토큰 수로 로컬 추정치 보정
+            if prompt_tokens:
+                token_calibrator.observe(prompt_text, prompt_tokens)
+            return {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": getattr(usage, "candidates_token_count", None),
+                "token_count_estimated": False,
+            }
 
-        except Exception as e:
-            logger.error(f"스트리밍 텍스트 생성 실패: {e}", exc_info=True)
-            raise
+        return {
+            "prompt_tokens": count_tokens(prompt_text),
+            "completion_tokens": count_tokens(completion_text),
+            "token_count_estimated": True,
+        }
 
 
 # 싱글톤 인스턴스
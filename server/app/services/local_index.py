@@ -0,0 +1,345 @@
+"""
+로컬 벡터 인덱스
+Chroma 컬렉션의 임베딩/문서/메타데이터를 프로세스 안의 float32 행렬로 복제해
+HTTP 왕복 없이 내적 연산으로 유사 문서를 검색
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from app.core.metrics import RollingHistogram
+
+logger = logging.getLogger(__name__)
+
+# (컬렉션 ID, 버전, 문서 수): 하나라도 바뀌면 동기화
+Signature = Tuple[str, int, int]
+
+# 컬렉션 메타데이터의 버전 키 (문서 추가 시 증가)
+VERSION_KEY = "version"
+
+# 거리 함수 보관 키 (modify()로 메타데이터를 바꾸면 hnsw:* 키가 빠지므로 따로 보관)
+SPACE_KEY = "space"
+
+
+def collection_signature(collection: Any) -> Signature:
+    """컬렉션 변경 감지용 시그니처 (블로킹, 메타데이터는 최신 get_collection() 결과여야 함)"""
+    metadata = collection.metadata or {}
+    return (str(collection.id), int(metadata.get(VERSION_KEY, 0)), collection.count())
+
+
+def collection_space(collection: Any) -> str:
+    """컬렉션 거리 함수 (hnsw:space, 없으면 보관 키, 둘 다 없으면 Chroma 기본값 l2)"""
+    metadata = collection.metadata or {}
+    return metadata.get("hnsw:space") or metadata.get(SPACE_KEY) or "l2"
+
+
+class _Snapshot:
+    """검색에 쓰는 불변 스냅샷 (교체는 참조 대입 한 번으로 원자적)"""
+
+    __slots__ = (
+        "signature", "space", "matrix", "norms", "ids", "documents", "metadatas", "type_rows"
+    )
+
+    def __init__(
+        self,
+        signature: Signature,
+        space: str,
+        matrix: np.ndarray,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ):
+        self.signature = signature
+        self.space = space
+        self.matrix = matrix
+        self.norms = np.linalg.norm(matrix, axis=1).astype(np.float32) if len(ids) else np.zeros(0, np.float32)
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+
+        # 리더십 유형별 행 인덱스 (Chroma where={"leadership_type": ...}와 같은 정확 일치)
+        types = np.array([(metadata or {}).get("leadership_type") or "" for metadata in metadatas], dtype=object)
+        self.type_rows: Dict[str, np.ndarray] = {
+            str(name): np.flatnonzero(types == name) for name in set(types.tolist()) if name
+        }
+
+    @property
+    def dimension(self) -> int:
+        return self.matrix.shape[1] if self.matrix.ndim == 2 else 0
+
+    def distances(self, query: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """컬렉션 거리 함수(hnsw:space)와 같은 거리 (낮을수록 유사)"""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        norms = self.norms if rows is None else self.norms[rows]
+        dots = matrix @ query
+
+        if self.space == "cosine":
+            denominator = norms * float(np.linalg.norm(query))
+            return 1.0 - np.divide(dots, denominator, out=np.zeros_like(dots), where=denominator > 0)
+        if self.space == "ip":
+            return 1.0 - dots
+        # l2 (Chroma 기본값): 제곱 유클리드 거리
+        return np.maximum(norms * norms + float(query @ query) - 2.0 * dots, 0.0)
+
+
+class LocalVectorIndex:
+    """
+    로컬 벡터 인덱스
+
+    - 스냅샷은 저장마다 새 이름의 {path}/{컬렉션}-{id}.npy(임베딩) + .json(ID/문서/메타데이터/시그니처)으로
+      쓰고 {컬렉션}.current 포인터 파일 하나만 교체하므로, 다른 워커가 행렬과 사이드카를 섞어 읽지 않음
+    - np.load(mmap_mode="r")로 열어 같은 호스트의 워커들이 페이지를 공유
+    - sync()는 시그니처가 바뀌었을 때만 동작하며, 새로 생겼거나 문서/메타데이터가 바뀐 항목의
+      임베딩만 Chroma에서 가져오고 나머지 행은 기존 스냅샷에서 복사
+    - search()는 행렬-벡터 곱 한 번 + argpartition (유형 필터는 미리 계산한 행 인덱스 사용)
+    """
+
+    def __init__(self, path: str, collection_name: str):
+        self.directory = Path(path)
+        self.collection_name = collection_name
+        self._snapshot: Optional[_Snapshot] = None
+
+        self.search_us = RollingHistogram()  # 검색 1회 소요 시간 (마이크로초)
+        self.syncs = 0
+        self.fetched_embeddings = 0
+
+    @property
+    def _pointer_path(self) -> Path:
+        """현재 스냅샷 이름을 담은 포인터 파일"""
+        return self.directory / f"{self.collection_name}.current"
+
+    def _snapshot_paths(self, name: str) -> Tuple[Path, Path]:
+        """스냅샷 이름 → (임베딩 .npy, 사이드카 .json) 경로"""
+        return self.directory / f"{name}.npy", self.directory / f"{name}.json"
+
+    def _current_name(self) -> Optional[str]:
+        try:
+            return self._pointer_path.read_text(encoding="utf-8").strip() or None
+        except FileNotFoundError:
+            return None
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def space(self) -> Optional[str]:
+        """스냅샷 거리 함수 (hnsw:space)"""
+        return self._snapshot.space if self._snapshot is not None else None
+
+    @property
+    def signature(self) -> Optional[Signature]:
+        return self._snapshot.signature if self._snapshot is not None else None
+
+    def load(self) -> bool:
+        """
+        디스크 스냅샷을 메모리 맵으로 열기 (블로킹)
+
+        Returns:
+            bool: 스냅샷 로드 여부 (파일이 없거나 손상되면 False)
+        """
+        try:
+            name = self._current_name()
+            if name is None:
+                return False
+            matrix_path, sidecar_path = self._snapshot_paths(name)
+            with open(sidecar_path, encoding="utf-8") as f:
+                sidecar = json.load(f)
+            matrix = np.load(matrix_path, mmap_mode="r")
+            if matrix.shape[0] != len(sidecar["ids"]):
+                raise ValueError(f"행 수 불일치 (행렬 {matrix.shape[0]}, ID {len(sidecar['ids'])})")
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"로컬 인덱스 스냅샷 로드 실패: {e}")
+            return False
+
+        self._snapshot = _Snapshot(
+            tuple(sidecar["signature"]),
+            sidecar.get("space", "l2"),
+            matrix,
+            sidecar["ids"],
+            sidecar["documents"],
+            sidecar["metadatas"],
+        )
+        logger.info(f"로컬 인덱스 로드: {len(sidecar['ids'])}개 문서, 시그니처 {self.signature}")
+        return True
+
+    def sync(self, collection: Any) -> bool:
+        """
+        컬렉션과 동기화 (블로킹, Chroma 호출 포함)
+
+        다른 워커가 같은 시그니처의 스냅샷을 이미 저장했다면 그 파일을 엽니다.
+
+        Returns:
+            bool: 스냅샷 교체 여부
+        """
+        signature = collection_signature(collection)
+        if signature == self.signature:
+            return False
+        if self.load() and signature == self.signature:
+            return True
+
+        started = time.perf_counter()
+        current = collection.get(include=["documents", "metadatas"])
+        ids: List[str] = current["ids"]
+        documents = [document or "" for document in current["documents"]]
+        metadatas = [metadata or {} for metadata in current["metadatas"]]
+
+        # 기존 스냅샷에서 재사용할 행 찾기
+        previous = self._snapshot
+        previous_rows: Dict[str, int] = {}
+        if previous is not None:
+            previous_rows = {doc_id: row for row, doc_id in enumerate(previous.ids)}
+
+        kept_positions, kept_rows, changed = [], [], []
+        for position, doc_id in enumerate(ids):
+            row = previous_rows.get(doc_id)
+            if (
+                row is not None
+                and previous.documents[row] == documents[position]
+                and previous.metadatas[row] == metadatas[position]
+            ):
+                kept_positions.append(position)
+                kept_rows.append(row)
+            else:
+                changed.append(position)
+
+        fetched: Dict[str, List[float]] = {}
+        if changed:
+            result = collection.get(ids=[ids[position] for position in changed], include=["embeddings"])
+            fetched = dict(zip(result["ids"], result["embeddings"]))
+            self.fetched_embeddings += len(fetched)
+
+        dimension = len(next(iter(fetched.values()))) if fetched else (previous.dimension if previous else 0)
+        matrix = np.zeros((len(ids), dimension), dtype=np.float32)
+        if kept_positions:
+            matrix[kept_positions] = previous.matrix[kept_rows]
+        for position in changed:
+            matrix[position] = fetched[ids[position]]
+
+        space = collection_space(collection)
+        self._save(signature, space, matrix, ids, documents, metadatas)
+        if not self.load():
+            # 디스크에 쓸 수 없으면 메모리 스냅샷으로라도 제공
+            self._snapshot = _Snapshot(signature, space, matrix, ids, documents, metadatas)
+
+        self.syncs += 1
+        logger.info(
+            f"✅ 로컬 인덱스 동기화: {len(ids)}개 문서 (재사용 {len(kept_positions)}, "
+            f"임베딩 조회 {len(changed)}), {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return True
+
+    def _save(
+        self,
+        signature: Signature,
+        space: str,
+        matrix: np.ndarray,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> None:
+        """
+        스냅샷 저장 (새 이름으로 쓴 뒤 포인터 파일만 os.replace로 교체)
+
+        읽는 워커는 기존 매핑을 유지하며, 직전 스냅샷은 포인터를 먼저 읽은 워커를 위해 남기고
+        그 이전 스냅샷 파일만 지웁니다.
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            sidecar = {
+                "signature": list(signature),
+                "space": space,
+                "ids": ids,
+                "documents": documents,
+                "metadatas": metadatas,
+            }
+            name = f"{self.collection_name}-{uuid.uuid4().hex[:12]}"
+            matrix_path, sidecar_path = self._snapshot_paths(name)
+            with open(matrix_path, "wb") as f:
+                np.save(f, matrix)
+            with open(sidecar_path, "w", encoding="utf-8") as f:
+                json.dump(sidecar, f, ensure_ascii=False)
+
+            previous = self._current_name()
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(name)
+            os.replace(temp_path, self._pointer_path)
+
+            keep = {name, previous}
+            for path in self.directory.glob(f"{self.collection_name}-*"):
+                if path.suffix in (".npy", ".json") and path.stem not in keep:
+                    path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"로컬 인덱스 스냅샷 저장 실패: {e}")
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        leadership_type: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        유사 문서 검색 (search_similar_documents()와 같은 결과 형식)
+
+        Returns:
+            List[Dict] | None: 거리 오름차순 결과 (스냅샷이 없거나 차원이 다르면 None)
+        """
+        snapshot = self._snapshot
+        if snapshot is None or top_k <= 0:
+            return None
+
+        started = time.perf_counter()
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if snapshot.ids and query.shape[0] != snapshot.dimension:
+            logger.warning(f"로컬 인덱스 차원 불일치 (인덱스 {snapshot.dimension}, 질의 {query.shape[0]})")
+            return None
+
+        rows: Optional[np.ndarray] = None
+        if leadership_type:
+            rows = snapshot.type_rows.get(leadership_type, np.zeros(0, dtype=np.intp))
+        count = len(snapshot.ids) if rows is None else len(rows)
+        if count == 0:
+            return []
+
+        distances = snapshot.distances(query, rows)
+        k = min(top_k, count)
+        best = np.argpartition(distances, k - 1)[:k] if k < count else np.arange(count)
+        best = best[np.argsort(distances[best], kind="stable")]
+        positions = best if rows is None else rows[best]
+
+        documents = [
+            {
+                "id": snapshot.ids[position],
+                "content": snapshot.documents[position],
+                "metadata": snapshot.metadatas[position],
+                "distance": float(distance),
+            }
+            for position, distance in zip(positions.tolist(), distances[best].tolist())
+        ]
+        self.search_us.observe((time.perf_counter() - started) * 1_000_000)
+        return documents
+
+    def get_stats(self) -> Dict[str, Any]:
+        """로컬 인덱스 통계"""
+        snapshot = self._snapshot
+        return {
+            "ready": snapshot is not None,
+            "documents": len(snapshot.ids) if snapshot is not None else 0,
+            "dimension": snapshot.dimension if snapshot is not None else 0,
+            "space": snapshot.space if snapshot is not None else None,
+            "memory_mapped": isinstance(snapshot.matrix, np.memmap) if snapshot is not None else False,
+            "signature": list(snapshot.signature) if snapshot is not None else None,
+            "syncs": self.syncs,
+            "fetched_embeddings": self.fetched_embeddings,
+            "search_us": self.search_us.summary(),
+        }
@@ -3,14 +3,58 @@
 리더십 유형 분류 모델 로드 및 추론
 """
 import joblib
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
 from pathlib import Path
 
+import numpy as np
+
 from app.config import settings
+from app.core.batching import MicroBatcher
+from app.core.metrics import RollingHistogram
+from app.services.leadership_classifier import LEADERSHIP_TYPE_NAMES, SCORE_DIMENSIONS
 
 logger = logging.getLogger(__name__)
 
+# 모델 입력 특성 스키마 (assessment_data["scores"]의 키, 벡터 순서 고정)
+FEATURE_SCHEMA = SCORE_DIMENSIONS
+
+
+def build_feature_vector(assessment_data: Dict[str, Any]) -> List[float]:
+    """
+    진단 데이터 → 모델 입력 벡터 (FEATURE_SCHEMA 순서)
+
+    Args:
+        assessment_data: {"scores": {"공유및참여": 3.5, "상호작용": 3.8, "성장지향": 4.8}}
+
+    Returns:
+        list: float 특성 벡터
+
+    Raises:
+        ValueError: scores가 없거나 특성이 누락/숫자가 아니거나 유한하지 않은(NaN, inf) 경우
+    """
+    scores = assessment_data.get("scores") if isinstance(assessment_data, dict) else None
+    if not isinstance(scores, dict):
+        raise ValueError("assessment_data에 scores가 없습니다.")
+
+    missing = [name for name in FEATURE_SCHEMA if scores.get(name) is None]
+    if missing:
+        raise ValueError(f"필수 특성 누락: {missing}")
+
+    try:
+        vector = [float(scores[name]) for name in FEATURE_SCHEMA]
+    except (TypeError, ValueError):
+        raise ValueError(f"숫자가 아닌 특성 값: {scores}")
+
+    # NaN/inf가 하나라도 섞이면 predict_proba가 배치 전체를 실패시키므로 요청 단위로 거부
+    if not all(math.isfinite(value) for value in vector):
+        raise ValueError(f"유한하지 않은 특성 값: {scores}")
+    return vector
+
 
 class MLModelService:
     """ML 모델 서비스 (싱글톤)"""
@@ -18,6 +62,21 @@ class MLModelService:
     def __init__(self):
         self.model: Optional[Any] = None
         self.model_loaded: bool = False
+        self.class_names: List[str] = []
+
+        # predict_proba는 CPU 작업이므로 전용 스레드 풀에서 실행 (이벤트 루프 블로킹 방지)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.ML_INFERENCE_WORKERS),
+            thread_name_prefix="ml-inference"
+        )
+        self._batcher: MicroBatcher[List[float], Dict[str, float]] = MicroBatcher(
+            self._predict_batch,
+            max_batch_size=settings.ML_BATCH_MAX_SIZE,
+            max_wait_ms=settings.ML_BATCH_MAX_WAIT_MS,
+            name="ml-inference"
+        )
+        self.inference_ms = RollingHistogram()  # 배치당 predict_proba 시간
+        self.request_ms = RollingHistogram()  # 요청당 대기 + 추론 시간
 
     async def load_model(self) -> None:
         """
@@ -44,9 +103,18 @@ class MLModelService:
 
         try:
             logger.info(f"ML 모델 로드 중: {model_path}")
-            self.model = joblib.load(model_path)
+            model = await asyncio.to_thread(joblib.load, model_path)
+
+            n_features = getattr(model, "n_features_in_", len(FEATURE_SCHEMA))
+            if n_features != len(FEATURE_SCHEMA):
+                raise ValueError(
+                    f"모델 입력 특성 수({n_features})가 스키마({len(FEATURE_SCHEMA)})와 다릅니다."
+                )
+
+            self.model = model
+            self.class_names = [self._class_name(label) for label in model.classes_]
             self.model_loaded = True
-            logger.info("✅ ML 모델 로드 완료")
+            logger.info(f"✅ ML 모델 로드 완료 (클래스 {len(self.class_names)}개)")
 
         except Exception as e:
             logger.error(f"ML 모델 로드 실패: {e}", exc_info=True)
@@ -82,33 +150,62 @@ class MLModelService:
             }
 
         try:
-            # TODO: 실제 모델 입력 형식에 맞게 수정 필요
-            # 예시: features를 배열로 변환
-            # feature_vector = [features.get("extraversion", 0), ...]
-            # prediction = self.model.predict([feature_vector])[0]
-            # probabilities = self.model.predict_proba([feature_vector])[0]
-
-            logger.info(f"리더십 유형 예측 요청: {features}")
-
-            # 임시 구현 (실제 모델 인터페이스에 맞게 수정 필요)
-            prediction = "개별비전형"  # 예시
-            confidence = 0.85  # 예시
+            feature_vector = build_feature_vector(features)
+        except ValueError as e:
+            raise ValueError(f"Failed to predict leadership type: {e}")
 
-            return {
-                "predicted_type": prediction,
-                "confidence": confidence,
-                "probabilities": {
-                    "개별비전형": 0.85,
-                    "참여코칭형": 0.10,
-                    "개별코칭형": 0.05
-                },
-                "is_mock": False
-            }
+        started = time.perf_counter()
+        try:
+            probabilities = await self._batcher.submit(feature_vector)
 
         except Exception as e:
             logger.error(f"예측 중 오류 발생: {e}", exc_info=True)
             raise ValueError(f"Failed to predict leadership type: {e}")
 
+        finally:
+            self.request_ms.observe((time.perf_counter() - started) * 1000)
+
+        prediction = max(probabilities, key=probabilities.get)
+        return {
+            "predicted_type": prediction,
+            "confidence": probabilities[prediction],
+            "probabilities": probabilities,
+            "is_mock": False
+        }
+
+    async def _predict_batch(self, vectors: List[List[float]]) -> List[Dict[str, float]]:
+        """배치 추론 (MicroBatcher 핸들러)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._predict_proba_sync, vectors)
+
+    def _predict_proba_sync(self, vectors: List[List[float]]) -> List[Dict[str, float]]:
+        """스레드 풀에서 실행되는 predict_proba (배치당 1회)"""
+        started = time.perf_counter()
+        matrix = np.asarray(vectors, dtype=np.float64)
+        proba = self.model.predict_proba(matrix)
+        self.inference_ms.observe((time.perf_counter() - started) * 1000)
+
+        return [
+            {name: round(float(p), 4) for name, p in zip(self.class_names, row)}
+            for row in proba.tolist()
+        ]
+
+    @staticmethod
+    def _class_name(label: Any) -> str:
+        """모델 클래스 레이블 → 리더십 유형 이름 (정수 레이블은 유형 ID로 해석)"""
+        if isinstance(label, (int, np.integer)) and 0 <= int(label) < len(LEADERSHIP_TYPE_NAMES):
+            return LEADERSHIP_TYPE_NAMES[int(label)]
+        return str(label)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """추론 통계 (배치 크기, 큐 대기, 추론/요청 지연 히스토그램)"""
+        return {
+            "model_loaded": self.model_loaded,
+            "batcher": self._batcher.get_stats(),
+            "inference_ms": self.inference_ms.summary(),
+            "request_ms": self.request_ms.summary(),
+        }
+
     async def validate_leadership_type(
         self,
         leadership_type: str,
@@ -125,17 +222,12 @@ class MLModelService:
             bool: 유효 여부
         """
         # 간단한 검증: 알려진 유형인지 확인
-        known_types = [
-            "참여코칭형", "참여실무형", "참여비전형", "참여친밀형",
-            "개별코칭형", "개별비전형", "개별친밀형", "과도기형"
-        ]
-
-        if leadership_type not in known_types:
+        if leadership_type not in LEADERSHIP_TYPE_NAMES:
             logger.warning(f"알 수 없는 리더십 유형: {leadership_type}")
             return False
 
         # 모델이 로드된 경우, 추가 검증 가능
-        if self.model_loaded and features:
+        if self.model_loaded and features and isinstance(features.get("scores"), dict):
             try:
                 prediction = await self.predict_leadership_type(features)
                 predicted_type = prediction.get("predicted_type")
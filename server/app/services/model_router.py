@@ -0,0 +1,95 @@
+"""
+모델 라우팅
+응답 전략/질문 특성에 따라 Gemini 모델 티어(fast/heavy)와 출력 토큰 예산 결정
+"""
+from typing import Any, Dict, Optional
+import logging
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+FAST_TIER = "fast"
+HEAVY_TIER = "heavy"
+
+# 전략 키 → 티어 (없는 전략은 heavy)
+# 짧은 안내/환영/되묻기는 두어 문장이면 충분하므로 flash급 모델로 처리
+STRATEGY_TIERS = {
+    "warm_welcome": FAST_TIER,
+    "service_info": FAST_TIER,
+    "clarify_question": FAST_TIER,
+    "gentle_redirect": FAST_TIER,
+}
+
+# fast 전략이어도 이 특성이 있으면 heavy로 올림 (conversation_analyzer의 traits)
+# "구체적요청"은 "~요"로 끝나는 대부분의 질문에 붙으므로 기준으로 쓰지 않음
+ESCALATING_TRAITS = {"복잡한상황"}
+
+
+def model_tiers() -> Dict[str, Dict[str, Any]]:
+    """
+    티어별 모델 설정 (모델명, 기본 출력 토큰 예산, 100만 토큰당 입력/출력 단가)
+    """
+    return {
+        HEAVY_TIER: {
+            "model": settings.GEMINI_MODEL,
+            "max_tokens": settings.GEMINI_MAX_TOKENS,
+            "input_price": settings.GEMINI_INPUT_PRICE_PER_MTOK,
+            "output_price": settings.GEMINI_OUTPUT_PRICE_PER_MTOK,
+        },
+        FAST_TIER: {
+            "model": settings.GEMINI_FAST_MODEL or settings.GEMINI_MODEL,
+            "max_tokens": settings.GEMINI_FAST_MAX_TOKENS,
+            "input_price": settings.GEMINI_FAST_INPUT_PRICE_PER_MTOK,
+            "output_price": settings.GEMINI_FAST_OUTPUT_PRICE_PER_MTOK,
+        },
+    }
+
+
+class ModelRouter:
+    """
+    모델 라우터 (싱글톤)
+
+    - STRATEGY_TIERS로 전략별 티어를 고르고, ESCALATING_TRAITS가 있거나 질문이 길면 heavy로 올림
+    - 분석 실패(전략 없음)나 MODEL_ROUTING_ENABLED=False면 항상 heavy
+    """
+
+    def __init__(self):
+        self.routed: Dict[str, int] = {FAST_TIER: 0, HEAVY_TIER: 0}
+        self.escalated = 0  # fast 전략이었지만 heavy로 올린 횟수
+
+    def route(self, strategy_key: Optional[str], analysis: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Q&A 턴의 모델 티어 결정
+
+        Returns:
+            dict: {"tier", "model", "max_tokens"}
+        """
+        tier = HEAVY_TIER
+        if settings.MODEL_ROUTING_ENABLED and strategy_key:
+            tier = STRATEGY_TIERS.get(strategy_key, HEAVY_TIER)
+
+        if tier == FAST_TIER and analysis:
+            traits = set(analysis.get("traits") or [])
+            too_long = analysis.get("question_length", 0) > settings.MODEL_ROUTING_MAX_FAST_QUESTION_CHARS
+            if traits & ESCALATING_TRAITS or too_long:
+                tier = HEAVY_TIER
+                self.escalated += 1
+
+        self.routed[tier] += 1
+        config = model_tiers()[tier]
+        return {"tier": tier, "model": config["model"], "max_tokens": config["max_tokens"]}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """티어별 라우팅 횟수"""
+        total = sum(self.routed.values())
+        return {
+            "enabled": settings.MODEL_ROUTING_ENABLED,
+            "routed": dict(self.routed),
+            "escalated": self.escalated,
+            "fast_ratio": round(self.routed[FAST_TIER] / total, 4) if total else 0.0,
+        }
+
+
+# 싱글톤 인스턴스
+model_router = ModelRouter()
@@ -3,6 +3,9 @@ AI 코칭 프롬프트 템플릿
 """
 from typing import Dict, Any, Optional, List
 
+from app.config import settings
+from app.services.token_counter import count_tokens, truncate_to_tokens
+
 
 def get_interpretation_prompt(
     leadership_type: str,
@@ -111,24 +114,95 @@ def get_context_string(
 def build_final_prompt(
     question: str,
     system_prompt: str,
-    context_string: str,
-    conversation_history: Optional[List[Dict[str, str]]] = None
+    leadership_type: str,
+    report_context: Optional[str] = None,
+    retrieved_context: Optional[str] = None,
+    conversation_history: Optional[List[Dict[str, str]]] = None,
+    max_input_tokens: Optional[int] = None,
+    breakdown: Optional[Dict[str, Any]] = None
 ) -> List[Dict[str, str]]:
     """
     최종적으로 LLM에 전달될 메시지 리스트를 구성
+
+    입력 토큰 예산(count_tokens() 기준)을 시스템 프롬프트 → 질문 → 리포트 컨텍스트
+    → 참고자료 → 최근 대화 순으로 채웁니다. 시스템 프롬프트와 질문은 항상 넣고,
+    리포트/참고자료는 남은 예산에 맞춰 자르며, 대화는 최근 메시지부터 들어가는 만큼만 넣습니다.
+    남은 예산이 PROMPT_MIN_PART_TOKENS보다 작으면 넘치는 구성 요소는 자르지 않고 뺍니다.
+
+    Args:
+        max_input_tokens: 입력 토큰 예산 (기본: PROMPT_MAX_INPUT_TOKENS)
+        breakdown: 전달 시 구성 요소별 토큰 수를 채워 넣음
+            - system / question / report_context / retrieved_context / history / overhead / total / budget
+            - history_messages / history_dropped: 넣은/제외한 대화 메시지 수
+            - truncated: 잘린 구성 요소 이름 목록
     """
+    budget = max_input_tokens if max_input_tokens is not None else settings.PROMPT_MAX_INPUT_TOKENS
+    breakdown = breakdown if breakdown is not None else {}
+    truncated: List[str] = []
+
+    # 1. 항상 넣는 부분 (시스템 프롬프트, 질문, 컨텍스트 틀)
+    overhead = count_tokens(
+        f"[현재 대화의 전체 맥락]\n{get_context_string(leadership_type)}\n"
+        "\n[리포트 요약]\n\n\n[관련 참고자료]\n\n\n[리더의 질문]\n"
+    )
+    used = count_tokens(system_prompt) + count_tokens(question) + overhead
+
+    # 2. 리포트 컨텍스트 → 참고자료 (남은 예산에 맞춰 자르고, 남은 예산이 너무 작으면 제외)
+    fitted: Dict[str, str] = {}
+    for name, text in (("report_context", report_context), ("retrieved_context", retrieved_context)):
+        remaining = budget - used
+        text = text or ""
+        fitted[name] = truncate_to_tokens(text, remaining if remaining >= settings.PROMPT_MIN_PART_TOKENS else 0)
+        if fitted[name] != text:
+            truncated.append(name)
+        used += count_tokens(fitted[name])
+
+    # 3. 최근 대화부터 남은 예산만큼 (넘치는 메시지는 같은 기준으로 잘라 넣고 중단)
+    history: List[Dict[str, str]] = []
+    history_tokens = 0
+    for message in reversed(conversation_history or []):
+        content = message["content"]
+        tokens = count_tokens(content)
+        remaining = budget - used - history_tokens
+        cut = tokens > remaining
+        if cut:
+            if remaining < settings.PROMPT_MIN_PART_TOKENS:
+                break
+            content = truncate_to_tokens(content, remaining)
+            tokens = count_tokens(content)
+            truncated.append("history")
+        history.append({
+            "role": "user" if message["role"] == "user" else "assistant",
+            "content": content
+        })
+        history_tokens += tokens
+        if cut:
+            break
+    history.reverse()
+
     messages = [{"role": "system", "content": system_prompt}]
+    messages.extend(history)
 
-    # 이전 대화 내역 추가 (최근 3개)
-    if conversation_history:
-        for message in conversation_history[-3:]:
-            messages.append({
-                "role": "user" if message["role"] == "user" else "assistant",
-                "content": message["content"]
-            })
-    
     # 컨텍스트와 현재 질문을 포함한 사용자 메시지 구성
+    context_string = get_context_string(
+        leadership_type,
+        fitted["report_context"] or None,
+        fitted["retrieved_context"] or None
+    )
     user_message_content = f"[현재 대화의 전체 맥락]\n{context_string}\n\n[리더의 질문]\n{question}"
     messages.append({"role": "user", "content": user_message_content})
 
-    return messages
\ No newline at end of file
+    breakdown.update({
+        "system": count_tokens(system_prompt),
+        "question": count_tokens(question),
+        "report_context": count_tokens(fitted["report_context"]),
+        "retrieved_context": count_tokens(fitted["retrieved_context"]),
+        "history": history_tokens,
+        "history_messages": len(history),
+        "history_dropped": len(conversation_history or []) - len(history),
+        "overhead": overhead,
+        "total": used + history_tokens,
+        "budget": budget,
+        "truncated": truncated,
+    })
+    return messages
@@ -1,7 +1,18 @@
 """
-RAG 엔진 (단순화된 MVP 버전)
+RAG 엔진
+Vector DB에서 질문과 관련된 참고자료를 검색해 Q&A 프롬프트 컨텍스트로 제공
 """
+from typing import Any, Dict, List, Optional
+import logging
+
+from app.config import settings
+from app.core.metrics import RollingHistogram
 from app.services.llm_service import llm_service
+from app.services.token_counter import estimate_token_count
+from app.services.vector_db import vector_db_service
+
+logger = logging.getLogger(__name__)
+
 
 def build_prompt(question: str) -> str:
     # MVP에서는 가장 기본적인 프롬프트만 사용
@@ -10,10 +21,112 @@ def build_prompt(question: str) -> str:
 질문: {question}
 답변:"""
 
+
 class RAGEngine:
+    """RAG 검색 엔진 (싱글톤)"""
+
+    def __init__(self):
+        self.vector_db = vector_db_service
+        self.context_tokens = RollingHistogram()  # 프롬프트에 넣은 참고자료 토큰 수
+        self.truncated_contexts = 0  # 예산 때문에 문서를 자르거나 뺀 횟수
+
+    async def search(self, question: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        유형 필터 없이 후보 문서 검색
+
+        리포트 조회와 동시에 실행할 수 있도록 리더십 유형을 모르는 상태에서
+        top_k * RAG_OVERFETCH_FACTOR개를 가져오고, 유형 필터와 관련도 선별은 select_for_type()에서 적용합니다.
+
+        Returns:
+            List[Dict]: search_similar_documents() 결과 (거리 오름차순)
+        """
+        if top_k is None:
+            top_k = settings.RAG_TOP_K
+
+        return await self.vector_db.search_similar_documents(
+            query=question,
+            top_k=top_k * max(1, settings.RAG_OVERFETCH_FACTOR),
+            adaptive=False
+        )
+
+    def select_for_type(
+        self,
+        documents: List[Dict[str, Any]],
+        leadership_type: Optional[str],
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        후보 문서 중 해당 리더십 유형(또는 유형 무관) 문서만 남긴 뒤
+        유사도 임계값/adaptive top_k(VectorDBService.select_relevant())로 최대 top_k개 선택
+        """
+        if top_k is None:
+            top_k = settings.RAG_TOP_K
+
+        selected = [
+            doc for doc in documents
+            if not leadership_type
+            or (doc.get("metadata") or {}).get("leadership_type") in (None, "", leadership_type)
+        ]
+        return self.vector_db.select_relevant(selected, top_k)
+
+    async def retrieve(
+        self,
+        question: str,
+        leadership_type: Optional[str] = None,
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """유형 필터를 적용한 참고자료 검색 (search + select_for_type)"""
+        documents = await self.search(question, top_k)
+        return self.select_for_type(documents, leadership_type, top_k)
+
+    def format_context(self, documents: List[Dict[str, Any]], max_tokens: Optional[int] = None) -> str:
+        """
+        검색 문서 → get_context_string()의 retrieved_context 문자열
+
+        순위순으로 max_tokens(RAG_CONTEXT_MAX_TOKENS) 안에 들어가는 만큼 담고,
+        예산을 넘는 문서는 남은 예산이 충분하면 잘라서 넣고 아니면 뺍니다.
+
+        Returns:
+            str: 번호를 붙인 참고자료 목록 (문서가 없으면 빈 문자열)
+        """
+        if max_tokens is None:
+            max_tokens = settings.RAG_CONTEXT_MAX_TOKENS
+
+        contents = [" ".join((doc.get("content") or "").split()) for doc in documents]
+        lines: List[str] = []
+        used = 0
+        for content in filter(None, contents):
+            line = f"{len(lines) + 1}. {content}"
+            tokens = estimate_token_count(line)
+            remaining = max_tokens - used
+            if tokens > remaining:
+                self.truncated_contexts += 1
+                # 남은 예산이 문서의 절반도 안 되면 잘린 조각은 의미가 적으므로 중단
+                if remaining * 2 < tokens:
+                    break
+                line = line[:max(0, len(line) * remaining // tokens - 1)] + "…"
+                tokens = estimate_token_count(line)
+            lines.append(line)
+            used += tokens
+            if used >= max_tokens:
+                break
+
+        self.context_tokens.observe(used)
+        return "\n".join(lines)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """참고자료 컨텍스트 통계 (토큰 수 분포, 예산 초과 횟수)"""
+        return {
+            "context_max_tokens": settings.RAG_CONTEXT_MAX_TOKENS,
+            "context_tokens": self.context_tokens.summary(),
+            "truncated_contexts": self.truncated_contexts,
+        }
+
     async def generate_answer_non_streaming(self, question: str) -> str:
         prompt = build_prompt(question)
         response = await llm_service.generate_text(prompt)
         return response
 
-rag_engine = RAGEngine()
\ No newline at end of file
+
+# 싱글톤 인스턴스
+rag_engine = RAGEngine()
@@ -0,0 +1,164 @@
+"""
+리포트 2단계 캐시
+1단계: 프로세스 내 LRU (TTL 만료)
+2단계: PostgreSQL reports 테이블 (read-through / write-through)
+"""
+from typing import Dict, Any, Optional
+import logging
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.models.database import Report
+
+logger = logging.getLogger(__name__)
+
+
+class ReportCache:
+    """리포트 캐시 (메모리 LRU + PostgreSQL)"""
+
+    def __init__(self):
+        self.memory: TTLCache[Dict[str, Any]] = TTLCache(
+            max_size=settings.REPORT_CACHE_MAX_SIZE,
+            ttl_seconds=settings.CACHE_TTL_SECONDS
+        )
+        self.db_hits = 0
+        self.db_misses = 0
+        self.db_writes = 0
+        self.db_errors = 0
+
+    @staticmethod
+    def make_key(user_id: str, report_id: str) -> str:
+        """캐시 키 생성"""
+        return f"{user_id}:{report_id}"
+
+    async def get(self, user_id: str, report_id: str) -> Optional[Dict[str, Any]]:
+        """
+        리포트 조회 (메모리 → DB 순서, DB 히트 시 메모리에 적재)
+
+        Args:
+            user_id: 사용자 ID
+            report_id: 리포트 ID
+
+        Returns:
+            dict | None: 리포트 데이터
+        """
+        cache_key = self.make_key(user_id, report_id)
+
+        if settings.CACHE_ENABLED:
+            report = self.memory.get(cache_key)
+            if report:
+                logger.debug(f"메모리 캐시 히트: {cache_key}")
+                return report
+
+        report = await self._load_from_db(user_id, report_id)
+        if report is None:
+            return None
+
+        if settings.CACHE_ENABLED:
+            self.memory.set(cache_key, report)
+        return report
+
+    async def set(self, report: Dict[str, Any]) -> None:
+        """
+        리포트 저장 (메모리 + DB write-through)
+
+        DB 저장에 실패해도 메모리 캐시는 유지됩니다 (DB 미기동 개발 환경 대비).
+        """
+        cache_key = self.make_key(report["user_id"], report["report_id"])
+
+        if settings.CACHE_ENABLED:
+            self.memory.set(cache_key, report)
+
+        await self._save_to_db(report)
+
+    async def _load_from_db(self, user_id: str, report_id: str) -> Optional[Dict[str, Any]]:
+        """reports 테이블에서 리포트 조회"""
+        try:
+            from app.db.session import AsyncSessionLocal
+
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(Report).where(
+                        Report.report_id == report_id,
+                        Report.user_id == user_id
+                    )
+                )
+                row = result.scalar_one_or_none()
+
+            if row is None:
+                self.db_misses += 1
+                return None
+
+            self.db_hits += 1
+            logger.info(f"DB에서 리포트 조회: {report_id}")
+            return self._row_to_dict(row)
+
+        except Exception as e:
+            self.db_errors += 1
+            logger.warning(f"DB 리포트 조회 실패 (메모리 캐시만 사용): {e}")
+            return None
+
+    async def _save_to_db(self, report: Dict[str, Any]) -> None:
+        """reports 테이블에 리포트 저장 (이미 있으면 갱신)"""
+        try:
+            from app.db.session import AsyncSessionLocal
+
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(Report).where(Report.report_id == report["report_id"])
+                )
+                row = result.scalar_one_or_none()
+
+                if row is None:
+                    session.add(Report(
+                        report_id=report["report_id"],
+                        user_id=report["user_id"],
+                        leadership_type=report["leadership_type"],
+                        interpretation=report["interpretation"],
+                        assessment_data=report.get("assessment_data"),
+                        sections=report.get("sections"),
+                    ))
+                else:
+                    row.leadership_type = report["leadership_type"]
+                    row.interpretation = report["interpretation"]
+                    row.assessment_data = report.get("assessment_data")
+                    row.sections = report.get("sections")
+
+                await session.commit()
+
+            self.db_writes += 1
+
+        except Exception as e:
+            self.db_errors += 1
+            logger.warning(f"DB 리포트 저장 실패 (메모리 캐시만 사용): {e}")
+
+    @staticmethod
+    def _row_to_dict(row: Report) -> Dict[str, Any]:
+        """Report 행 → 리포트 dict"""
+        return {
+            "report_id": row.report_id,
+            "user_id": row.user_id,
+            "leadership_type": row.leadership_type,
+            "interpretation": row.interpretation,
+            "assessment_data": row.assessment_data,
+            "sections": row.sections,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 (LRU 크기 조정용)"""
+        return {
+            "memory": self.memory.get_stats(),
+            "db": {
+                "hits": self.db_hits,
+                "misses": self.db_misses,
+                "writes": self.db_writes,
+                "errors": self.db_errors,
+            },
+        }
+
+
+# 싱글톤 인스턴스
+report_cache = ReportCache()
@@ -0,0 +1,220 @@
+"""
+리포트 섹션 인덱스
+해석 리포트를 섹션([1. 팀 운영의 어려움] …)으로 나눠 임베딩해 두고,
+질문마다 전체 리포트 대신 짧은 요약 + 관련 섹션만 컨텍스트로 제공
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import re
+
+import numpy as np
+
+from app.config import settings
+from app.core.metrics import RollingHistogram
+from app.services.embedding_service import embedding_service
+from app.services.text_chunker import chunk_text
+from app.services.token_counter import estimate_token_count
+
+logger = logging.getLogger(__name__)
+
+# 섹션 제목 줄: get_interpretation_prompt()의 [제목], 마크다운 ## 제목, 한 줄 전체 **제목**
+_HEADER = re.compile(
+    r"^\s*(?:\[([^\[\]\n]{1,40})\]|#{1,3}\s+(.{1,40}?)|\*\*([^*\n]{1,40}?):?\*\*:?)\s*$",
+    re.MULTILINE
+)
+# 위 형식이 없을 때만 쓰는 번호 제목 줄 (generate_interpretation()의 "1. 핵심 특징" 형식)
+# 문장으로 끝나는 줄(마침표 등)은 목록 항목으로 보고 제외
+_NUMBERED_HEADER = re.compile(r"^\s*(\d{1,2}[.)]\s*[^\n]{1,38}?[^.!?。\s]):?\s*$", re.MULTILINE)
+# 장식용 구분선 (━━━, ---)
+_RULE = re.compile(r"^[\s━─=\-]{3,}$", re.MULTILINE)
+
+# 섹션 데이터 형식 버전 (파싱/요약 방식이 바뀌면 올려서 다시 생성)
+SECTIONS_VERSION = 2
+
+
+def parse_sections(interpretation: str) -> List[Dict[str, str]]:
+    """
+    리포트 → 섹션 리스트 ({"title", "content"})
+
+    제목은 [제목] / ## 제목 / **제목** 줄을 먼저 찾고, 없으면 "1. 제목" 같은 번호 줄을 씁니다.
+    첫 제목 앞의 본문은 "개요"로, 제목이 하나도 없으면 토큰 기준 청크를 "본문 N"으로 만듭니다.
+    """
+    text = _RULE.sub("", interpretation or "")
+    headers = list(_HEADER.finditer(text)) or list(_NUMBERED_HEADER.finditer(text))
+
+    if not headers:
+        return [
+            {"title": f"본문 {index}", "content": chunk}
+            for index, chunk in enumerate(chunk_text(text, settings.REPORT_CONTEXT_MAX_TOKENS // 2, 0), start=1)
+        ]
+
+    # 같은 제목(머리말 "개요" + [개요] 등)은 한 섹션으로 합침
+    sections: Dict[str, str] = {}
+    preamble = " ".join(text[:headers[0].start()].split())
+    if preamble:
+        sections["개요"] = preamble
+
+    for index, header in enumerate(headers):
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(text)
+        content = "\n".join(line.strip() for line in text[header.end():end].strip().splitlines() if line.strip())
+        if content:
+            title = next(group for group in header.groups() if group).strip()
+            sections[title] = f"{sections[title]}\n{content}" if title in sections else content
+    return [{"title": title, "content": content} for title, content in sections.items()]
+
+
+def make_digest(leadership_type: str, sections: List[Dict[str, str]], max_tokens: int) -> Tuple[str, bool]:
+    """
+    매 질문에 고정으로 넣는 짧은 요약 (유형, 섹션 목차, 첫 섹션 앞부분)
+
+    Returns:
+        (요약 문자열, 첫 섹션 전체를 그대로 담았는지 여부 → 담았으면 섹션 선택에서 제외)
+    """
+    lines = [f"리더십 유형: {leadership_type}"]
+    quotes_first = False
+    if sections:
+        lines.append("리포트 구성: " + " / ".join(section["title"] for section in sections))
+        overview = " ".join(sections[0]["content"].split())
+        budget = max_tokens - estimate_token_count("\n".join(lines))
+        if budget > 0 and overview:
+            tokens = estimate_token_count(overview)
+            if tokens > budget:
+                overview = overview[:len(overview) * budget // tokens].rstrip() + "…"
+            else:
+                quotes_first = True
+            lines.append(f"{sections[0]['title']}: {overview}")
+    return "\n".join(lines), quotes_first
+
+
+class ReportSectionIndex:
+    """
+    리포트 섹션 인덱스 (싱글톤)
+
+    - build(): 리포트 생성 시 섹션 파싱 + 섹션 임베딩 → report["sections"]에 저장 (reports.sections 컬럼)
+    - select_context(): 질문 임베딩과 코사인 유사도가 높은 섹션을 REPORT_CONTEXT_TOP_SECTIONS개,
+      REPORT_CONTEXT_MAX_TOKENS 안에서 골라 요약과 함께 반환
+    - 전체 리포트 대비 실제로 보낸 토큰 수를 누적해 절감률을 집계
+    """
+
+    def __init__(self):
+        self.embedder = embedding_service
+        self.full_tokens = RollingHistogram()  # 전체 리포트 토큰 수
+        self.sent_tokens = RollingHistogram()  # 실제 컨텍스트 토큰 수
+        self.total_full_tokens = 0
+        self.total_sent_tokens = 0
+        self.builds = 0
+        self.fallbacks = 0  # 요약 + 섹션이 더 길어 전체 리포트를 보낸 횟수
+
+    def build(self, leadership_type: str, interpretation: str) -> Dict[str, Any]:
+        """
+        섹션 데이터 생성 (블로킹, 임베딩 계산 포함)
+
+        Returns:
+            dict: {"version", "model", "digest", "digest_quotes_first", "items": [{"title", "content", "embedding"}]}
+        """
+        sections = parse_sections(interpretation)
+        embeddings = self.embedder.embed_documents(
+            [f"{section['title']}\n{section['content']}" for section in sections]
+        )
+        self.builds += 1
+        digest, quotes_first = make_digest(leadership_type, sections, settings.REPORT_DIGEST_MAX_TOKENS)
+        return {
+            "version": SECTIONS_VERSION,
+            "model": self.embedder.model_name,
+            "digest": digest,
+            "digest_quotes_first": quotes_first,
+            "items": [
+                dict(section, embedding=embedding) for section, embedding in zip(sections, embeddings)
+            ],
+        }
+
+    def is_current(self, sections: Optional[Dict[str, Any]]) -> bool:
+        """저장된 섹션 데이터를 그대로 쓸 수 있는지 (형식 버전/임베딩 모델 일치)"""
+        return (
+            bool(sections)
+            and sections.get("version") == SECTIONS_VERSION
+            and sections.get("model") == self.embedder.model_name
+        )
+
+    def select_context(
+        self,
+        report: Dict[str, Any],
+        question: str
+    ) -> Tuple[str, bool]:
+        """
+        질문 관련 섹션으로 리포트 컨텍스트 구성 (블로킹, 질의 임베딩은 캐시 사용)
+
+        섹션 데이터가 없거나 오래된 리포트는 이 자리에서 만들어 report["sections"]에 넣습니다.
+        요약 + 섹션이 전체 리포트보다 짧지 않으면(섹션이 하나뿐인 짧은 리포트 등) 전체 리포트를 그대로 씁니다.
+
+        Returns:
+            (리포트 컨텍스트 문자열, 섹션 데이터를 새로 만들었는지 여부)
+        """
+        interpretation = report.get("interpretation") or ""
+        sections = report.get("sections")
+        rebuilt = False
+        if not self.is_current(sections):
+            sections = self.build(report.get("leadership_type") or "", interpretation)
+            report["sections"] = sections
+            rebuilt = True
+
+        items = sections["items"]
+        selected: List[int] = []
+        if items:
+            matrix = np.asarray([item["embedding"] for item in items], dtype=np.float32)
+            query = np.asarray(self.embedder.embed_query(question), dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1) * float(np.linalg.norm(query))
+            similarities = np.divide(matrix @ query, norms, out=np.zeros(len(items), np.float32), where=norms > 0)
+
+            budget = settings.REPORT_CONTEXT_MAX_TOKENS
+            for index in np.argsort(-similarities, kind="stable").tolist():
+                if len(selected) >= settings.REPORT_CONTEXT_TOP_SECTIONS:
+                    break
+                # 요약에 이미 전체가 들어간 첫 섹션은 다시 넣지 않음
+                if index == 0 and sections.get("digest_quotes_first"):
+                    continue
+                tokens = estimate_token_count(items[index]["content"])
+                if tokens > budget and selected:
+                    continue
+                selected.append(index)
+                budget -= tokens
+
+        # 선택한 섹션은 리포트 순서대로 배치 (예산보다 긴 첫 섹션은 잘라서 사용)
+        parts = [sections["digest"]]
+        for index in sorted(selected):
+            content = items[index]["content"]
+            tokens = estimate_token_count(content)
+            if tokens > settings.REPORT_CONTEXT_MAX_TOKENS:
+                content = content[:len(content) * settings.REPORT_CONTEXT_MAX_TOKENS // tokens].rstrip() + "…"
+            parts.append(f"[{items[index]['title']}]\n{content}")
+        context = "\n\n".join(parts)
+
+        full = estimate_token_count(interpretation)
+        sent = estimate_token_count(context)
+        if sent >= full:
+            context = interpretation
+            sent = full
+            self.fallbacks += 1
+        self.full_tokens.observe(full)
+        self.sent_tokens.observe(sent)
+        self.total_full_tokens += full
+        self.total_sent_tokens += sent
+        return context, rebuilt
+
+    def get_stats(self) -> Dict[str, Any]:
+        """리포트 컨텍스트 절감 통계"""
+        return {
+            "enabled": settings.REPORT_SECTIONS_ENABLED,
+            "builds": self.builds,
+            "fallbacks": self.fallbacks,
+            "full_tokens": self.full_tokens.summary(),
+            "sent_tokens": self.sent_tokens.summary(),
+            "savings_ratio": (
+                round(1 - self.total_sent_tokens / self.total_full_tokens, 4)
+                if self.total_full_tokens else 0.0
+            ),
+        }
+
+
+# 싱글톤 인스턴스
+report_section_index = ReportSectionIndex()
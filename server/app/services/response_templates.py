@@ -0,0 +1,197 @@
+"""
+응답 템플릿 엔진
+환영/서비스 안내/되묻기/오프토픽 전환처럼 정형화된 전략은 LLM 없이 템플릿으로 바로 답변
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import random
+import time
+
+from app.config import settings
+from app.core.metrics import RollingHistogram
+from app.services.leadership_classifier import LEADERSHIP_TYPES
+
+logger = logging.getLogger(__name__)
+
+# 전략 키 → 변형 목록 (텍스트, 필요한 필드)
+# 필드: leadership_type, description, best_situation (LEADERSHIP_TYPES), topic, expert (대화 분석)
+# 필요한 필드가 없는 유형에는 그 변형을 넣지 않음
+RESPONSE_TEMPLATES: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {
+    "warm_welcome": [
+        (
+            "안녕하세요, 리더님! Link-Coach의 AI 코치입니다. "
+            "{leadership_type} 리더십을 바탕으로 오늘은 어떤 고민을 함께 나눠볼까요?",
+            ("leadership_type",),
+        ),
+        (
+            "반갑습니다, 리더님. 진단에서 {leadership_type}({description}) 유형으로 나오셨네요. "
+            "요즘 팀을 이끌면서 가장 마음이 쓰이는 부분은 무엇인가요?",
+            ("leadership_type", "description"),
+        ),
+        (
+            "안녕하세요, 리더님! {leadership_type} 리더님은 특히 {best_situation} 같은 상황에서 힘을 발휘하시는 유형이에요. "
+            "오늘은 어떤 이야기를 나눠보고 싶으신가요?",
+            ("leadership_type", "best_situation"),
+        ),
+    ],
+    "service_info": [
+        (
+            "저는 리더님의 리더십 고민을 함께 이야기하고 해결 방안을 찾는 Link-Coach AI 코치입니다. "
+            "{leadership_type} 리더십 리포트를 바탕으로 팀 운영이나 팀원과의 관계에 대해 편하게 물어보세요.",
+            ("leadership_type",),
+        ),
+        (
+            "Link-Coach는 진단 결과를 바탕으로 리더님께 맞춘 코칭 대화를 제공하는 서비스예요. "
+            "지금 {leadership_type} 리더로서 가장 고민되는 팀 상황이 있다면 말씀해주세요.",
+            ("leadership_type",),
+        ),
+    ],
+    "clarify_question": [
+        (
+            "제가 질문의 의도를 정확히 파악하지 못했어요. "
+            "혹시 팀원과의 대화나 회의처럼 구체적인 상황을 예로 들어 다시 말씀해주실 수 있을까요?",
+            (),
+        ),
+        (
+            "조금 더 자세히 듣고 싶어요. 어떤 상황에서 누구와 있었던 일인지 한두 문장으로 알려주시면 "
+            "{leadership_type} 리더십에 맞춰 함께 고민해볼게요.",
+            ("leadership_type",),
+        ),
+    ],
+    "gentle_redirect": [
+        (
+            "{topic} 이야기도 반갑네요! 그런데 요즘 팀 분위기는 어떠신가요? "
+            "리더님이 요즘 가장 신경 쓰이는 팀 이야기가 있다면 함께 나눠봐요.",
+            ("topic",),
+        ),
+        (
+            "{topic} 이야기는 제가 도와드리기 어렵지만, 리더십 고민이라면 언제든 함께할게요. "
+            "{leadership_type} 리더로서 요즘 팀에서 마음에 걸리는 일이 있으신가요?",
+            ("topic", "leadership_type"),
+        ),
+    ],
+    "redirect_to_expert": [
+        (
+            "말씀하신 {topic} 관련 문제는 제가 정확한 답변을 드리기 어려운 전문 분야예요. "
+            "안전하게 진행하시려면 {expert}와 꼭 상담해보시길 권해드려요. "
+            "이 상황에서 팀원과 어떻게 소통할지 고민되신다면 그 부분은 함께 이야기해볼 수 있어요.",
+            ("topic", "expert"),
+        ),
+    ],
+}
+
+# 오프토픽 카테고리(OffTopicCategory 값) → 상담을 권할 전문가
+EXPERTS = {
+    "법률": "노무사나 변호사 같은 법률 전문가",
+    "의료": "의사나 상담 전문가",
+}
+
+# 템플릿으로 답하지 않는 특성 (구체적인 고민이 담긴 턴은 LLM 경로)
+# 첫 턴 인사에 "구체적요청"이 붙으면 warm_welcome이어도 질문 내용에 답해야 함
+_LLM_TRAITS = {"구체적요청", "복잡한상황"}
+
+# 대화 분석에서 채우는 필드 (유형별 풀을 미리 만들 때는 자리표시자로 남김)
+_TURN_FIELDS = ("topic", "expert")
+
+
+def _type_fields(leadership_type: str) -> Dict[str, str]:
+    """LEADERSHIP_TYPES에서 템플릿 필드 추출 (없는 필드는 제외)"""
+    info = LEADERSHIP_TYPES.get(leadership_type, {})
+    fields = {"leadership_type": leadership_type}
+    if info.get("description"):
+        fields["description"] = info["description"]
+    if info.get("best_situations"):
+        fields["best_situation"] = info["best_situations"][0]
+    return fields
+
+
+class ResponseTemplateEngine:
+    """
+    응답 템플릿 엔진 (싱글톤)
+
+    - 리더십 유형마다 전략별 변형 풀을 미리 렌더링해 두고(유형 필드만 채움),
+      질문마다 하나를 골라 오프토픽 주제/전문가만 채워서 반환
+    - TEMPLATE_FAST_PATH_STRATEGIES에 있는 전략만 사용 (전략별 on/off)
+    - 오프토픽이 아닌 턴에 구체적 요청/복잡한 상황이 보이면 LLM 경로로 넘김
+    """
+
+    def __init__(self):
+        self.strategies = {
+            key.strip() for key in settings.TEMPLATE_FAST_PATH_STRATEGIES.split(",") if key.strip()
+        }
+        unknown = self.strategies - set(RESPONSE_TEMPLATES)
+        if unknown:
+            logger.warning(f"템플릿이 없는 전략은 무시합니다: {sorted(unknown)}")
+            self.strategies -= unknown
+
+        # (유형, 전략) → 변형 목록
+        self._pools: Dict[Tuple[str, str], List[str]] = {}
+        self.render_us = RollingHistogram()
+        self.served: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.TEMPLATE_FAST_PATH_ENABLED and bool(self.strategies)
+
+    def _pool(self, leadership_type: str, strategy_key: str) -> List[str]:
+        """유형별 변형 풀 (처음 요청될 때 생성)"""
+        key = (leadership_type, strategy_key)
+        pool = self._pools.get(key)
+        if pool is None:
+            fields = _type_fields(leadership_type)
+            placeholders = {name: "{" + name + "}" for name in _TURN_FIELDS}
+            pool = [
+                text.format(**fields, **placeholders)
+                for text, required in RESPONSE_TEMPLATES[strategy_key]
+                if all(name in fields or name in _TURN_FIELDS for name in required)
+            ]
+            self._pools[key] = pool
+        return pool
+
+    def render(
+        self,
+        strategy_key: Optional[str],
+        leadership_type: Optional[str],
+        analysis: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        """
+        템플릿 답변 생성
+
+        Returns:
+            str | None: 답변 (대상 전략이 아니거나 필요한 필드가 없으면 None → LLM 경로)
+        """
+        if not self.enabled or strategy_key not in self.strategies:
+            return None
+        if not (analysis or {}).get("is_offtopic") and set((analysis or {}).get("traits") or []) & _LLM_TRAITS:
+            return None
+
+        started = time.perf_counter()
+        topic = (analysis or {}).get("offtopic_category")
+        turn_fields = {"topic": topic, "expert": EXPERTS.get(topic)}
+        candidates = [
+            text for text in self._pool(leadership_type or "", strategy_key)
+            if all(turn_fields[name] or "{" + name + "}" not in text for name in _TURN_FIELDS)
+        ]
+        if not candidates:
+            return None
+
+        answer = random.choice(candidates)
+        if "{" in answer:
+            answer = answer.format(**{name: value or "" for name, value in turn_fields.items()})
+
+        self.render_us.observe((time.perf_counter() - started) * 1_000_000)
+        self.served[strategy_key] = self.served.get(strategy_key, 0) + 1
+        return answer
+
+    def get_stats(self) -> Dict[str, Any]:
+        """템플릿 응답 통계 (전략별 건수, 렌더링 시간)"""
+        return {
+            "enabled": self.enabled,
+            "strategies": sorted(self.strategies),
+            "served": dict(self.served),
+            "render_us": self.render_us.summary(),
+        }
+
+
+# 싱글톤 인스턴스
+response_templates = ResponseTemplateEngine()
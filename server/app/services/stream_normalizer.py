@@ -0,0 +1,150 @@
+"""
+LLM 스트리밍 청크 정규화
+SDK 청크에서 델타만 추출하고(누적 텍스트를 보내는 SDK는 설정으로 지정), 작은 청크를 묶어서 전송
+"""
+from typing import Any, Dict, List, Optional
+import logging
+import time
+
+from app.core.metrics import percentile
+from app.services.token_counter import estimate_token_count
+
+logger = logging.getLogger(__name__)
+
+
+class StreamChunkNormalizer:
+    """
+    스트리밍 청크 정규화기
+
+    - 기본은 델타 모드 (Gemini SDK는 델타를 보냄), 누적(cumulative) 모드는 cumulative=True로 지정
+      (청크 내용으로 추측하면 우연히 앞 청크로 시작하는 델타를 잘라 텍스트가 사라질 수 있음)
+    - 누적 모드에서는 새로 늘어난 부분만 잘라내므로 전체 처리 비용이 O(n)
+      접두사가 맞지 않는 청크는 이미 보낸 텍스트를 되돌릴 수 없으므로 버리고 경고만 남김
+    - 전송 대기 중인 델타가 flush_tokens 이상이거나 마지막 전송 후
+      flush_interval초가 지나면 묶어서 내보냄 (첫 델타는 TTFB를 위해 즉시 전송)
+    """
+
+    MODE_DELTA = "delta"
+    MODE_CUMULATIVE = "cumulative"
+
+    # 누적 모드에서 접두사 일치를 확인할 꼬리 길이
+    _PREFIX_CHECK_CHARS = 16
+
+    def __init__(self, flush_tokens: int = 0, flush_interval: float = 0.0, cumulative: bool = False):
+        self.flush_tokens = max(0, flush_tokens)
+        self.flush_interval = max(0.0, flush_interval)
+        self.mode = self.MODE_CUMULATIVE if cumulative else self.MODE_DELTA
+
+        self._parts: List[str] = []
+        self._length = 0
+        self._pending: List[str] = []
+        self.mismatched_chunks = 0
+
+        self._started = time.perf_counter()
+        self._first_chunk_at: Optional[float] = None
+        self._last_chunk_at: Optional[float] = None
+        self._last_flush_at: Optional[float] = None
+        self._gaps_ms: List[float] = []
+        self.raw_chunks = 0
+        self.flushes = 0
+
+    @property
+    def text(self) -> str:
+        """지금까지 수신한 전체 텍스트"""
+        return "".join(self._parts)
+
+    @property
+    def length(self) -> int:
+        return self._length
+
+    def feed(self, raw: str) -> Optional[str]:
+        """
+        SDK 청크 입력
+
+        Args:
+            raw: SDK가 보낸 청크 텍스트 (델타 또는 누적)
+
+        Returns:
+            str | None: 지금 전송할 텍스트 (묶는 중이면 None)
+        """
+        now = time.perf_counter()
+        if self._last_chunk_at is not None:
+            self._gaps_ms.append((now - self._last_chunk_at) * 1000)
+        else:
+            self._first_chunk_at = now
+        self._last_chunk_at = now
+        self.raw_chunks += 1
+
+        delta = self._extract_delta(raw)
+        if not delta:
+            return None
+
+        self._parts.append(delta)
+        self._length += len(delta)
+        self._pending.append(delta)
+
+        if self._should_flush(now):
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[str]:
+        """전송 대기 중인 텍스트를 모두 내보냄"""
+        if not self._pending:
+            return None
+
+        out = "".join(self._pending)
+        self._pending = []
+        self._last_flush_at = time.perf_counter()
+        self.flushes += 1
+        return out
+
+    def _extract_delta(self, raw: str) -> str:
+        """모드에 따라 새로 추가된 텍스트만 추출"""
+        if not raw or self.mode == self.MODE_DELTA:
+            return raw or ""
+
+        # 누적 모드: 전체 접두사 비교 대신 경계 부근 꼬리만 확인 (O(1))
+        if len(raw) >= self._length:
+            last = self._parts[-1] if self._parts else ""
+            check = min(self._PREFIX_CHECK_CHARS, len(last))
+            if raw[self._length - check:self._length] == last[len(last) - check:]:
+                return raw[self._length:]
+
+        self.mismatched_chunks += 1
+        logger.warning("누적 텍스트 접두사 불일치 - 청크 무시")
+        return ""
+
+    def _should_flush(self, now: float) -> bool:
+        if self._last_flush_at is None:
+            return True  # 첫 델타는 즉시 전송
+        if self.flush_tokens <= 0 and self.flush_interval <= 0:
+            return True  # 묶음 전송 비활성화
+        if self.flush_tokens and estimate_token_count("".join(self._pending)) >= self.flush_tokens:
+            return True
+        return self.flush_interval > 0 and now - self._last_flush_at >= self.flush_interval
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        스트림 처리량 지표
+
+        Returns:
+            dict: mode, raw_chunks, mismatched_chunks, flushes, chars, chars_per_sec,
+                  time_to_first_chunk_ms, gap_p50_ms, gap_p99_ms
+        """
+        elapsed = (self._last_chunk_at or self._started) - self._started
+        p50 = percentile(self._gaps_ms, 50)
+        p99 = percentile(self._gaps_ms, 99)
+        return {
+            "mode": self.mode,
+            "raw_chunks": self.raw_chunks,
+            "mismatched_chunks": self.mismatched_chunks,
+            "flushes": self.flushes,
+            "chars": self._length,
+            "chars_per_sec": round(self._length / elapsed, 1) if elapsed > 0 else None,
+            "time_to_first_chunk_ms": (
+                round((self._first_chunk_at - self._started) * 1000, 1)
+                if self._first_chunk_at is not None else None
+            ),
+            "gap_p50_ms": round(p50, 1) if p50 is not None else None,
+            "gap_p99_ms": round(p99, 1) if p99 is not None else None,
+        }
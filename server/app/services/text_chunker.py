@@ -0,0 +1,80 @@
+"""
+텍스트 청킹
+긴 문서를 토큰 수 기준으로 나누고, 인접 청크 사이에 겹치는 문장을 둬 문맥을 유지
+"""
+from typing import List
+import re
+
+from app.services.token_counter import estimate_token_weight
+
+# 문장/줄 경계 (구분자는 앞 문장에 포함)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def _split_units(text: str, max_tokens: int) -> List[str]:
+    """문장 단위로 나누고, max_tokens를 넘는 문장은 글자 수 비율로 다시 자름"""
+    units: List[str] = []
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        sentence = " ".join(sentence.split())
+        if not sentence:
+            continue
+
+        tokens = estimate_token_weight(sentence)
+        if tokens <= max_tokens:
+            units.append(sentence)
+            continue
+
+        step = max(1, int(len(sentence) * max_tokens / tokens))
+        units.extend(sentence[start:start + step] for start in range(0, len(sentence), step))
+    return units
+
+
+def chunk_text(text: str, max_tokens: int = 256, overlap_tokens: int = 32) -> List[str]:
+    """
+    토큰 수 기준 청킹
+
+    문장을 max_tokens까지 채워 청크를 만들고, 다음 청크는 직전 청크 끝의
+    overlap_tokens 이내 문장들로 시작합니다.
+
+    Args:
+        text: 원문
+        max_tokens: 청크당 최대 토큰 수 (estimate_token_weight 기준)
+        overlap_tokens: 인접 청크가 공유할 최대 토큰 수 (max_tokens 미만)
+
+    Returns:
+        List[str]: 청크 리스트 (짧은 문서는 원문 1개)
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens는 1 이상이어야 합니다.")
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens - 1))
+
+    units = _split_units(text or "", max_tokens)
+    if not units:
+        return []
+    # 청크는 " "로 이어 붙이므로 문장마다 공백 1자(0.25토큰)를 더해 합이 청크 토큰 수가 되게 함
+    counts = [estimate_token_weight(unit) + 0.25 for unit in units]
+
+    chunks: List[str] = []
+    start = 0
+    while start < len(units):
+        end, total = start, 0
+        while end < len(units) and (end == start or total + counts[end] <= max_tokens):
+            total += counts[end]
+            end += 1
+        chunks.append(" ".join(units[start:end]))
+        if end == len(units):
+            break
+
+        # 겹침: 끝에서부터 overlap_tokens 이내 문장을 되돌림
+        # (최소 1문장 전진, 겹친 문장 뒤에 다음 새 문장이 들어갈 자리는 남김)
+        next_start, overlap = end, 0
+        while (
+            next_start - 1 > start
+            and overlap + counts[next_start - 1] <= overlap_tokens
+            and overlap + counts[next_start - 1] + counts[end] <= max_tokens
+        ):
+            next_start -= 1
+            overlap += counts[next_start]
+        start = next_start
+
+    return chunks
@@ -0,0 +1,118 @@
+"""
+토큰 수 추정
+SDK가 사용량 정보를 주지 않을 때 사용하는 로컬 근사 토크나이저
+(프롬프트 예산 계산용 count_tokens()는 Gemini 실제 토큰 수로 보정)
+"""
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+from app.config import settings
+
+
+def estimate_token_weight(text: str) -> float:
+    """
+    반올림 전 토큰 수 근사치 (이어 붙인 텍스트의 값은 각 부분 값의 합)
+
+    한글 등 비 ASCII 문자는 약 1.5자, ASCII 문자는 약 4자를 1토큰으로 봅니다.
+    """
+    if not text:
+        return 0.0
+    ascii_chars = sum(1 for c in text if ord(c) < 128)
+    other_chars = len(text) - ascii_chars
+    return ascii_chars / 4 + other_chars / 1.5
+
+
+def estimate_token_count(text: str) -> int:
+    """토큰 수 근사치 계산 (estimate_token_weight() 반올림, 최소 1)"""
+    if not text:
+        return 0
+    return max(1, round(estimate_token_weight(text)))
+
+
+class TokenCalibrator:
+    """
+    로컬 추정치 보정 (싱글톤)
+
+    실제 토큰 수(응답의 prompt_token_count 또는 표본 프롬프트의 count_tokens 결과)와
+    같은 프롬프트의 estimate_token_weight()를 최근 TOKEN_CALIBRATION_WINDOW회 모아 두고,
+    합계 비율을 배율로 사용합니다.
+    표본이 TOKEN_CALIBRATION_MIN_SAMPLES개 미만이면 배율 1.0 (보정 없음).
+    """
+
+    MIN_SCALE = 0.5
+    MAX_SCALE = 2.0
+
+    def __init__(self):
+        self._samples: Deque[Tuple[float, int]] = deque(maxlen=settings.TOKEN_CALIBRATION_WINDOW)
+        self._weight_sum = 0.0
+        self._actual_sum = 0
+        self.scale = 1.0
+
+    @property
+    def calibrated(self) -> bool:
+        """보정 배율이 실제 토큰 수 표본에서 계산되었는지 여부"""
+        return len(self._samples) >= settings.TOKEN_CALIBRATION_MIN_SAMPLES
+
+    def observe(self, text: str, actual_tokens: int) -> None:
+        """실제 토큰 수 반영"""
+        weight = estimate_token_weight(text)
+        if weight <= 0 or not actual_tokens:
+            return
+
+        if len(self._samples) == self._samples.maxlen:
+            old_weight, old_actual = self._samples[0]
+            self._weight_sum -= old_weight
+            self._actual_sum -= old_actual
+        self._samples.append((weight, actual_tokens))
+        self._weight_sum += weight
+        self._actual_sum += actual_tokens
+
+        if self.calibrated:
+            ratio = self._actual_sum / self._weight_sum
+            self.scale = min(self.MAX_SCALE, max(self.MIN_SCALE, ratio))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """보정 상태 (표본 수, 배율, 보정 여부 - False면 토큰 수는 보정 없는 추정치)"""
+        return {
+            "samples": len(self._samples),
+            "scale": round(self.scale, 4),
+            "calibrated": self.calibrated,
+        }
+
+
+def count_tokens(text: str) -> int:
+    """보정된 토큰 수 (estimate_token_weight() × 보정 배율 반올림, 최소 1)"""
+    if not text:
+        return 0
+    return max(1, round(estimate_token_weight(text) * token_calibrator.scale))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    count_tokens() 기준 max_tokens 이내로 자르기
+
+    줄 단위로 앞에서부터 남기고, 첫 줄부터 넘치면 그 줄을 글자 수 비율로 잘라 "…"를 붙입니다.
+    """
+    if not text or count_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    kept = []
+    used = 0
+    for line in text.splitlines():
+        tokens = count_tokens(line) + (1 if kept else 0)
+        if used + tokens > max_tokens:
+            if not kept:
+                cut = len(line) * max_tokens // tokens
+                while cut > 0 and count_tokens(line[:cut] + "…") > max_tokens:
+                    cut -= max(1, cut // 10)
+                return line[:max(0, cut)].rstrip() + "…" if cut > 0 else ""
+            break
+        kept.append(line)
+        used += tokens
+    return "\n".join(kept)
+
+
+# 싱글톤 인스턴스
+token_calibrator = TokenCalibrator()
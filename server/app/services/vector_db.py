@@ -4,21 +4,168 @@ ChromaDB를 사용한 임상 데이터 저장 및 검색
 """
 import chromadb
 from chromadb.config import Settings as ChromaSettings
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+import asyncio
 import logging
+import time
 
 from app.config import settings
+from app.core.batching import MicroBatcher
+from app.core.cache import TTLCache
+from app.core.metrics import RollingHistogram
+from app.services.embedding_service import embedding_service, normalize_text
+from app.services.lexical_index import LexicalIndex
+from app.services.local_index import SPACE_KEY, VERSION_KEY, LocalVectorIndex, collection_space
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# 배치 벡터 검색 요청: (질의, top_k), 유형 필터가 없는 검색만 배치
+QueryRequest = Tuple[str, int]
+
+# 검색 결과 캐시 키: (정규화 질의, 리더십 유형, top_k, 검색 방식, adaptive)
+ResultKey = Tuple[str, Optional[str], int, str, bool]
+
+# 컬렉션 메타데이터의 미반영 쓰기 표시 키 (bump_version=False로 쓰기 시작할 때 기록,
+# bump_collection_version(clear_pending=True)에서 제거 → 중단된 일괄 적재도 다음 실행에서 버전 증가)
+PENDING_WRITES_KEY = "pending_writes"
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """타임아웃 기본값을 가진 커넥션 풀 어댑터 (chromadb는 요청에 timeout을 넘기지 않음)"""
+
+    def __init__(self, timeout: tuple, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
 
 class VectorDBService:
-    """Vector DB 서비스 (싱글톤)"""
+    """
+    Vector DB 서비스 (싱글톤)
+
+    chromadb.HttpClient는 동기 클라이언트이므로 모든 호출을 전용 스레드 풀에서 실행하고,
+    동시 호출 수(CHROMA_MAX_CONCURRENCY)와 호출별 타임아웃(CHROMA_TIMEOUT_SECONDS)을 적용합니다.
+    LOCAL_INDEX_ENABLED이면 컬렉션을 로컬 인덱스로 복제해 검색은 HTTP 없이 처리합니다.
+    RETRIEVAL_MODE가 hybrid/lexical이면 BM25 어휘 인덱스를 함께 유지하고,
+    hybrid는 벡터/어휘 순위를 RRF(reciprocal rank fusion)로 합칩니다.
+    CHROMA_QUERY_BATCH_ENABLED이면 동시에 들어온 유형 필터 없는 Chroma 벡터 검색을 짧게 모아
+    한 번의 collection.query(query_embeddings=[...])로 보냅니다. (Q&A 검색은 유형을 모르는 상태에서
+    넉넉히 가져온 뒤 걸러내므로 필터가 없고, 필터가 있는 검색은 바로 호출)
+    RETRIEVAL_CACHE_ENABLED이면 검색 결과를 컬렉션 버전(메타데이터 VERSION_KEY, 모든 워커가 공유)과
+    함께 캐시하고, 버전이 바뀐 항목은 조회 시점에 무효화합니다.
+    """
 
     def __init__(self):
         self.client: Optional[chromadb.HttpClient] = None
         self.collection: Optional[chromadb.Collection] = None
         self.connected: bool = False
+        # 임베딩은 서버가 아닌 이 프로세스에서 계산 (질의 임베딩 캐시 포함)
+        self.embedder = embedding_service
+
+        self.max_concurrency = max(1, settings.CHROMA_MAX_CONCURRENCY)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="chroma"
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._connect_lock = asyncio.Lock()
+
+        self.local_index: Optional[LocalVectorIndex] = None
+        if settings.LOCAL_INDEX_ENABLED:
+            self.local_index = LocalVectorIndex(settings.LOCAL_INDEX_PATH, settings.CHROMA_COLLECTION_NAME)
+        self.lexical_index: Optional[LexicalIndex] = None
+        if settings.RETRIEVAL_MODE in ("hybrid", "lexical"):
+            self.lexical_index = LexicalIndex()
+        self._index_checked_at = 0.0
+        self._index_refresh: Optional[asyncio.Task] = None
+
+        self._query_batcher: Optional[MicroBatcher[QueryRequest, List[Dict[str, Any]]]] = None
+        if settings.CHROMA_QUERY_BATCH_ENABLED:
+            self._query_batcher = MicroBatcher(
+                self._query_batch,
+                max_batch_size=settings.CHROMA_QUERY_BATCH_MAX_SIZE,
+                max_wait_ms=settings.CHROMA_QUERY_BATCH_MAX_WAIT_MS,
+                name="chroma-query"
+            )
+        self.query_batch_size = RollingHistogram()  # collection.query 1회에 담긴 질의 수
+
+        # 검색 결과 캐시: 키 → (저장 시점 컬렉션 버전, 결과)
+        self.collection_version: Optional[int] = None
+        self.result_cache: Optional[TTLCache[Tuple[int, List[Dict[str, Any]]]]] = None
+        if settings.RETRIEVAL_CACHE_ENABLED:
+            self.result_cache = TTLCache(
+                max_size=settings.RETRIEVAL_CACHE_MAX_SIZE,
+                ttl_seconds=settings.RETRIEVAL_CACHE_TTL_SECONDS
+            )
+        self.result_cache_hits = 0
+        self.result_cache_misses = 0
+        self.result_cache_invalidations = 0  # 버전이 바뀌어 버린 항목 수
+
+        self.latency_ms: Dict[str, RollingHistogram] = {}
+        self.in_flight = 0
+        self.timeouts = 0
+        self.relevance_candidates = 0  # select_relevant() 입력 문서 수
+        self.dropped_threshold = 0  # 유사도 임계값 미달로 제외
+        self.dropped_gap = 0  # 점수 간격(adaptive top_k)으로 제외
+
+    async def _call(
+        self,
+        operation: str,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> T:
+        """
+        동기 Chroma 호출을 스레드 풀에서 실행
+
+        슬롯 대기 시간을 포함해 timeout초가 지나면 asyncio.TimeoutError를 냅니다.
+        타임아웃 후에도 스레드의 호출은 끝까지 실행되며, 슬롯은 그때 반환됩니다.
+        """
+        if timeout is None:
+            timeout = settings.CHROMA_TIMEOUT_SECONDS
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        histogram = self.latency_ms.setdefault(operation, RollingHistogram())
+
+        try:
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise
+
+            self.in_flight += 1
+            future = loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+            future.add_done_callback(self._release_slot)
+
+            remaining = max(0.0, timeout - (time.perf_counter() - started))
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), remaining)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise
+
+        finally:
+            histogram.observe((time.perf_counter() - started) * 1000)
+
+    def _release_slot(self, future: asyncio.Future) -> None:
+        """스레드 호출 완료 시 동시 실행 슬롯 반환"""
+        self.in_flight -= 1
+        self._semaphore.release()
+        # 호출자가 타임아웃으로 떠난 경우 "exception was never retrieved" 경고 방지
+        if not future.cancelled():
+            future.exception()
 
     async def connect(self) -> None:
         """ChromaDB 연결"""
@@ -26,38 +173,157 @@ class VectorDBService:
             logger.info("ChromaDB가 이미 연결되어 있습니다.")
             return
 
+        async with self._connect_lock:
+            if self.connected:
+                return
+
+            try:
+                logger.info(f"ChromaDB 연결 중: {settings.chroma_url}")
+                await self._call("connect", self._connect_sync)
+                self.connected = True
+
+            except Exception as e:
+                logger.error(f"ChromaDB 연결 실패: {e}", exc_info=True)
+                self.connected = False
+                raise
+
+        # 로컬/어휘 인덱스 초기 생성 (실패해도 Chroma 벡터 검색으로 동작)
+        if self._indexes:
+            await self.refresh_indexes()
+
+    @property
+    def _indexes(self) -> List[Any]:
+        """컬렉션을 복제하는 프로세스 내 인덱스 목록"""
+        return [index for index in (self.local_index, self.lexical_index) if index is not None]
+
+    @property
+    def _refresh_interval(self) -> Optional[float]:
+        """컬렉션 버전 확인 주기 (인덱스도 결과 캐시도 없으면 None)"""
+        intervals = []
+        if self._indexes:
+            intervals.append(settings.LOCAL_INDEX_REFRESH_SECONDS)
+        if self.result_cache is not None:
+            intervals.append(settings.RETRIEVAL_CACHE_VERSION_CHECK_SECONDS)
+        return min(intervals) if intervals else None
+
+    async def refresh_indexes(self) -> bool:
+        """
+        컬렉션 버전을 확인해 로컬/어휘 인덱스 동기화 (결과 캐시의 기준 버전도 갱신)
+
+        Returns:
+            bool: 하나라도 갱신되었는지 여부
+        """
+        if self._refresh_interval is None:
+            return False
+
+        self._index_checked_at = time.monotonic()
         try:
-            logger.info(f"ChromaDB 연결 중: {settings.chroma_url}")
-
-            # HttpClient로 연결
-            self.client = chromadb.HttpClient(
-                host=settings.CHROMA_HOST,
-                port=settings.CHROMA_PORT,
-                settings=ChromaSettings(
-                    anonymized_telemetry=False
-                )
+            return await self._call(
+                "index_sync",
+                self._refresh_indexes_sync,
+                timeout=settings.CHROMA_WRITE_TIMEOUT_SECONDS
             )
 
-            # 컬렉션 가져오기 또는 생성
-            try:
-                self.collection = self.client.get_collection(
-                    name=settings.CHROMA_COLLECTION_NAME
-                )
-                logger.info(f"✅ 기존 컬렉션 로드: {settings.CHROMA_COLLECTION_NAME}")
-            except Exception:
-                logger.info(f"컬렉션 생성 중: {settings.CHROMA_COLLECTION_NAME}")
-                self.collection = self.client.create_collection(
-                    name=settings.CHROMA_COLLECTION_NAME,
-                    metadata={"description": "리더십 임상 데이터"}
-                )
-                logger.info(f"✅ 새 컬렉션 생성: {settings.CHROMA_COLLECTION_NAME}")
-
-            self.connected = True
+        except asyncio.TimeoutError:
+            logger.warning(f"인덱스 동기화 타임아웃 ({settings.CHROMA_WRITE_TIMEOUT_SECONDS}초)")
+            return False
 
         except Exception as e:
-            logger.error(f"ChromaDB 연결 실패: {e}", exc_info=True)
-            self.connected = False
-            raise
+            logger.error(f"인덱스 동기화 실패: {e}", exc_info=True)
+            return False
+
+    def _refresh_indexes_sync(self) -> bool:
+        """최신 컬렉션 메타데이터(버전)로 각 인덱스 동기화 (스레드 풀에서 실행)"""
+        collection = self.client.get_collection(
+            name=settings.CHROMA_COLLECTION_NAME,
+            embedding_function=self.embedder
+        )
+        self._set_collection_version(collection)
+        return any([index.sync(collection) for index in self._indexes])
+
+    def _set_collection_version(self, collection: Any) -> None:
+        """컬렉션 메타데이터의 버전을 결과 캐시 기준 버전으로 기록"""
+        self.collection_version = int((collection.metadata or {}).get(VERSION_KEY, 0))
+
+    def _schedule_index_refresh(self, force: bool = False) -> None:
+        """
+        주기적 백그라운드 동기화 (검색은 기존 인덱스/캐시로 계속 처리)
+
+        인덱스는 LOCAL_INDEX_REFRESH_SECONDS, 결과 캐시는 RETRIEVAL_CACHE_VERSION_CHECK_SECONDS 중 짧은 주기
+        """
+        interval = self._refresh_interval
+        if interval is None:
+            return
+        if self._index_refresh is not None and not self._index_refresh.done():
+            return
+        if force or time.monotonic() - self._index_checked_at >= interval:
+            self._index_refresh = asyncio.get_running_loop().create_task(self.refresh_indexes())
+
+    async def _search_local(
+        self,
+        query: str,
+        leadership_type: Optional[str],
+        top_k: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """로컬 인덱스 검색 (인덱스가 준비되지 않았으면 None)"""
+        if self.local_index is None or not self.local_index.ready:
+            return None
+
+        # 질의 임베딩이 캐시에 있으면 스레드 전환 없이 바로 검색
+        embedding = self.embedder.cached_query(query)
+        if embedding is None:
+            embedding = await asyncio.to_thread(self.embedder.embed_query, query)
+        return self.local_index.search(embedding, top_k, leadership_type)
+
+    def _connect_sync(self) -> None:
+        """HttpClient 생성 및 컬렉션 로드 (스레드 풀에서 실행)"""
+        # HttpClient로 연결
+        self.client = chromadb.HttpClient(
+            host=settings.CHROMA_HOST,
+            port=settings.CHROMA_PORT,
+            settings=ChromaSettings(
+                anonymized_telemetry=False
+            )
+        )
+        self._configure_http_session()
+
+        # 컬렉션 가져오기 또는 생성
+        try:
+            self.collection = self.client.get_collection(
+                name=settings.CHROMA_COLLECTION_NAME,
+                embedding_function=self.embedder
+            )
+            logger.info(f"✅ 기존 컬렉션 로드: {settings.CHROMA_COLLECTION_NAME}")
+            self._set_collection_version(self.collection)
+        except Exception:
+            logger.info(f"컬렉션 생성 중: {settings.CHROMA_COLLECTION_NAME}")
+            self.collection = self.client.create_collection(
+                name=settings.CHROMA_COLLECTION_NAME,
+                metadata={"description": "리더십 임상 데이터"},
+                embedding_function=self.embedder
+            )
+            logger.info(f"✅ 새 컬렉션 생성: {settings.CHROMA_COLLECTION_NAME}")
+            self._set_collection_version(self.collection)
+
+    def _configure_http_session(self) -> None:
+        """
+        HttpClient 내부 requests 세션에 커넥션 풀과 기본 타임아웃 적용
+
+        풀 크기를 동시 호출 수에 맞춰 keep-alive 연결을 재사용합니다.
+        """
+        session = getattr(getattr(self.client, "_server", None), "_session", None)
+        if session is None:
+            logger.warning("ChromaDB HTTP 세션을 찾을 수 없어 커넥션 풀 설정을 건너뜁니다.")
+            return
+
+        # 읽기 타임아웃은 가장 긴 호출(문서 추가) 기준, 조회 지연은 _call()의 타임아웃이 제한
+        adapter = _TimeoutHTTPAdapter(
+            timeout=(settings.CHROMA_CONNECT_TIMEOUT_SECONDS, settings.CHROMA_WRITE_TIMEOUT_SECONDS),
+            pool_connections=1,
+            pool_maxsize=self.max_concurrency
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
 
     async def health_check(self) -> bool:
         """
@@ -71,7 +337,7 @@ class VectorDBService:
                 await self.connect()
 
             # Heartbeat 확인
-            heartbeat = self.client.heartbeat()
+            heartbeat = await self._call("heartbeat", self.client.heartbeat)
             logger.info(f"ChromaDB 헬스체크: {heartbeat}")
             return True
 
@@ -83,7 +349,9 @@ class VectorDBService:
         self,
         query: str,
         leadership_type: Optional[str] = None,
-        top_k: int = None
+        top_k: int = None,
+        mode: Optional[str] = None,
+        adaptive: bool = True
     ) -> List[Dict[str, Any]]:
         """
         유사 문서 검색
@@ -92,54 +360,258 @@ class VectorDBService:
             query: 검색 쿼리
             leadership_type: 리더십 유형 필터 (선택)
             top_k: 반환할 문서 수
+            mode: vector | lexical | hybrid (기본: RETRIEVAL_MODE, 어휘 인덱스가 없으면 vector)
+            adaptive: 유사도 임계값/점수 간격으로 top_k 이하로 줄일지 여부 (select_relevant())
 
         Returns:
             List[Dict]: 검색 결과 리스트
                 - id: 문서 ID
                 - content: 문서 내용
                 - metadata: 메타데이터
-                - distance: 거리 (낮을수록 유사)
+                - distance: 거리 (낮을수록 유사, 어휘 검색으로만 찾은 문서는 None)
+                - similarity: 거리에서 환산한 코사인 유사도 (distance가 없으면 None)
+                - lexical_score / term_coverage / rrf_score: 어휘/hybrid 검색일 때만
         """
         if not self.connected:
             await self.connect()
 
         if top_k is None:
             top_k = settings.RAG_TOP_K
+        mode = mode or settings.RETRIEVAL_MODE
+        lexical_ready = self.lexical_index is not None and self.lexical_index.ready
+        if mode != "vector" and not lexical_ready:
+            mode = "vector"
+
+        # 결과 캐시 조회 (검색 도중 버전이 바뀌면 이전 버전으로 저장되어 다음 조회 때 무효화)
+        cache_key: Optional[ResultKey] = None
+        version = self.collection_version
+        if self.result_cache is not None and version is not None:
+            cache_key = (normalize_text(query), leadership_type, top_k, mode, adaptive)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                self._schedule_index_refresh()
+                return cached
 
         try:
-            logger.info(f"문서 검색: query='{query}', type={leadership_type}, top_k={top_k}")
-
-            # 메타데이터 필터 구성
-            where_filter = None
-            if leadership_type:
-                where_filter = {"leadership_type": leadership_type}
-
-            # 검색 수행
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=top_k,
-                where=where_filter
+            logger.info(f"문서 검색: query='{query}', type={leadership_type}, top_k={top_k}, mode={mode}")
+            self._schedule_index_refresh()
+
+            if mode == "lexical":
+                documents = await self._search_lexical(query, leadership_type, top_k)
+                documents = self.select_relevant(documents, top_k) if adaptive else documents
+                logger.info(f"검색 결과 (어휘): {len(documents)}개 문서")
+                self._set_cached_result(cache_key, version, documents)
+                return documents
+
+            if mode == "vector":
+                documents = await self._search_vector(query, leadership_type, top_k)
+                documents = self.select_relevant(documents, top_k) if adaptive else documents
+                logger.info(f"검색 결과: {len(documents)}개 문서")
+                self._set_cached_result(cache_key, version, documents)
+                return documents
+
+            # hybrid: 양쪽에서 후보를 넉넉히 가져와 RRF로 합침 (벡터 검색이 늦으면 어휘 결과만 사용)
+            depth = max(top_k, settings.HYBRID_CANDIDATES)
+            vector_documents, lexical_documents = await asyncio.gather(
+                self._search_vector(query, leadership_type, depth),
+                self._search_lexical(query, leadership_type, depth),
+                return_exceptions=True
             )
-
-            # 결과 포맷팅
-            documents = []
-            if results and results['ids'] and len(results['ids'][0]) > 0:
-                for i in range(len(results['ids'][0])):
-                    doc = {
-                        "id": results['ids'][0][i],
-                        "content": results['documents'][0][i],
-                        "metadata": results['metadatas'][0][i] if results['metadatas'] else {},
-                        "distance": results['distances'][0][i] if results['distances'] else 0.0
-                    }
-                    documents.append(doc)
-
-            logger.info(f"검색 결과: {len(documents)}개 문서")
+            if isinstance(lexical_documents, BaseException):
+                raise lexical_documents
+            vector_timed_out = isinstance(vector_documents, asyncio.TimeoutError)
+            if vector_timed_out:
+                logger.warning(f"벡터 검색 타임아웃 - 어휘 검색 결과만 사용: query='{query}'")
+                vector_documents = []
+            elif isinstance(vector_documents, BaseException):
+                raise vector_documents
+
+            documents = self.fuse_rankings(vector_documents, lexical_documents, top_k)
+            documents = self.select_relevant(documents, top_k) if adaptive else documents
+            logger.info(
+                f"검색 결과 (hybrid): {len(documents)}개 문서 "
+                f"(벡터 {len(vector_documents)}, 어휘 {len(lexical_documents)})"
+            )
+            # 어휘 결과만으로 대체한 경우는 캐시하지 않음
+            if not vector_timed_out:
+                self._set_cached_result(cache_key, version, documents)
             return documents
 
+        except asyncio.TimeoutError:
+            logger.warning(f"문서 검색 타임아웃 ({settings.CHROMA_TIMEOUT_SECONDS}초): query='{query}'")
+            return []
+
         except Exception as e:
             logger.error(f"문서 검색 실패: {e}", exc_info=True)
             return []
 
+    def _get_cached_result(self, key: ResultKey) -> Optional[List[Dict[str, Any]]]:
+        """캐시된 검색 결과 (현재 컬렉션 버전과 다르면 제거 후 None)"""
+        entry = self.result_cache.get(key)
+        if entry is not None and entry[0] != self.collection_version:
+            self.result_cache.pop(key)
+            self.result_cache_invalidations += 1
+            entry = None
+
+        if entry is None:
+            self.result_cache_misses += 1
+            return None
+
+        self.result_cache_hits += 1
+        # 호출자가 결과 dict를 수정해도 캐시는 유지되도록 복사본 반환
+        return [dict(doc) for doc in entry[1]]
+
+    def _set_cached_result(
+        self,
+        key: Optional[ResultKey],
+        version: Optional[int],
+        documents: List[Dict[str, Any]]
+    ) -> None:
+        """검색 결과를 검색 시작 시점 컬렉션 버전과 함께 저장"""
+        if key is None or version is None:
+            return
+        self.result_cache.set(key, (version, [dict(doc) for doc in documents]))
+
+    async def _search_lexical(
+        self,
+        query: str,
+        leadership_type: Optional[str],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """어휘 인덱스 검색 (BM25 점수 합산은 CPU 작업이므로 Chroma 호출과 같은 스레드 풀에서)"""
+        return await self._call("lexical_search", self.lexical_index.search, query, top_k, leadership_type)
+
+    async def _search_vector(
+        self,
+        query: str,
+        leadership_type: Optional[str],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """벡터 검색 (로컬 인덱스가 있으면 HTTP 없이, 없으면 Chroma)"""
+        documents = await self._search_local(query, leadership_type, top_k)
+        if documents is not None:
+            return self._with_similarity(documents)
+
+        if self._query_batcher is not None and not leadership_type:
+            documents = await self._query_batcher.submit((query, top_k))
+            return self._with_similarity(documents)
+
+        # 검색 수행 (질의 임베딩 + 검색을 한 번의 스레드 호출로)
+        results = await self._call("query", self._query_sync, [query], top_k, leadership_type)
+        return self._with_similarity(results[0])
+
+    async def _query_batch(self, requests: List[QueryRequest]) -> List[Any]:
+        """
+        배치 벡터 검색 (MicroBatcher 핸들러)
+
+        모든 질의를 collection.query 한 번으로 보내고 (n_results는 최대 top_k),
+        결과를 요청별 top_k로 잘라 돌려줍니다. 호출이 실패하면 배치의 모든 요청에 예외를 전달합니다.
+        """
+        queries = [query for query, _ in requests]
+        n_results = max(top_k for _, top_k in requests)
+        self.query_batch_size.observe(len(requests))
+        results = await self._call("query", self._query_sync, queries, n_results, None)
+        return [documents[:top_k] for documents, (_, top_k) in zip(results, requests)]
+
+    def _with_similarity(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        거리 → 코사인 유사도 환산 (RAG_SIMILARITY_THRESHOLD와 비교하는 값)
+
+        l2는 제곱 유클리드 거리이므로 정규화된 임베딩 기준 1 - d/2, cosine/ip는 1 - d입니다.
+        """
+        space = "l2"
+        if self.local_index is not None and self.local_index.ready:
+            space = self.local_index.space
+        elif self.collection is not None:
+            space = collection_space(self.collection)
+
+        for doc in documents:
+            distance = doc.get("distance")
+            if distance is None:
+                doc["similarity"] = None
+            else:
+                doc["similarity"] = 1.0 - distance / 2 if space == "l2" else 1.0 - distance
+        return documents
+
+    def select_relevant(
+        self,
+        documents: List[Dict[str, Any]],
+        top_k: Optional[int] = None,
+        threshold: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        관련 없는 문서 제외 + adaptive top_k
+
+        1. 관련도 기준 미달 문서 제외
+           - 벡터 유사도가 있으면 threshold(RAG_SIMILARITY_THRESHOLD) 이상
+           - 어휘 검색으로 찾은 문서는 질의 용어 일치 비율(term_coverage)이 RAG_LEXICAL_MIN_COVERAGE 이상
+           (둘 중 하나만 만족해도 유지, 둘 다 없는 문서는 관련도를 알 수 없으므로 제외)
+        2. 유사도(similarity) 순서 결과에서 인접 문서 간 가장 큰 하락이
+           첫 점수 대비 RAG_ADAPTIVE_MIN_GAP 이상이면 그 앞까지만 사용 (최소 RAG_MIN_K개)
+           RRF/BM25 점수는 순위나 질의 길이에 따라 척도가 달라 간격 판정에 쓰지 않음 (hybrid/어휘 결과는 생략)
+        3. 최대 top_k개
+
+        Args:
+            documents: 순위순 검색 결과 (search_similar_documents() 형식)
+        """
+        if top_k is None:
+            top_k = settings.RAG_TOP_K
+        if threshold is None:
+            threshold = settings.RAG_SIMILARITY_THRESHOLD
+        self.relevance_candidates += len(documents)
+
+        def relevant(doc: Dict[str, Any]) -> bool:
+            similarity = doc.get("similarity")
+            coverage = doc.get("term_coverage")
+            return (
+                (similarity is not None and similarity >= threshold)
+                or (coverage is not None and coverage >= settings.RAG_LEXICAL_MIN_COVERAGE)
+            )
+
+        kept = [doc for doc in documents if relevant(doc)]
+        self.dropped_threshold += len(documents) - len(kept)
+        kept = kept[:top_k]
+
+        scores = [doc.get("similarity") for doc in kept]
+        fused = any(doc.get("rrf_score") is not None for doc in kept)
+        min_k = max(1, settings.RAG_MIN_K)
+        if len(kept) > min_k and not fused and None not in scores and scores[0] > 0:
+            gaps = [(scores[i] - scores[i + 1]) / scores[0] for i in range(min_k - 1, len(kept) - 1)]
+            largest = max(range(len(gaps)), key=gaps.__getitem__)
+            if gaps[largest] >= settings.RAG_ADAPTIVE_MIN_GAP:
+                cut = min_k + largest
+                self.dropped_gap += len(kept) - cut
+                kept = kept[:cut]
+
+        return kept
+
+    @staticmethod
+    def fuse_rankings(
+        vector_documents: List[Dict[str, Any]],
+        lexical_documents: List[Dict[str, Any]],
+        top_k: int,
+        k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        RRF(reciprocal rank fusion): 문서 점수 = Σ 1 / (k + 순위)
+
+        점수 척도가 다른 거리/BM25를 순위만으로 합칩니다. 동점이면 벡터 순위가 앞선 문서가 먼저입니다.
+        """
+        if k is None:
+            k = settings.HYBRID_RRF_K
+
+        fused: Dict[str, Dict[str, Any]] = {}
+        for ranking in (vector_documents, lexical_documents):
+            for rank, doc in enumerate(ranking, start=1):
+                entry = fused.get(doc["id"])
+                if entry is None:
+                    entry = fused[doc["id"]] = {"distance": None, **doc, "rrf_score": 0.0}
+                else:
+                    entry.update({key: value for key, value in doc.items() if key not in entry})
+                entry["rrf_score"] += 1.0 / (k + rank)
+
+        return sorted(fused.values(), key=lambda doc: -doc["rrf_score"])[:top_k]
+
     async def add_documents(
         self,
         documents: List[str],
@@ -163,19 +635,295 @@ class VectorDBService:
         try:
             logger.info(f"문서 추가 중: {len(documents)}개")
 
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
+            await self._call(
+                "add",
+                self._add_sync,
+                documents,
+                metadatas,
+                ids,
+                timeout=settings.CHROMA_WRITE_TIMEOUT_SECONDS
             )
 
             logger.info(f"✅ {len(documents)}개 문서 추가 완료")
+            self._schedule_index_refresh(force=True)
             return True
 
+        except asyncio.TimeoutError:
+            logger.warning(f"문서 추가 타임아웃 ({settings.CHROMA_WRITE_TIMEOUT_SECONDS}초): {len(documents)}개")
+            return False
+
         except Exception as e:
             logger.error(f"문서 추가 실패: {e}", exc_info=True)
             return False
 
+    async def upsert_documents(
+        self,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        bump_version: bool = True
+    ) -> bool:
+        """
+        문서 추가 또는 갱신 (같은 ID는 덮어씀)
+
+        Args:
+            documents: 문서 내용 리스트
+            metadatas: 메타데이터 리스트
+            ids: 문서 ID 리스트
+            embeddings: 미리 계산한 임베딩 (없으면 이 호출에서 계산)
+            bump_version: 컬렉션 버전 증가 여부 (일괄 적재는 마지막에 한 번만 증가)
+
+        Returns:
+            bool: 성공 여부
+        """
+        if not self.connected:
+            await self.connect()
+
+        try:
+            await self._call(
+                "upsert",
+                self._upsert_sync,
+                documents,
+                metadatas,
+                ids,
+                embeddings,
+                bump_version,
+                timeout=settings.CHROMA_WRITE_TIMEOUT_SECONDS
+            )
+            if bump_version:
+                self._schedule_index_refresh(force=True)
+            return True
+
+        except asyncio.TimeoutError:
+            logger.warning(f"문서 갱신 타임아웃 ({settings.CHROMA_WRITE_TIMEOUT_SECONDS}초): {len(documents)}개")
+            return False
+
+        except Exception as e:
+            logger.error(f"문서 갱신 실패: {e}", exc_info=True)
+            return False
+
+    async def delete_documents(self, ids: List[str], bump_version: bool = True) -> bool:
+        """
+        문서 삭제
+
+        Returns:
+            bool: 성공 여부
+        """
+        if not ids:
+            return True
+        if not self.connected:
+            await self.connect()
+
+        try:
+            await self._call(
+                "delete",
+                self._delete_sync,
+                ids,
+                bump_version,
+                timeout=settings.CHROMA_WRITE_TIMEOUT_SECONDS
+            )
+            if bump_version:
+                self._schedule_index_refresh(force=True)
+            return True
+
+        except asyncio.TimeoutError:
+            logger.warning(f"문서 삭제 타임아웃 ({settings.CHROMA_WRITE_TIMEOUT_SECONDS}초): {len(ids)}개")
+            return False
+
+        except Exception as e:
+            logger.error(f"문서 삭제 실패: {e}", exc_info=True)
+            return False
+
+    async def mark_pending_writes(self) -> bool:
+        """
+        버전 증가 없이 쓰기 시작함을 컬렉션 메타데이터에 기록 (버전/시그니처는 그대로)
+
+        bump_version=False로 쓰다가 프로세스가 중단되어도 표시가 남으므로,
+        다음 실행이 has_pending_writes()로 확인해 버전을 올릴 수 있습니다.
+
+        Returns:
+            bool: 성공 여부
+        """
+        if not self.connected:
+            await self.connect()
+
+        try:
+            await self._call("mark_pending", self._update_metadata_sync, False, True)
+            return True
+
+        except asyncio.TimeoutError:
+            logger.warning(f"미반영 쓰기 표시 타임아웃 ({settings.CHROMA_TIMEOUT_SECONDS}초)")
+            return False
+
+        except Exception as e:
+            logger.error(f"미반영 쓰기 표시 실패: {e}", exc_info=True)
+            return False
+
+    async def has_pending_writes(self) -> bool:
+        """
+        버전에 반영되지 않은 쓰기 표시가 남아 있는지 (조회 실패 시 True로 보고 버전을 올리게 함)
+        """
+        if not self.connected:
+            await self.connect()
+
+        try:
+            metadata = await self._call("pending_writes", self._fresh_metadata_sync)
+            return bool(metadata.get(PENDING_WRITES_KEY))
+
+        except Exception as e:
+            logger.warning(f"미반영 쓰기 표시 조회 실패 - 버전 증가로 처리: {e}")
+            return True
+
+    async def bump_collection_version(self, clear_pending: bool = False) -> bool:
+        """
+        컬렉션 버전 증가 (bump_version=False로 쓴 뒤 한 번에 반영할 때 사용)
+
+        Args:
+            clear_pending: mark_pending_writes() 표시도 함께 제거 (일괄 적재의 쓰기가 모두 끝난 뒤에만)
+
+        Returns:
+            bool: 성공 여부
+        """
+        if not self.connected:
+            await self.connect()
+
+        try:
+            await self._call("bump_version", self._update_metadata_sync, True, False if clear_pending else None)
+            self._schedule_index_refresh(force=True)
+            return True
+
+        except asyncio.TimeoutError:
+            logger.warning(f"컬렉션 버전 증가 타임아웃 ({settings.CHROMA_TIMEOUT_SECONDS}초)")
+            return False
+
+        except Exception as e:
+            logger.error(f"컬렉션 버전 증가 실패: {e}", exc_info=True)
+            return False
+
+    def _query_sync(
+        self,
+        queries: List[str],
+        top_k: int,
+        leadership_type: Optional[str]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        질의 임베딩(캐시) 후 query_embeddings로 검색 (스레드 풀에서 실행)
+
+        Returns:
+            질의별 문서 리스트 (거리 오름차순)
+        """
+        where_filter = {"leadership_type": leadership_type} if leadership_type else None
+        results = self.collection.query(
+            query_embeddings=self.embedder.embed_queries(queries),
+            n_results=top_k,
+            where=where_filter,
+            include=["documents", "metadatas", "distances"]
+        )
+
+        # 결과 포맷팅
+        ids = results.get("ids") or []
+        documents = results.get("documents") or []
+        metadatas = results.get("metadatas") or []
+        distances = results.get("distances") or []
+        formatted = []
+        for row in range(len(queries)):
+            row_ids = ids[row] if row < len(ids) else []
+            # 거리가 없으면 None (완전 일치로 취급하지 않고 select_relevant()에서 제외)
+            row_distances = distances[row] if row < len(distances) and distances[row] else []
+            formatted.append([
+                {
+                    "id": doc_id,
+                    "content": documents[row][i],
+                    "metadata": metadatas[row][i] if metadatas else {},
+                    "distance": row_distances[i] if i < len(row_distances) else None
+                }
+                for i, doc_id in enumerate(row_ids)
+            ])
+        return formatted
+
+    def _add_sync(
+        self,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str]
+    ) -> None:
+        """문서 임베딩 후 추가, 컬렉션 버전 증가 (스레드 풀에서 실행)"""
+        self.collection.add(
+            ids=ids,
+            embeddings=self.embedder.embed_documents(documents),
+            documents=documents,
+            metadatas=metadatas
+        )
+        self._bump_version_sync()
+
+    def _upsert_sync(
+        self,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        embeddings: Optional[List[List[float]]],
+        bump_version: bool
+    ) -> None:
+        """문서 upsert (임베딩이 없으면 계산, 스레드 풀에서 실행)"""
+        self.collection.upsert(
+            ids=ids,
+            embeddings=embeddings if embeddings is not None else self.embedder.embed_documents(documents),
+            documents=documents,
+            metadatas=metadatas
+        )
+        if bump_version:
+            self._bump_version_sync()
+
+    def _delete_sync(self, ids: List[str], bump_version: bool) -> None:
+        """문서 삭제 (스레드 풀에서 실행)"""
+        self.collection.delete(ids=ids)
+        if bump_version:
+            self._bump_version_sync()
+
+    def _bump_version_sync(self) -> None:
+        """컬렉션 메타데이터의 버전 증가 (로컬 인덱스가 변경을 감지하는 기준)"""
+        self._update_metadata_sync(True)
+
+    def _fresh_metadata_sync(self) -> Dict[str, Any]:
+        """다른 프로세스의 변경까지 반영된 최신 컬렉션 메타데이터"""
+        collection = self.client.get_collection(
+            name=settings.CHROMA_COLLECTION_NAME,
+            embedding_function=self.embedder
+        )
+        return dict(collection.metadata or {})
+
+    def _update_metadata_sync(self, bump: bool, pending: Optional[bool] = None) -> None:
+        """
+        컬렉션 메타데이터 갱신 (버전 증가, 미반영 쓰기 표시 설정/제거)
+
+        modify()는 메타데이터 전체를 교체하므로 최신 메타데이터를 다시 읽어 필요한 키만 바꿉니다.
+        hnsw:* 키는 modify()에서 변경할 수 없어 제외하고, 거리 함수는 SPACE_KEY에 따로 보관합니다.
+
+        Args:
+            bump: 버전 증가 여부
+            pending: True면 미반영 쓰기 표시, False면 제거, None이면 그대로
+        """
+        collection = self.client.get_collection(
+            name=settings.CHROMA_COLLECTION_NAME,
+            embedding_function=self.embedder
+        )
+        metadata = {
+            key: value for key, value in (collection.metadata or {}).items()
+            if not key.startswith("hnsw:")
+        }
+        metadata[SPACE_KEY] = collection_space(collection)
+        if pending:
+            metadata[PENDING_WRITES_KEY] = True
+        elif pending is False:
+            metadata.pop(PENDING_WRITES_KEY, None)
+        if bump:
+            metadata[VERSION_KEY] = int(metadata.get(VERSION_KEY, 0)) + 1
+        collection.modify(metadata=metadata)
+        if bump:
+            # 이 워커의 캐시는 바로 무효화 (다른 워커는 다음 버전 확인 때)
+            self.collection_version = metadata[VERSION_KEY]
+
     async def get_collection_count(self) -> int:
         """
         컬렉션 내 문서 수 조회
@@ -187,14 +935,52 @@ class VectorDBService:
             await self.connect()
 
         try:
-            count = self.collection.count()
+            count = await self._call("count", self.collection.count)
             logger.info(f"컬렉션 문서 수: {count}")
             return count
 
+        except asyncio.TimeoutError:
+            logger.warning(f"문서 수 조회 타임아웃 ({settings.CHROMA_TIMEOUT_SECONDS}초)")
+            return 0
+
         except Exception as e:
             logger.error(f"문서 수 조회 실패: {e}")
             return 0
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Chroma 호출 통계 (연산별 지연, 동시 실행 수, 타임아웃)"""
+        return {
+            "connected": self.connected,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "timeouts": self.timeouts,
+            "relevance": {
+                "candidates": self.relevance_candidates,
+                "dropped_threshold": self.dropped_threshold,
+                "dropped_gap": self.dropped_gap,
+            },
+            "retrieval_mode": settings.RETRIEVAL_MODE,
+            "query_batcher": self._query_batcher.get_stats() if self._query_batcher is not None else None,
+            "query_batch_size": self.query_batch_size.summary(),
+            "result_cache": {
+                "collection_version": self.collection_version,
+                "hits": self.result_cache_hits,
+                "misses": self.result_cache_misses,
+                "invalidations": self.result_cache_invalidations,
+                "hit_ratio": (
+                    round(self.result_cache_hits / (self.result_cache_hits + self.result_cache_misses), 4)
+                    if self.result_cache_hits + self.result_cache_misses else 0.0
+                ),
+                "cache": self.result_cache.get_stats(),
+            } if self.result_cache is not None else None,
+            "local_index": self.local_index.get_stats() if self.local_index is not None else None,
+            "lexical_index": self.lexical_index.get_stats() if self.lexical_index is not None else None,
+            "latency_ms": {
+                operation: histogram.summary()
+                for operation, histogram in self.latency_ms.items()
+            },
+        }
+
 
 # 싱글톤 인스턴스
 vector_db_service = VectorDBService()
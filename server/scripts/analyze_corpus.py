@@ -0,0 +1,127 @@
+"""
+대화 말뭉치 일괄 분석 스크립트
+JSONL 입력의 질문을 ConversationAnalyzer로 분석해 JSONL로 출력
+
+입력 (한 줄에 하나):
+    {"question": "팀원과 소통이 어려워요", "conversation_history": [...]}
+
+출력 (입력 순서 유지, 입력 레코드에 analysis/strategy 필드 추가):
+    {"question": "...", "analysis": {...}, "strategy": "open_exploration"}
+
+사용 예:
+    python scripts/analyze_corpus.py -i questions.jsonl -o analyzed.jsonl --workers 8
+"""
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, TextIO
+
+from app.services.conversation_analyzer import conversation_analyzer
+
+logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+logger = logging.getLogger(__name__)
+
+
+def read_records(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """JSONL 레코드 읽기 (빈 줄/깨진 줄/객체가 아닌 줄은 건너뜀)"""
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"{line_no}번째 줄 JSON 파싱 실패 - 건너뜀: {e}")
+            continue
+        if not isinstance(record, dict):
+            logger.warning(f"{line_no}번째 줄이 JSON 객체가 아님 ({type(record).__name__}) - 건너뜀")
+            continue
+        yield record
+
+
+def run(args: argparse.Namespace, source: TextIO, sink: TextIO) -> int:
+    """
+    말뭉치 분석 실행
+
+    Returns:
+        int: 처리한 레코드 수
+    """
+    # 결과는 입력 순서대로 나오므로 읽은 레코드를 큐에 두고 결과와 짝지음
+    # (analyze_many가 앞서 읽는 양은 max(min_parallel, workers * 2 * chunk_size) 정도로 제한됨)
+    unwritten: Deque[Dict[str, Any]] = deque()
+    next_histories: Deque[Any] = deque()
+
+    def questions() -> Iterator[str]:
+        for record in read_records(source):
+            unwritten.append(record)
+            next_histories.append(record.get(args.history_field))
+            yield str(record.get(args.field) or "")
+
+    def histories() -> Iterator[Any]:
+        # zip()이 질문 다음에 히스토리를 꺼내므로 큐에는 항상 하나가 들어 있음
+        while next_histories:
+            yield next_histories.popleft()
+
+    results = conversation_analyzer.analyze_many(
+        questions(),
+        histories(),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        min_parallel=args.min_parallel
+    )
+
+    count = 0
+    started = time.perf_counter()
+    for analysis in results:
+        record = unwritten.popleft()
+        record["analysis"] = analysis
+        record["strategy"] = conversation_analyzer.get_response_strategy(analysis)
+        sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+
+        if count % args.report_every == 0:
+            elapsed = time.perf_counter() - started
+            logger.info(f"{count:,}건 처리 ({count / elapsed:,.0f}건/초)")
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    logger.info(f"✅ 분석 완료: {count:,}건, {elapsed:.1f}초 ({rate:,.0f}건/초)")
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="대화 말뭉치 일괄 분석 (JSONL → JSONL)")
+    parser.add_argument("-i", "--input", default="-", help="입력 JSONL 경로 (기본: 표준 입력)")
+    parser.add_argument("-o", "--output", default="-", help="출력 JSONL 경로 (기본: 표준 출력)")
+    parser.add_argument("--field", default="question", help="질문 필드 이름")
+    parser.add_argument("--history-field", default="conversation_history", help="대화 히스토리 필드 이름")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="프로세스 수 (1이면 단일 프로세스)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="워커에 보낼 작업 단위 크기")
+    parser.add_argument("--min-parallel", type=int, default=50000, help="프로세스 풀을 쓰는 최소 레코드 수")
+    parser.add_argument("--report-every", type=int, default=100000, help="진행 로그 간격 (건)")
+    args = parser.parse_args()
+
+    # 건별 INFO 로그 비활성화
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        run(args, source, sink)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+리더십 유형 분류 벤치마크
+스칼라 classify_leadership_type()과 벡터화 classify_many()의 처리량 비교 및 결과 일치 검증
+
+사용 예:
+    python scripts/benchmark_classifier.py --rows 10000000
+"""
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from app.services.leadership_classifier import (
+    LEADERSHIP_TYPE_NAMES,
+    classify_leadership_type,
+    classify_many,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def make_scores(rows: int, seed: int) -> np.ndarray:
+    """
+    임의 점수 생성 (0-5, 0.01 단위)
+
+    임계값 경계값(4.49/4.5/4.51)과 NaN을 일부 섞어 경계 처리를 함께 검증합니다.
+    """
+    rng = np.random.default_rng(seed)
+    scores = np.round(rng.uniform(0, 5, size=(rows, 3)), 2)
+    edge = rng.random(size=scores.shape) < 0.05
+    scores[edge] = rng.choice([4.49, 4.5, 4.51, np.nan], size=int(edge.sum()))
+    return scores
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="리더십 유형 분류 벤치마크")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="벡터화 분류 행 수")
+    parser.add_argument("--scalar-rows", type=int, default=200_000, help="스칼라 분류/일치 검증 행 수")
+    parser.add_argument("--threshold", type=float, nargs="+", default=None, help="임계값 (1개 또는 3개)")
+    parser.add_argument("--repeat", type=int, default=5, help="벡터화 측정 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    thresholds = None
+    if args.threshold:
+        thresholds = args.threshold[0] if len(args.threshold) == 1 else args.threshold
+
+    scores = make_scores(args.rows, args.seed)
+
+    # 1. 스칼라 기준선
+    sample = scores[:args.scalar_rows].tolist()
+    started = time.perf_counter()
+    expected = [classify_leadership_type(*row, thresholds=thresholds) for row in sample]
+    scalar_elapsed = time.perf_counter() - started
+    scalar_rate = len(sample) / scalar_elapsed
+    logger.info(f"스칼라: {len(sample):,}행, {scalar_elapsed:.3f}초 ({scalar_rate:,.0f}행/초)")
+
+    # 2. 결과 일치 검증
+    type_ids = classify_many(scores[:args.scalar_rows], thresholds)
+    mismatches = sum(
+        1 for type_id, name in zip(type_ids.tolist(), expected)
+        if LEADERSHIP_TYPE_NAMES[type_id] != name
+    )
+    if mismatches:
+        logger.error(f"❌ 불일치 {mismatches:,}건")
+        sys.exit(1)
+    logger.info(f"✅ 스칼라와 일치: {len(expected):,}행")
+
+    # 3. 벡터화 처리량
+    best = float("inf")
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        type_ids = classify_many(scores, thresholds)
+        best = min(best, time.perf_counter() - started)
+    vector_rate = args.rows / best
+    logger.info(
+        f"벡터화: {args.rows:,}행, {best:.3f}초 ({vector_rate:,.0f}행/초, "
+        f"스칼라 대비 {vector_rate / scalar_rate:,.0f}배)"
+    )
+
+    counts = np.bincount(type_ids, minlength=len(LEADERSHIP_TYPE_NAMES))
+    for name, count in zip(LEADERSHIP_TYPE_NAMES, counts.tolist()):
+        logger.info(f"  {name}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
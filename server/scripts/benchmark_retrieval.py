@@ -0,0 +1,142 @@
+"""
+검색 방식 벤치마크
+vector / lexical / hybrid 검색의 recall@k와 질의당 지연 시간 비교
+
+질의 파일 (JSONL, 한 줄에 하나):
+    {"query": "1on1은 얼마나 자주 하나요?", "relevant": ["one_on_one_guide"]}
+
+질의 파일이 없으면 컬렉션 문서에서 임의 구간을 잘라 질의로 쓰고 원문 문서를 정답으로 삼습니다.
+
+사용 예:
+    python scripts/benchmark_retrieval.py --queries eval.jsonl -k 5
+    python scripts/benchmark_retrieval.py --sample 200 -k 5
+"""
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 어휘 인덱스를 만들도록 hybrid로 시작 (모드별 비교는 호출마다 지정)
+os.environ.setdefault("RETRIEVAL_MODE", "hybrid")
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+from app.core.metrics import RollingHistogram
+from app.services.embedding_service import embedding_service
+from app.services.vector_db import vector_db_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODES = ("vector", "lexical", "hybrid")
+
+
+def load_queries(path: str) -> List[Tuple[str, Set[str]]]:
+    """질의 파일 읽기 (relevant는 리스트 또는 단일 ID)"""
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            relevant = record.get("relevant") or []
+            if isinstance(relevant, str):
+                relevant = [relevant]
+            queries.append((record["query"], set(relevant)))
+    return queries
+
+
+async def sample_queries(count: int, length: int, seed: int) -> List[Tuple[str, Set[str]]]:
+    """컬렉션 문서에서 length자 구간을 잘라 (질의, {원문 ID}) 생성"""
+    rng = random.Random(seed)
+    current = await asyncio.to_thread(vector_db_service.collection.get, include=["documents"])
+    pairs = [
+        (doc_id, document) for doc_id, document in zip(current["ids"], current["documents"])
+        if document and len(document) >= length
+    ]
+
+    queries = []
+    for doc_id, document in rng.sample(pairs, min(count, len(pairs))):
+        start = rng.randrange(0, len(document) - length + 1)
+        queries.append((document[start:start + length], {doc_id}))
+    return queries
+
+
+async def evaluate(
+    mode: str,
+    queries: List[Tuple[str, Set[str]]],
+    k: int,
+    adaptive: bool
+) -> Dict[str, Any]:
+    """모드 하나의 평균 recall@k, 평균 반환 문서 수, 지연 분포"""
+    latency_ms = RollingHistogram(window=max(1, len(queries)))
+    recall_total = 0.0
+    returned_total = 0
+
+    for query, relevant in queries:
+        started = time.perf_counter()
+        documents = await vector_db_service.search_similar_documents(
+            query, top_k=k, mode=mode, adaptive=adaptive
+        )
+        latency_ms.observe((time.perf_counter() - started) * 1000)
+
+        retrieved = {doc["id"] for doc in documents}
+        returned_total += len(documents)
+        recall_total += len(retrieved & relevant) / len(relevant) if relevant else 0.0
+
+    return {
+        "recall": recall_total / max(1, len(queries)),
+        "returned": returned_total / max(1, len(queries)),
+        "latency_ms": latency_ms.summary(),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="vector / lexical / hybrid 검색 벤치마크")
+    parser.add_argument("--queries", default=None, help="질의 JSONL 경로 (없으면 컬렉션에서 생성)")
+    parser.add_argument("--sample", type=int, default=100, help="생성할 질의 수")
+    parser.add_argument("--sample-length", type=int, default=30, help="생성 질의 길이 (글자)")
+    parser.add_argument("-k", "--top-k", type=int, default=5, help="recall@k의 k")
+    parser.add_argument("--adaptive", action="store_true", help="유사도 임계값/adaptive top_k 적용 (기본: 고정 k)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # 건별 검색 INFO 로그 비활성화
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    await vector_db_service.connect()
+    if vector_db_service.lexical_index is None or not vector_db_service.lexical_index.ready:
+        logger.error("❌ 어휘 인덱스를 만들지 못했습니다 (RETRIEVAL_MODE / Chroma 연결 확인)")
+        sys.exit(1)
+
+    if args.queries:
+        queries = load_queries(args.queries)
+    else:
+        queries = await sample_queries(args.sample, args.sample_length, args.seed)
+    if not queries:
+        logger.error("❌ 평가할 질의가 없습니다.")
+        sys.exit(1)
+
+    # 질의 임베딩을 미리 계산해 모드 간 지연 비교에서 임베딩 시간을 제외
+    await asyncio.to_thread(embedding_service.embed_queries, [query for query, _ in queries])
+    logger.info(f"질의 {len(queries)}개, k={args.top_k} (질의 임베딩은 사전 계산)")
+
+    for mode in MODES:
+        result = await evaluate(mode, queries, args.top_k, args.adaptive)
+        latency = result["latency_ms"]
+        logger.info(
+            f"{mode:>7}: recall@{args.top_k} {result['recall']:.3f}, 평균 {result['returned']:.1f}개 반환, "
+            f"지연 p50 {latency['p50']:.3f}ms / p90 {latency['p90']:.3f}ms / p99 {latency['p99']:.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
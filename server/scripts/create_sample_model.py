@@ -13,6 +13,9 @@ import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 import logging
 
+from app.services.leadership_classifier import classify_many
+from app.services.ml_model import FEATURE_SCHEMA
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -22,19 +25,19 @@ def create_dummy_model():
     개발용 더미 ML 모델 생성
 
     실제 모델은 다음과 같은 특성을 가져야 합니다:
-    - 입력: 리더십 진단 점수 (예: extraversion, thinking, judging 등)
-    - 출력: 리더십 유형 (ENTJ, INTJ, ENFJ 등)
+    - 입력: 리더십 진단 점수 (FEATURE_SCHEMA 순서: 공유및참여, 상호작용, 성장지향)
+    - 출력: 리더십 유형 ID (LEADERSHIP_TYPE_NAMES 인덱스)
     """
     try:
         logger.info("샘플 ML 모델 생성 중...")
 
         # 샘플 학습 데이터 생성
-        # 특성: [extraversion, thinking, judging, sensing]
-        # 레이블: 0=ENTJ, 1=INTJ, 2=ENFJ, 3=INFJ
+        # 특성: FEATURE_SCHEMA 순서의 진단 점수 (1-5)
+        # 레이블: 규칙 기반 분류 결과 (유형 ID)
         np.random.seed(42)
 
-        X_train = np.random.rand(100, 4) * 100  # 100개 샘플, 4개 특성
-        y_train = np.random.randint(0, 4, 100)  # 4개 클래스
+        X_train = np.round(np.random.uniform(1, 5, size=(2000, len(FEATURE_SCHEMA))), 1)
+        y_train = classify_many(X_train)
 
         # RandomForest 모델 학습
         model = RandomForestClassifier(n_estimators=10, random_state=42)
@@ -53,7 +56,7 @@ def create_dummy_model():
         logger.info("모델 검증 중...")
         loaded_model = joblib.load(model_path)
 
-        test_input = np.array([[80, 75, 70, 60]])  # 샘플 입력
+        test_input = np.array([[3.5, 3.8, 4.8]])  # 샘플 입력 (개별비전형)
         prediction = loaded_model.predict(test_input)
         probabilities = loaded_model.predict_proba(test_input)
 
@@ -0,0 +1,325 @@
+"""
+임상 문서 일괄 적재 스크립트
+JSONL/CSV 문서를 청킹 → 임베딩 → ChromaDB upsert 하고, 청크별 내용 해시를 vector_documents 테이블에 기록
+
+- 내용 해시가 바뀐 청크만 임베딩/upsert 하므로 같은 입력으로 다시 실행하면 아무것도 쓰지 않음
+- 해시는 Chroma upsert가 성공한 뒤에 기록하므로 중단 후 다시 실행하면 남은 청크부터 이어서 처리
+- 문서가 짧아져 청크 수가 줄면 남는 이전 청크는 삭제
+- 컬렉션 버전은 마지막에 한 번만 증가 (로컬 인덱스/검색 결과 캐시 갱신 기준)
+  첫 쓰기 전에 컬렉션 메타데이터에 미반영 쓰기 표시를 남기므로, 중단된 실행의 쓰기도
+  다음 실행이 끝날 때 버전에 반영됨 (다시 실행한 입력이 모두 변경 없음이어도)
+- 기존 DB에서는 먼저 scripts/init_database.py를 실행해 vector_documents의 새 컬럼을 추가
+
+입력 (JSONL은 한 줄에 하나, CSV는 헤더 필요):
+    {"id": "entj_strengths", "content": "...", "leadership_type": "안정형", "source": "..."}
+
+사용 예:
+    python scripts/ingest_documents.py -i corpus.jsonl --batch-size 64 --workers 4
+"""
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Set
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.session import AsyncSessionLocal, async_engine
+from app.models.database import VectorDocument
+from app.services.embedding_service import embedding_service
+from app.services.text_chunker import chunk_text
+from app.services.vector_db import vector_db_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def read_records(path: str, input_format: str) -> Iterator[Dict[str, Any]]:
+    """JSONL/CSV 레코드 읽기 (JSONL의 깨진 줄은 건너뜀)"""
+    if input_format == "auto":
+        input_format = "csv" if path.lower().endswith(".csv") else "jsonl"
+
+    with open(path, encoding="utf-8", newline="") as f:
+        if input_format == "csv":
+            yield from csv.DictReader(f)
+            return
+
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"{line_no}번째 줄 JSON 파싱 실패 - 건너뜀: {e}")
+
+
+def content_hash(content: str, metadata: Dict[str, Any]) -> str:
+    """청크 내용 + 메타데이터 + 임베딩 모델 해시 (모델이 바뀌면 다시 임베딩)"""
+    payload = json.dumps(
+        {"model": embedding_service.model_name, "content": content, "metadata": metadata},
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_chunks(record: Dict[str, Any], args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    레코드 → 청크 리스트
+
+    청크가 하나면 원문 ID를 그대로, 여러 개면 "{원문 ID}#{순번}"을 문서 ID로 씁니다.
+    Chroma 메타데이터는 스칼라 값만 허용하므로 나머지 필드 중 스칼라만 옮깁니다.
+    """
+    source_id = str(record.get(args.id_field) or "").strip()
+    text = str(record.get(args.text_field) or "")
+    if not source_id or not text.strip():
+        return []
+
+    base_metadata = {
+        key: value for key, value in record.items()
+        if key not in (args.id_field, args.text_field)
+        and isinstance(value, (str, int, float, bool)) and value != ""
+    }
+    base_metadata["source_id"] = source_id
+
+    pieces = chunk_text(text, args.chunk_tokens, args.overlap_tokens)
+    chunks = []
+    for index, piece in enumerate(pieces):
+        metadata = dict(base_metadata, chunk_index=index, chunk_count=len(pieces))
+        chunks.append({
+            "id": source_id if len(pieces) == 1 else f"{source_id}#{index}",
+            "source_id": source_id,
+            "content": piece,
+            "metadata": metadata,
+            "hash": content_hash(piece, metadata),
+        })
+    return chunks
+
+
+class Ingestor:
+    """배치 단위 적재 (최대 workers개 배치를 동시에 처리)"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="embed")
+        self.slots = asyncio.Semaphore(args.workers)
+        self.tasks: Set[asyncio.Task] = set()
+        self.failed = False
+        self.marked = False  # 이번 실행에서 미반영 쓰기 표시를 남겼는지
+        self._mark_lock = asyncio.Lock()
+
+        self.sources = 0
+        self.chunks = 0
+        self.upserted = 0
+        self.unchanged = 0
+        self.deleted = 0
+        self.started = time.perf_counter()
+        self.reported_at = self.started
+
+    async def submit(self, batch: List[Dict[str, Any]], sources: int) -> None:
+        """배치 처리 태스크 시작 (동시 처리 수가 가득 차면 대기)"""
+        await self.slots.acquire()
+        task = asyncio.create_task(self._process(batch, sources))
+        self.tasks.add(task)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self.tasks.discard(task)
+        self.slots.release()
+        if not task.cancelled() and task.exception() is not None:
+            self.failed = True
+            logger.error(f"❌ 배치 처리 실패: {task.exception()}")
+
+    async def _process(self, batch: List[Dict[str, Any]], sources: int) -> None:
+        """해시 비교 → 변경분 임베딩 → Chroma upsert/삭제 → 해시 기록"""
+        ids = [chunk["id"] for chunk in batch]
+        source_ids = {chunk["source_id"] for chunk in batch}
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(VectorDocument.document_id, VectorDocument.content_hash)
+                .where(VectorDocument.document_id.in_(ids))
+            )
+            known = dict(result.all())
+            result = await session.execute(
+                select(VectorDocument.document_id)
+                .where(VectorDocument.source_id.in_(source_ids))
+                .where(VectorDocument.document_id.notin_(ids))
+            )
+            stale = list(result.scalars().all())
+
+        changed = [chunk for chunk in batch if known.get(chunk["id"]) != chunk["hash"]]
+
+        if changed or stale:
+            await self._mark_pending()
+
+        if changed:
+            texts = [chunk["content"] for chunk in changed]
+            embeddings = await asyncio.get_running_loop().run_in_executor(
+                self.executor, embedding_service.embed_documents, texts
+            )
+            ok = await vector_db_service.upsert_documents(
+                documents=texts,
+                metadatas=[dict(chunk["metadata"], content_hash=chunk["hash"]) for chunk in changed],
+                ids=[chunk["id"] for chunk in changed],
+                embeddings=embeddings,
+                bump_version=False
+            )
+            if not ok:
+                raise RuntimeError(f"Chroma upsert 실패 ({len(changed)}개 청크)")
+
+        if stale and not await vector_db_service.delete_documents(stale, bump_version=False):
+            raise RuntimeError(f"Chroma 삭제 실패 ({len(stale)}개 청크)")
+
+        if changed or stale:
+            async with AsyncSessionLocal() as session:
+                if changed:
+                    statement = insert(VectorDocument).values([
+                        {
+                            "document_id": chunk["id"],
+                            "source_id": chunk["source_id"],
+                            "leadership_type": chunk["metadata"].get("leadership_type"),
+                            "content": chunk["content"],
+                            "content_hash": chunk["hash"],
+                            "meta": chunk["metadata"],
+                            "embedding_model": embedding_service.model_name,
+                        }
+                        for chunk in changed
+                    ])
+                    await session.execute(statement.on_conflict_do_update(
+                        index_elements=[VectorDocument.document_id],
+                        set_={
+                            **{
+                                column: statement.excluded[column]
+                                for column in (
+                                    "source_id", "leadership_type", "content",
+                                    "content_hash", "metadata", "embedding_model"
+                                )
+                            },
+                            # ON CONFLICT 갱신에는 onupdate가 적용되지 않음
+                            "updated_at": func.now(),
+                        }
+                    ))
+                if stale:
+                    await session.execute(
+                        delete(VectorDocument).where(VectorDocument.document_id.in_(stale))
+                    )
+                await session.commit()
+
+        self.sources += sources
+        self.chunks += len(batch)
+        self.upserted += len(changed)
+        self.unchanged += len(batch) - len(changed)
+        self.deleted += len(stale)
+        self._report()
+
+    async def _mark_pending(self) -> None:
+        """Chroma에 처음 쓰기 전에 미반영 쓰기 표시 (실행당 한 번)"""
+        async with self._mark_lock:
+            if self.marked:
+                return
+            if not await vector_db_service.mark_pending_writes():
+                raise RuntimeError("미반영 쓰기 표시 실패 - Chroma에 쓰지 않고 중단")
+            self.marked = True
+
+    def _report(self, final: bool = False) -> None:
+        """진행 로그 (report_every초 간격)"""
+        now = time.perf_counter()
+        if not final and now - self.reported_at < self.args.report_every:
+            return
+        self.reported_at = now
+
+        elapsed = max(now - self.started, 1e-9)
+        logger.info(
+            f"{'✅ 적재 완료' if final else '진행'}: 문서 {self.sources:,}개, 청크 {self.chunks:,}개 "
+            f"(upsert {self.upserted:,}, 변경 없음 {self.unchanged:,}, 삭제 {self.deleted:,}), "
+            f"{elapsed:.1f}초 ({self.sources / elapsed:,.1f} docs/s, {self.chunks / elapsed:,.1f} chunks/s)"
+        )
+
+    async def run(self) -> bool:
+        """
+        적재 실행
+
+        한 문서의 청크는 같은 배치에 넣어 이전 청크 삭제 판단이 정확하도록 합니다.
+
+        Returns:
+            bool: 전체 성공 여부
+        """
+        batch: List[Dict[str, Any]] = []
+        sources = 0
+        seen: Set[str] = set()
+
+        for record in read_records(self.args.input, self.args.format):
+            if self.failed:
+                break
+
+            chunks = build_chunks(record, self.args)
+            if not chunks:
+                continue
+            if chunks[0]["source_id"] in seen:
+                logger.warning(f"중복 문서 ID - 건너뜀: {chunks[0]['source_id']}")
+                continue
+            seen.add(chunks[0]["source_id"])
+
+            batch.extend(chunks)
+            sources += 1
+            if len(batch) >= self.args.batch_size:
+                await self.submit(batch, sources)
+                batch, sources = [], 0
+
+        if batch and not self.failed:
+            await self.submit(batch, sources)
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.executor.shutdown()
+
+        # 이번 실행의 쓰기는 모두 끝났으므로 이전에 중단된 실행의 표시까지 함께 반영
+        if self.marked or await vector_db_service.has_pending_writes():
+            if not await vector_db_service.bump_collection_version(clear_pending=True):
+                logger.error("❌ 컬렉션 버전 증가 실패 - 다시 실행하면 버전 증가를 재시도합니다.")
+                self.failed = True
+
+        self._report(final=True)
+        if self.failed:
+            logger.error("❌ 일부 배치 실패 - 같은 명령으로 다시 실행하면 남은 청크부터 처리합니다.")
+        return not self.failed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="임상 문서 일괄 적재 (JSONL/CSV → ChromaDB)")
+    parser.add_argument("-i", "--input", required=True, help="입력 파일 경로 (.jsonl / .csv)")
+    parser.add_argument("--format", choices=["auto", "jsonl", "csv"], default="auto", help="입력 형식")
+    parser.add_argument("--id-field", default="id", help="문서 ID 필드 이름")
+    parser.add_argument("--text-field", default="content", help="본문 필드 이름")
+    parser.add_argument("--chunk-tokens", type=int, default=256, help="청크당 최대 토큰 수")
+    parser.add_argument("--overlap-tokens", type=int, default=32, help="인접 청크 겹침 토큰 수")
+    parser.add_argument("--batch-size", type=int, default=64, help="임베딩/upsert 배치 크기 (청크)")
+    parser.add_argument("--workers", type=int, default=4, help="동시 처리 배치 수 (임베딩 스레드 수)")
+    parser.add_argument("--report-every", type=float, default=10.0, help="진행 로그 간격 (초)")
+    args = parser.parse_args()
+
+    # 검색/추가 건별 INFO 로그 비활성화
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    try:
+        ok = await Ingestor(args).run()
+    finally:
+        await async_engine.dispose()
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
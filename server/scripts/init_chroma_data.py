@@ -13,6 +13,8 @@ import chromadb
 from chromadb.config import Settings as ChromaSettings
 import logging
 
+from app.services.embedding_service import embedding_service
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -152,10 +154,11 @@ async def init_chromadb():
         except Exception:
             pass
 
-        # 새 컬렉션 생성
+        # 새 컬렉션 생성 (서버와 같은 임베딩 함수 사용)
         collection = client.create_collection(
             name=collection_name,
-            metadata={"description": "리더십 임상 데이터"}
+            metadata={"description": "리더십 임상 데이터"},
+            embedding_function=embedding_service
         )
         logger.info(f"새 컬렉션 '{collection_name}' 생성")
 
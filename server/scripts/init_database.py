@@ -18,6 +18,16 @@ from app.models.database import Base
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# create_all()은 이미 있는 테이블을 변경하지 않으므로, 테이블 생성 후 추가된 컬럼은 여기서 보강
+# (모두 IF NOT EXISTS라 여러 번 실행해도 안전)
+SCHEMA_UPGRADES = [
+    "ALTER TABLE reports ADD COLUMN IF NOT EXISTS sections JSON",
+    "ALTER TABLE vector_documents ADD COLUMN IF NOT EXISTS source_id VARCHAR(100)",
+    "ALTER TABLE vector_documents ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+    "ALTER TABLE vector_documents ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()",
+    "CREATE INDEX IF NOT EXISTS ix_vector_documents_source_id ON vector_documents (source_id)",
+]
+
 
 async def init_database():
     """데이터베이스 초기화"""
@@ -39,6 +49,12 @@ async def init_database():
         logger.info("테이블 생성 중...")
         await create_tables_async()
 
+        # 기존 테이블에 새 컬럼 추가
+        logger.info("스키마 업그레이드 적용 중...")
+        async with async_engine.begin() as conn:
+            for statement in SCHEMA_UPGRADES:
+                await conn.execute(text(statement))
+
         # 테이블 확인
         async with async_engine.connect() as conn:
             result = await conn.execute(text("""
@@ -0,0 +1,430 @@
+"""
+최적화 경로 동등성 테스트
+- 키워드 오토마톤 vs 부분 문자열 검색
+- 참여도 증분 계산 vs 전체 재계산
+- 일괄 분석: 단일 프로세스 vs 프로세스 풀
+- 리더십 유형: classify_many vs classify_leadership_type
+- 로컬 벡터 인덱스: 증분 동기화 vs 전체 재구성, 저장 후 다른 워커에서 로드
+- 어휘 인덱스: 증분 재색인 vs 새로 색인
+- 검색 결과 캐시: 캐시 적중 vs 캐시 없는 검색, 컬렉션 버전 변경 시 무효화
+"""
+import asyncio
+import multiprocessing
+import random
+import re
+import sys
+import os
+import time
+
+import numpy as np
+
+# 서버 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'server'))
+
+from app.core.cache import TTLCache
+from app.services.conversation_analyzer import ConversationAnalyzer, ConversationStage, OffTopicCategory
+from app.services.engagement_tracker import EngagementTracker
+from app.services.keyword_matcher import KeywordMatcher, keyword_matcher
+from app.services.leadership_classifier import LEADERSHIP_TYPE_NAMES, classify_leadership_type, classify_many
+from app.services.lexical_index import LexicalIndex
+from app.services.local_index import SPACE_KEY, VERSION_KEY, LocalVectorIndex
+from app.services.vector_db import VectorDBService
+
+
+def random_texts(keywords, count: int, seed: int = 7):
+    """키워드 조각과 임의 문자를 섞은 텍스트 생성 (키워드 경계 근처 매치가 자주 생기도록)"""
+    rng = random.Random(seed)
+    alphabet = "가나다팀원리더 ?.abc1"
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(0, 6)):
+            if rng.random() < 0.5:
+                keyword = rng.choice(keywords)
+                # 키워드 일부만 넣어 부분 일치도 섞음
+                parts.append(keyword if rng.random() < 0.7 else keyword[:rng.randint(0, len(keyword))])
+            else:
+                parts.append("".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4))))
+        texts.append("".join(parts))
+    return texts
+
+
+def _analyzer_groups(analyzer: ConversationAnalyzer):
+    """(마스크, 키워드 목록) 쌍"""
+    groups = [
+        (analyzer._leadership_mask, analyzer.leadership_keywords),
+        (analyzer._greeting_mask, analyzer.greeting_patterns),
+        (analyzer._greeting_time_mask, analyzer.greeting_time_words),
+        (analyzer._wellbeing_mask, analyzer.wellbeing_phrases),
+        (analyzer._request_mask, analyzer.request_markers),
+    ]
+    groups += [(mask, analyzer.offtopic_keywords[category]) for category, mask in analyzer._offtopic_masks]
+    groups += [(mask, analyzer.emotion_keywords[name]) for name, mask in analyzer._emotion_masks.items()]
+    return groups
+
+
+def test_keyword_groups_match_substring_search():
+    """그룹 적중 여부가 any(keyword in text)와 같은지"""
+    analyzer = ConversationAnalyzer()
+    groups = _analyzer_groups(analyzer)
+    keywords = [keyword for _, group in groups for keyword in group]
+
+    for text in random_texts(keywords, 2000):
+        hits = keyword_matcher.scan(text)
+        for mask, group in groups:
+            assert keyword_matcher.any_hit(hits, mask) == any(keyword in text for keyword in group), text
+
+
+def test_scan_joined_matches_scan_of_joined_text():
+    """메시지별 스캔 + 경계 창 스캔이 이어 붙인 텍스트 스캔과 같은지"""
+    analyzer = ConversationAnalyzer()
+    keywords = [keyword for _, group in _analyzer_groups(analyzer) for keyword in group]
+    texts = random_texts(keywords, 1500, seed=11)
+
+    for start in range(0, len(texts) - 5, 5):
+        messages = texts[start:start + 5]
+        assert keyword_matcher.scan_joined(messages) == keyword_matcher.scan(" ".join(messages))
+
+
+def test_register_replaces_group_mask():
+    """같은 그룹을 다시 등록하면 이전 키워드는 더 이상 적중하지 않음"""
+    matcher = KeywordMatcher()
+    matcher.register("group", ["날씨", "비"])
+    mask = matcher.register("group", ["눈"])
+
+    assert matcher.mask("group") == mask
+    assert not matcher.any_hit(matcher.scan("날씨가 좋고 비가 와요"), mask)
+    assert matcher.any_hit(matcher.scan("눈이 와요"), mask)
+
+
+def test_analyzer_picks_up_keyword_changes():
+    """생성 후 키워드 목록을 바꾸면 다음 분석부터 반영"""
+    analyzer = ConversationAnalyzer()
+    assert analyzer.analyze("날씨 좋네요")["offtopic_category"] == "날씨"
+
+    analyzer.offtopic_keywords[OffTopicCategory.WEATHER] = ["비가"]
+    assert analyzer.analyze("날씨 좋네요")["offtopic_category"] is None
+    assert analyzer.analyze("비가 오네요")["offtopic_category"] == "날씨"
+
+    # 다른 인스턴스(기본 키워드)에는 영향 없음
+    assert ConversationAnalyzer().analyze("날씨 좋네요")["offtopic_category"] == "날씨"
+
+
+def test_analyze_many_workers_match_serial():
+    """키워드를 바꾼 분석기로 단일 프로세스와 프로세스 풀(fork/spawn) 결과가 같은지"""
+    analyzer = ConversationAnalyzer()
+    analyzer.offtopic_keywords[OffTopicCategory.WEATHER] = ["비가", "태풍"]
+    analyzer.offtopic_keywords[OffTopicCategory.DAILY] += ["골프", "낚시"]
+    analyzer.emotion_keywords["urgent"] = ["급해요", "마감"]
+    analyzer.leadership_keywords.remove("팀")
+
+    keywords = [keyword for _, group in _analyzer_groups(analyzer) for keyword in group]
+    keywords += ["날씨", "오늘", "팀"]
+    questions = random_texts(keywords, 600, seed=5)
+    histories = [[{"role": "user", "content": "네"}] * (i % 7) for i in range(len(questions))]
+
+    serial = list(analyzer.analyze_many(questions, histories))
+    assert any(result["offtopic_category"] == "날씨" for result in serial)
+    assert any(result["stage"] == ConversationStage.DEEP_COACHING for result in serial)
+
+    for method in ("fork", "spawn"):
+        parallel = analyzer.analyze_many(
+            questions, histories, workers=2, chunk_size=50, min_parallel=0,
+            mp_context=multiprocessing.get_context(method)
+        )
+        assert list(parallel) == serial, method
+
+
+def test_analyze_many_small_input_stays_serial():
+    """min_parallel 미만 입력은 프로세스 풀을 만들지 않음"""
+    analyzer = ConversationAnalyzer()
+    questions = ["팀원과 갈등이 있어요", "오늘 날씨 어때요?"] * 10
+
+    class NoPool:
+        def Process(self, *args, **kwargs):
+            raise AssertionError("프로세스 풀을 만들면 안 됨")
+
+    results = analyzer.analyze_many(questions, workers=4, chunk_size=3, min_parallel=100, mp_context=NoPool())
+    assert list(results) == list(analyzer.analyze_many(questions))
+
+
+def _reference_engagement(tracker: EngagementTracker, user_messages):
+    """히스토리 전체를 이어 붙여 부분 문자열/정규식으로 계산한 참여도 (최적화 이전 방식)"""
+    if len(user_messages) < 2:
+        return tracker._default_result()
+    combined_text = " ".join(user_messages)
+
+    def weighted(category):
+        table, weights = EngagementTracker.SCORE_TABLES[category]
+        return sum(
+            weight * sum(1 for keyword in table[level] if keyword in combined_text)
+            for level, weight in weights.items()
+        )
+
+    depth = tracker._calculate_conversation_depth(len(user_messages), sum(len(m) for m in user_messages))
+    emotional = min(weighted("emotional"), 25)
+    action = min(weighted("action"), 25)
+    quality = sum(1 for pattern in EngagementTracker.QUALITY_PATTERNS if re.search(pattern, combined_text))
+    advanced = min(weighted("advanced") + 5 * quality, 20)
+    total = depth + emotional + action + advanced
+    return {
+        "total_score": total,
+        "conversation_depth": depth,
+        "emotional_investment": emotional,
+        "action_intent": action,
+        "advanced_topics": advanced,
+        "should_suggest_consultation": total >= 40,
+    }
+
+
+def test_incremental_engagement_matches_full_recompute():
+    """턴마다 증분 결과 == 배치 결과 == 참조 구현 결과"""
+    tracker = EngagementTracker()
+    keywords = [
+        keyword
+        for table, _ in EngagementTracker.SCORE_TABLES.values()
+        for group in table.values()
+        for keyword in group
+    ] + ["처음에는", "지금은", "\n", "3명", "2년", "예를 들어", "사실은"]
+    rng = random.Random(3)
+
+    for conversation in range(60):
+        messages = random_texts(keywords, 8, seed=conversation)
+        history = []
+        for message in messages:
+            history.append({"role": "user", "content": message})
+            history.append({"role": "assistant", "content": "네"})
+            user_messages = [m["content"] for m in history if m["role"] == "user"]
+
+            incremental = tracker.analyze_engagement("user", history, report_id=f"r{conversation}")
+            batch = tracker.analyze_engagement("user", history)
+            assert incremental == batch
+            assert batch == _reference_engagement(tracker, user_messages)
+
+        # 히스토리가 잘리거나 수정되면 처음부터 다시 계산
+        edited = history[:rng.randint(0, len(history))]
+        if edited and edited[-1]["role"] == "user":
+            edited[-1] = {"role": "user", "content": edited[-1]["content"] + " 사실은"}
+        assert tracker.analyze_engagement("user", edited, report_id=f"r{conversation}") == \
+            tracker.analyze_engagement("user", edited)
+
+
+def test_classify_many_matches_scalar():
+    """행마다 classify_many 결과가 classify_leadership_type과 같은지 (경계값, NaN, 차원별 임계값 포함)"""
+    rng = np.random.default_rng(0)
+    boundary = np.array([0.0, 3.0, 4.4999, 4.5, 4.5001, 5.0, np.nan])
+    scores = np.concatenate([
+        rng.uniform(0, 5, size=(3000, 3)),
+        rng.choice(boundary, size=(3000, 3)),
+    ])
+
+    for thresholds in (None, 4.0, (4.5, 3.0, 4.4999)):
+        for batch in (scores, scores.astype(np.float32), rng.integers(0, 6, size=(500, 3))):
+            type_ids = classify_many(batch, thresholds)
+            expected = [
+                classify_leadership_type(*(float(value) for value in row), thresholds=thresholds)
+                for row in batch
+            ]
+            assert [LEADERSHIP_TYPE_NAMES[type_id] for type_id in type_ids] == expected
+
+
+class FakeCollection:
+    """로컬 인덱스 동기화에 필요한 만큼만 흉내 낸 Chroma 컬렉션"""
+
+    def __init__(self, space: str, rows: int, seed: int = 0):
+        self.id = "collection-1"
+        self.metadata = {"hnsw:space": space, VERSION_KEY: 1}
+        self.rng = np.random.default_rng(seed)
+        self.items = {}
+        for i in range(rows):
+            self.upsert(f"doc-{i}", f"문서 {i}", ["참여코칭형", "개별비전형", "과도기형"][i % 3])
+        self.fetched_ids = []
+
+    def upsert(self, doc_id: str, document: str, leadership_type: str) -> None:
+        embedding = self.rng.normal(size=8).astype(np.float32).tolist()
+        self.items[doc_id] = (document, {"leadership_type": leadership_type}, embedding)
+
+    def bump(self) -> None:
+        # modify()처럼 hnsw:* 키는 빠지고 보관 키만 남은 메타데이터
+        space = self.metadata.get("hnsw:space") or self.metadata.get(SPACE_KEY)
+        self.metadata = {SPACE_KEY: space, VERSION_KEY: self.metadata[VERSION_KEY] + 1}
+
+    def count(self) -> int:
+        return len(self.items)
+
+    def get(self, ids=None, include=()):
+        ids = list(self.items) if ids is None else ids
+        if "embeddings" in include:
+            self.fetched_ids.extend(ids)
+        return {
+            "ids": ids,
+            "documents": [self.items[doc_id][0] for doc_id in ids],
+            "metadatas": [self.items[doc_id][1] for doc_id in ids],
+            "embeddings": [self.items[doc_id][2] for doc_id in ids],
+        }
+
+
+def _brute_force(collection: FakeCollection, space: str, query, top_k: int, leadership_type=None):
+    """전체 문서와의 거리를 하나씩 계산한 참조 결과 (ID, 거리)"""
+    query = np.asarray(query, dtype=np.float64)
+    scored = []
+    for doc_id, (_, metadata, embedding) in collection.items.items():
+        if leadership_type and metadata["leadership_type"] != leadership_type:
+            continue
+        vector = np.asarray(embedding, dtype=np.float64)
+        if space == "cosine":
+            distance = 1 - vector @ query / (np.linalg.norm(vector) * np.linalg.norm(query))
+        elif space == "ip":
+            distance = 1 - vector @ query
+        else:
+            distance = float(((vector - query) ** 2).sum())
+        scored.append((distance, doc_id))
+    scored.sort()
+    return scored[:top_k]
+
+
+def _assert_same_results(index: LocalVectorIndex, collection: FakeCollection, space: str, seed: int):
+    rng = np.random.default_rng(seed)
+    for leadership_type in (None, "개별비전형", "없는유형"):
+        query = rng.normal(size=8).tolist()
+        results = index.search(query, 5, leadership_type)
+        expected = _brute_force(collection, space, query, 5, leadership_type)
+        assert [result["id"] for result in results] == [doc_id for _, doc_id in expected]
+        assert np.allclose([result["distance"] for result in results], [d for d, _ in expected], atol=1e-4)
+
+
+def test_local_index_incremental_sync_and_snapshot_load(tmp_path):
+    """증분 동기화 결과가 전체 재구성/브루트포스와 같고, 다른 워커가 저장된 스냅샷을 그대로 여는지"""
+    for space in ("cosine", "l2", "ip"):
+        directory = tmp_path / space
+        collection = FakeCollection(space, rows=40, seed=1)
+        index = LocalVectorIndex(str(directory), "docs")
+        assert index.sync(collection)
+        _assert_same_results(index, collection, space, seed=2)
+
+        # 수정 + 추가 + 삭제 후 버전 증가 (hnsw:space가 빠진 메타데이터)
+        collection.upsert("doc-3", "수정된 문서 3", "참여코칭형")
+        collection.upsert("doc-new", "새 문서", "개별비전형")
+        del collection.items["doc-7"]
+        collection.bump()
+        collection.fetched_ids.clear()
+        assert index.sync(collection)
+        assert sorted(collection.fetched_ids) == ["doc-3", "doc-new"]
+        assert index.space == space
+        _assert_same_results(index, collection, space, seed=3)
+
+        # 같은 디렉터리를 쓰는 다른 워커: Chroma 조회 없이 저장된 스냅샷을 로드
+        collection.fetched_ids.clear()
+        other = LocalVectorIndex(str(directory), "docs")
+        assert other.sync(collection)
+        assert collection.fetched_ids == []
+        assert other.signature == index.signature
+        _assert_same_results(other, collection, space, seed=4)
+
+        # 처음부터 다시 만든 인덱스와 같은 결과
+        rebuilt = LocalVectorIndex(str(tmp_path / f"{space}-rebuilt"), "docs")
+        rebuilt.sync(collection)
+        query = np.random.default_rng(5).normal(size=8).tolist()
+        assert index.search(query, 10) == rebuilt.search(query, 10)
+
+        # 현재 + 직전 스냅샷만 남음
+        assert len(list(directory.glob("docs-*.npy"))) == 2
+
+
+def test_lexical_incremental_build_matches_fresh_build():
+    """문서를 수정/추가/삭제하며 재색인한 결과가 새로 색인한 결과와 같은지 (어휘 압축 포함)"""
+    rng = random.Random(9)
+    words = ["팀원", "리더", "갈등", "소통", "1on1", "R&R", "성과", "평가", "면담", "피드백", "번아웃"]
+
+    def make_document():
+        # 임의 음절을 섞어 수정/삭제 때마다 사라지는 용어가 많이 생기게 함
+        return " ".join(
+            rng.choice(words) + "".join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(rng.randint(0, 3)))
+            for _ in range(rng.randint(3, 30))
+        )
+
+    types = ["참여코칭형", "개별비전형", "과도기형"]
+    documents = {f"doc-{i}": make_document() for i in range(200)}
+    queries = [make_document()[:20] for _ in range(30)] + ["1on1 면담", "R&R 평가", "없는용어"]
+
+    incremental = LexicalIndex()
+    for round_no in range(6):
+        ids = list(documents)
+        metadatas = [{"leadership_type": types[hash(doc_id) % 3]} for doc_id in ids]
+        incremental.build(ids, [documents[doc_id] for doc_id in ids], metadatas)
+        fresh = LexicalIndex()
+        fresh.build(ids, [documents[doc_id] for doc_id in ids], metadatas)
+
+        for query in queries:
+            for leadership_type in (None, "개별비전형"):
+                assert incremental.search(query, 10, leadership_type) == fresh.search(query, 10, leadership_type)
+        assert incremental.get_stats()["terms"] == fresh.get_stats()["terms"]
+
+        # 절반 수정, 일부 삭제, 새 문서 추가
+        for doc_id in rng.sample(ids, len(ids) // 2):
+            documents[doc_id] = make_document()
+        for doc_id in rng.sample(ids, 20):
+            del documents[doc_id]
+        for i in range(25):
+            documents[f"new-{round_no}-{i}"] = make_document()
+
+    # 문서가 없는 용어가 쌓이면 어휘를 압축
+    assert len(incremental._vocabulary) <= 2 * incremental.get_stats()["terms"] + 1024
+
+    # 바뀌지 않은 문서는 다시 토큰화하지 않음
+    ids = list(documents)
+    incremental.build(ids, [documents[doc_id] for doc_id in ids], [{} for _ in ids])
+    before = incremental.tokenized_documents
+    documents[ids[0]] = make_document()
+    documents["extra"] = make_document()
+    ids = list(documents)
+    incremental.build(ids, [documents[doc_id] for doc_id in ids], [{} for _ in ids])
+    assert incremental.tokenized_documents == before + 2
+
+
+def _lexical_service(documents, cache: bool) -> VectorDBService:
+    """어휘 검색만 쓰는 검색 서비스 (Chroma 연결/백그라운드 동기화 없음)"""
+    service = VectorDBService()
+    service.connected = True
+    service.lexical_index = LexicalIndex()
+    service.lexical_index.build(list(documents), list(documents.values()), [{} for _ in documents])
+    service.result_cache = TTLCache(max_size=100, ttl_seconds=3600) if cache else None
+    service.collection_version = 1
+    service._index_checked_at = time.monotonic() + 3600
+    return service
+
+
+def test_result_cache_matches_uncached_search_and_follows_version():
+    """캐시 적중 결과 == 캐시 없는 검색 결과, 버전이 바뀌면 이전 결과를 쓰지 않음"""
+    documents = {
+        "a": "팀원과 1on1 면담을 정기적으로 하는 방법",
+        "b": "성과 평가 피드백을 전달할 때 주의할 점",
+        "c": "R&R 분담이 모호할 때 팀 갈등 중재",
+    }
+    queries = ["1on1 면담", "성과 평가 피드백", "팀 갈등", "없는용어"]
+
+    async def run():
+        cached = _lexical_service(documents, cache=True)
+        plain = _lexical_service(documents, cache=False)
+        for query in queries:
+            expected = await plain.search_similar_documents(query, mode="lexical", top_k=3)
+            assert await cached.search_similar_documents(query, mode="lexical", top_k=3) == expected
+            hit = await cached.search_similar_documents(query, mode="lexical", top_k=3)
+            assert hit == expected
+            # 호출자가 결과를 수정해도 캐시는 그대로
+            for doc in hit:
+                doc["content"] = "수정됨"
+            assert await cached.search_similar_documents(query, mode="lexical", top_k=3) == expected
+        assert cached.result_cache_hits == 2 * len(queries)
+
+        # 문서가 바뀌고 컬렉션 버전이 올라가면 새 결과
+        documents["a"] = "온보딩 체크리스트"
+        for service in (cached, plain):
+            service.lexical_index.build(list(documents), list(documents.values()), [{} for _ in documents])
+        cached.collection_version = 2
+        for query in queries:
+            assert await cached.search_similar_documents(query, mode="lexical", top_k=3) == \
+                await plain.search_similar_documents(query, mode="lexical", top_k=3)
+        assert cached.result_cache_invalidations == len(queries)
+
+    asyncio.run(run())